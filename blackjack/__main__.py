@@ -0,0 +1,62 @@
+import argparse
+import json
+import sys
+
+
+def simulate(args):
+    # Commands import what they run, so a short job does not pay to load the rest of the package
+    from blackjack.config import load_config
+    from blackjack.config import simulation_config
+    from blackjack.runner import run_simulation
+
+    config = simulation_config(load_config(args.config))
+
+    for key in ('rounds', 'workers'):
+        if getattr(args, key) is not None:
+            config[key] = getattr(args, key)
+
+    if args.seed is not None:
+        config['seeds'] = [args.seed]
+
+    runs = []
+
+    for seed in config['seeds']:
+        report = run_simulation(config['settings'], config['players'], config['rounds'], seed, config['workers'],
+                                config['shard_rounds'])
+        runs.append(dict(report.summary(), seed=seed))
+
+    return {'runs': runs}
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog='python -m blackjack')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    simulate_parser = commands.add_parser('simulate', help='Run a simulation from a TOML or JSON config')
+    simulate_parser.add_argument('config')
+    simulate_parser.add_argument('--output', '-o', default='-')
+    simulate_parser.add_argument('--rounds', type=int)
+    simulate_parser.add_argument('--seed', type=int)
+    simulate_parser.add_argument('--workers', type=int)
+
+    args = parser.parse_args(args)
+
+    try:
+        results = simulate(args)
+    except (OSError, ValueError) as error:
+        print('error: {}'.format(error), file=sys.stderr)
+        return 2
+
+    output = json.dumps(results, indent=2, sort_keys=True)
+
+    if args.output == '-':
+        print(output)
+    else:
+        with open(args.output, 'w') as file:
+            file.write(output + '\n')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,234 @@
+from collections import OrderedDict
+from functools import lru_cache
+
+from blackjack.cards import ACE_VALUE
+from blackjack.cards import CARD_VALUES
+from blackjack.cards import CARD_SUITS
+from blackjack.hand import DEALER_BUST
+from blackjack.hand import DEALER_SCORES
+from blackjack.player import PlayerAction
+from blackjack.settings import GameSettings
+
+EV_CACHE_SIZE = 4096
+
+
+def shoe_composition(num_decks, removed_cards=()):
+    composition = [len(CARD_SUITS) * num_decks] * len(CARD_VALUES)
+    composition[10 - CARD_VALUES.start] *= 4
+
+    for card in removed_cards:
+        composition[card.value - CARD_VALUES.start] -= 1
+
+    return composition
+
+
+def add_card(hard_score, ace, value):
+    hard_score += 1 if value == ACE_VALUE else value
+    ace = ace or value == ACE_VALUE
+    soft = ace and hard_score <= 11
+
+    return hard_score, ace, hard_score + 10 if soft else hard_score, soft
+
+
+def dealer_distribution(upcard_value, composition, hit_soft_17=True):
+    calculator = EVCalculator(GameSettings(dealer_hit_soft_17=hit_soft_17))
+
+    return calculator.dealer_distribution(upcard_value, composition)
+
+
+@lru_cache(maxsize=None)
+def fresh_shoe_dealer_distribution(upcard_value, num_decks, hit_soft_17=True):
+    composition = shoe_composition(num_decks)
+    composition[upcard_value - CARD_VALUES.start] -= 1
+
+    return dealer_distribution(upcard_value, composition, hit_soft_17)
+
+
+class EVCalculator:
+    def __init__(self, settings=None, cache_size=EV_CACHE_SIZE):
+        if cache_size <= 0:
+            raise ValueError('Cache size must be positive')
+
+        self.cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_size = cache_size
+        self.settings = settings if settings else GameSettings()
+
+    # The cache only saves work, so checkpoints leave it out and start again with an empty one
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['cache'], state['cache_hits'], state['cache_misses']
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    # What the dealer ends on depends only on the cards drawn so far and the cards left, so the outcomes below a
+    # state are shared by every order of drawing the same cards and by later decisions that reach it again
+    def __dealer_draw(self, hard_score, ace, counts, total):
+        key = (hard_score, ace, tuple(counts))
+        distribution = self.cache.get(key)
+
+        if distribution is not None:
+            self.cache_hits += 1
+            self.cache.move_to_end(key)
+
+            return distribution
+
+        self.cache_misses += 1
+
+        distribution = [0.0] * (DEALER_BUST + 1)
+
+        for index, count in enumerate(counts):
+            if not count:
+                continue
+
+            probability = count / total
+            new_hard_score, new_ace, score, soft = add_card(hard_score, ace, index + CARD_VALUES.start)
+
+            if score > 21:
+                distribution[DEALER_BUST] += probability
+            elif score > 17 or (score == 17 and not (soft and self.settings.dealer_hit_soft_17)):
+                distribution[score - DEALER_SCORES.start] += probability
+            else:
+                counts[index] -= 1
+
+                for outcome, outcome_probability in enumerate(self.__dealer_draw(new_hard_score, new_ace, counts,
+                                                                                 total - 1)):
+                    distribution[outcome] += probability * outcome_probability
+
+                counts[index] += 1
+
+        distribution = tuple(distribution)
+
+        self.cache[key] = distribution
+
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+        return distribution
+
+    def dealer_distribution(self, upcard_value, composition):
+        hard_score, ace, _, _ = add_card(0, False, upcard_value)
+
+        return self.__dealer_draw(hard_score, ace, list(composition), sum(composition))
+
+    def stand_ev(self, score, distribution, blackjack=False):
+        if score > 21:
+            return -1.0
+
+        win = distribution[DEALER_BUST]
+        lose = 0.0
+
+        for dealer_score, probability in zip(DEALER_SCORES, distribution):
+            if dealer_score < score:
+                win += probability
+            elif dealer_score > score:
+                lose += probability
+
+        return win * (self.settings.blackjack_payout if blackjack else 1) - lose
+
+    # Hit, double down and split EVs are estimates that keep the dealer distribution from the time of the decision.
+    # Working it out again from the cards left after each of the player's draws needs a fresh dealer search for
+    # every way the hand can end, and makes a single split decision take seconds
+    def __hit_estimate(self, hard_score, ace, counts, total, distribution, cache):
+        key = (hard_score, ace, tuple(counts))
+
+        if key in cache:
+            return cache[key]
+
+        ev = 0.0
+
+        for index, count in enumerate(counts):
+            if not count:
+                continue
+
+            probability = count / total
+            new_hard_score, new_ace, score, _ = add_card(hard_score, ace, index + CARD_VALUES.start)
+
+            if score > 21:
+                ev -= probability
+            else:
+                counts[index] -= 1
+                hit = self.__hit_estimate(new_hard_score, new_ace, counts, total - 1, distribution, cache)
+                ev += probability * max(self.stand_ev(score, distribution), hit)
+                counts[index] += 1
+
+        cache[key] = ev
+
+        return ev
+
+    def __double_down_estimate(self, hard_score, ace, counts, total, distribution):
+        ev = 0.0
+
+        for index, count in enumerate(counts):
+            if count:
+                _, _, score, _ = add_card(hard_score, ace, index + CARD_VALUES.start)
+                ev += count / total * self.stand_ev(score, distribution)
+
+        return ev * 2
+
+    def __split_estimate(self, value, counts, total, distribution, cache):
+        ev = 0.0
+        hard_score, ace, _, _ = add_card(0, False, value)
+
+        for index, count in enumerate(counts):
+            if not count:
+                continue
+
+            new_hard_score, new_ace, score, _ = add_card(hard_score, ace, index + CARD_VALUES.start)
+
+            counts[index] -= 1
+            hit = self.__hit_estimate(new_hard_score, new_ace, counts, total - 1, distribution, cache)
+            double_down = self.__double_down_estimate(new_hard_score, new_ace, counts, total - 1, distribution)
+            ev += count / total * max(self.stand_ev(score, distribution, blackjack=score == 21), hit, double_down)
+            counts[index] += 1
+
+        return ev * 2
+
+    def action_evs(self, hand, dealer_card, composition=None):
+        if composition is None:
+            composition = shoe_composition(self.settings.num_decks, hand.cards + [dealer_card])
+
+        counts = list(composition)
+        total = sum(counts)
+        ace = hand.ace_count > 0
+        distribution = self.dealer_distribution(dealer_card.value, counts)
+        cache = {}
+
+        # Only the stand EV is exact, the others are the estimates above
+        evs = {
+            PlayerAction.STAND: self.stand_ev(hand.score, distribution, blackjack=hand.blackjack),
+            PlayerAction.HIT: self.__hit_estimate(hand.hard_score, ace, counts, total, distribution, cache),
+        }
+
+        if len(hand.cards) == 2:
+            evs[PlayerAction.DOUBLE_DOWN] = self.__double_down_estimate(hand.hard_score, ace, counts, total,
+                                                                        distribution)
+
+            if hand.cards[0].rank == hand.cards[1].rank:
+                evs[PlayerAction.SPLIT] = self.__split_estimate(hand.cards[0].value, counts, total, distribution,
+                                                                cache)
+
+        return evs
+
+
+class EVStrategy:
+    composition_dependent = True
+
+    def __init__(self, settings=None, cache_size=EV_CACHE_SIZE):
+        self.calculator = EVCalculator(settings, cache_size=cache_size)
+
+    def action(self, hand, dealer_card, bankroll, composition=None):
+        evs = self.calculator.action_evs(hand, dealer_card, composition)
+
+        if hand.bet > bankroll:
+            evs.pop(PlayerAction.DOUBLE_DOWN, None)
+            evs.pop(PlayerAction.SPLIT, None)
+
+        return max(evs, key=evs.get)
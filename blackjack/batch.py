@@ -0,0 +1,398 @@
+import numpy as np
+
+from blackjack.cards import CARD_RANKS
+from blackjack.cards import CARDS_PER_DECK
+from blackjack.cards import CARD_SUITS
+from blackjack.cards import CUT_CARD_PENETRATION_MAX
+from blackjack.cards import CUT_CARD_PENETRATION_MIN
+from blackjack.cards import STOP_CARD_PENETRATION_MAX
+from blackjack.cards import STOP_CARD_PENETRATION_MIN
+from blackjack.game import GameSettings
+from blackjack.player import BetStrategyType
+from blackjack.player import CHART_BASIC_STRATEGY
+from blackjack.player import CHART_HARD_SCORES
+from blackjack.player import CHART_ROW_LENGTH
+from blackjack.player import CHART_SOFT_SCORES
+from blackjack.player import HAND_FLAG_LOW_BANKROLL
+from blackjack.player import HAND_FLAG_MORE_CARDS
+from blackjack.player import HAND_FLAGS
+from blackjack.player import HAND_STATE_PAIR_OFFSET
+from blackjack.player import HAND_STATE_SOFT_OFFSET
+from blackjack.player import CompiledStrategy
+from blackjack.player import PlayerAction
+
+RANK_INDEX = {rank: index for index, (rank, _) in enumerate(CARD_RANKS)}
+RANK_VALUES = np.array([value for _, value in CARD_RANKS], dtype=np.int16)
+RANK_HARD_VALUES = np.where(RANK_VALUES == 11, 1, RANK_VALUES).astype(np.int16)
+RANK_ACE = RANK_INDEX['A']
+
+ACTION_HIT = PlayerAction.HIT.value
+ACTION_STAND = PlayerAction.STAND.value
+ACTION_DOUBLE_DOWN = PlayerAction.DOUBLE_DOWN.value
+ACTION_SPLIT = PlayerAction.SPLIT.value
+
+HAND_CAPACITY = 4
+
+
+class BatchShoe:
+    def __init__(self, num_tables, num_decks, rng):
+        if num_decks <= 0:
+            raise ValueError('Shoe must contain one or more decks')
+
+        self.num_decks = num_decks
+        self.num_tables = num_tables
+        self.rng = rng
+        self.size = CARDS_PER_DECK * num_decks
+
+        ranks = np.repeat(np.arange(len(CARD_RANKS), dtype=np.uint8), len(CARD_SUITS) * num_decks)
+
+        self.cards = np.tile(ranks, (num_tables, 1))
+        self.last_round = np.zeros(num_tables, dtype=bool)
+        self.position = np.zeros(num_tables, dtype=np.int64)
+        self.stop_card = np.zeros(num_tables, dtype=np.int64)
+
+    @property
+    def num_cards(self):
+        return self.size - self.position
+
+    def draw(self, tables):
+        remaining = self.size - self.position[tables]
+
+        if (remaining <= 0).any():
+            raise IndexError('Shoe contains no cards')
+
+        stop_card = self.stop_card[tables]
+        self.last_round[tables] |= (stop_card > 0) & (remaining <= stop_card)
+
+        ranks = self.cards[tables, self.position[tables]]
+        self.position[tables] += 1
+
+        return ranks
+
+    def reset(self, tables=None):
+        tables = np.arange(self.num_tables) if tables is None else tables
+
+        self.position[tables] = 0
+        self.last_round[tables] = False
+        self.stop_card[tables] = 0
+
+        self.shuffle(tables)
+
+    def shuffle(self, tables):
+        if len(tables) == 0:
+            return
+
+        cards = self.rng.permuted(self.cards[tables], axis=1)
+
+        cut_card_min = round(self.size * CUT_CARD_PENETRATION_MIN)
+        cut_card_max = round(self.size * CUT_CARD_PENETRATION_MAX)
+
+        # Cards are stored in draw order, so cutting the top of the deck to the bottom is a rotation to the right
+        cut_card = self.rng.integers(cut_card_min, cut_card_max, size=len(tables), endpoint=True)
+        columns = (np.arange(self.size) - cut_card[:, None]) % self.size
+        self.cards[tables] = np.take_along_axis(cards, columns, axis=1)
+
+        stop_card_min = round(self.size * STOP_CARD_PENETRATION_MIN)
+        stop_card_max = round(self.size * STOP_CARD_PENETRATION_MAX)
+
+        self.stop_card[tables] = self.rng.integers(stop_card_min, stop_card_max, size=len(tables), endpoint=True)
+
+
+class BatchGame:
+    def __init__(self, settings=None, num_tables=1000, rng=None):
+        if num_tables <= 0:
+            raise ValueError('Batch must contain one or more tables')
+
+        self.settings = settings if settings else GameSettings()
+
+        if self.settings.analytic_dealer:
+            raise ValueError('Batch games do not support analytic dealer resolution')
+
+        self.num_tables = num_tables
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.round_count = 0
+        self.seats = []
+        self.shoe = BatchShoe(num_tables, self.settings.num_decks, self.rng)
+
+        self.bankroll = None
+        self.hands = None
+        self.wins = None
+        self.pushes = None
+        self.losses = None
+        self.net = None
+
+    @property
+    def num_players(self):
+        return len(self.seats)
+
+    def add_player(self, player_settings=None):
+        player_settings = player_settings if player_settings else {}
+
+        if self.bankroll is not None:
+            raise ValueError('Players must be added before the first round')
+
+        bet_strategy_type = player_settings.get('bet_strategy_type', BetStrategyType.STATIC)
+
+        if bet_strategy_type != BetStrategyType.STATIC:
+            raise ValueError('Batch games only support the static bet strategy')
+
+        bet = self.settings.min_bet
+        bet_limit = player_settings.get('bet_limit', None)
+
+        if self.settings.max_bet is not None and bet > self.settings.max_bet:
+            bet = self.settings.max_bet
+
+        if bet_limit is not None and bet > bet_limit:
+            bet = bet_limit
+
+        self.seats.append({
+            'bankroll': player_settings.get('bankroll', 100),
+            'bet': bet,
+            'strategy': CompiledStrategy(player_settings.get('player_strategy', CHART_BASIC_STRATEGY)),
+        })
+
+    def __setup(self):
+        if not self.seats:
+            raise ValueError('Batch game has no players')
+
+        shape = (self.num_tables, self.num_players)
+
+        bankrolls = np.array([seat['bankroll'] for seat in self.seats], dtype=np.float64)
+
+        self.bankroll = np.tile(bankrolls, (self.num_tables, 1))
+        self.hands = np.zeros(shape, dtype=np.int64)
+        self.wins = np.zeros(shape, dtype=np.int64)
+        self.pushes = np.zeros(shape, dtype=np.int64)
+        self.losses = np.zeros(shape, dtype=np.int64)
+        self.net = np.zeros(shape, dtype=np.float64)
+
+        self.seat_bets = np.array([seat['bet'] for seat in self.seats], dtype=np.float64)
+        self.strategies = np.array([[action.value for action in seat['strategy'].actions] for seat in self.seats],
+                                   dtype=np.int8)
+
+        self.__allocate_hands(HAND_CAPACITY)
+
+    def __allocate_hands(self, capacity):
+        shape = (self.num_tables, self.num_players, capacity)
+
+        self.hand_hard = np.zeros(shape, dtype=np.int16)
+        self.hand_aces = np.zeros(shape, dtype=np.int16)
+        self.hand_cards = np.zeros(shape, dtype=np.int16)
+        self.hand_ranks = np.zeros(shape + (2,), dtype=np.uint8)
+        self.hand_bet = np.zeros(shape, dtype=np.float64)
+        self.hand_blackjack = np.zeros(shape, dtype=bool)
+        self.hand_count = np.zeros(shape[:2], dtype=np.int64)
+
+    def __grow_hands(self):
+        pad = [(0, 0), (0, 0), (0, self.hand_hard.shape[2])]
+
+        self.hand_hard = np.pad(self.hand_hard, pad)
+        self.hand_aces = np.pad(self.hand_aces, pad)
+        self.hand_cards = np.pad(self.hand_cards, pad)
+        self.hand_ranks = np.pad(self.hand_ranks, pad + [(0, 0)])
+        self.hand_bet = np.pad(self.hand_bet, pad)
+        self.hand_blackjack = np.pad(self.hand_blackjack, pad)
+
+    @staticmethod
+    def score(hard, aces):
+        soft = (aces > 0) & (hard + 10 <= 21)
+
+        return np.where(soft, hard + 10, hard), soft
+
+    def __deal(self, tables, seats, hands, ranks):
+        index = (tables, seats, hands)
+        num_cards = self.hand_cards[index]
+
+        self.hand_ranks[index + (np.minimum(num_cards, 1),)] = np.where(num_cards < 2, ranks,
+                                                                        self.hand_ranks[index + (1,)])
+        self.hand_hard[index] += RANK_HARD_VALUES[ranks]
+        self.hand_aces[index] += ranks == RANK_ACE
+        self.hand_cards[index] += 1
+
+        score, _ = self.score(self.hand_hard[index], self.hand_aces[index])
+        self.hand_blackjack[index] |= (self.hand_cards[index] == 2) & (score == 21)
+
+    def __actions(self, tables, seats, hands):
+        index = (tables, seats, hands)
+
+        score, soft = self.score(self.hand_hard[index], self.hand_aces[index])
+        ranks = self.hand_ranks[index]
+        num_cards = self.hand_cards[index]
+
+        pair = (num_cards == 2) & (ranks[:, 0] == ranks[:, 1])
+        state = np.where(soft, HAND_STATE_SOFT_OFFSET + score - CHART_SOFT_SCORES.start,
+                         score - CHART_HARD_SCORES.start)
+        state = np.where(pair, HAND_STATE_PAIR_OFFSET + ranks[:, 0], state)
+
+        flags = np.where(num_cards > 2, HAND_FLAG_MORE_CARDS, 0)
+        flags |= np.where(self.hand_bet[index] > self.bankroll[tables, seats], HAND_FLAG_LOW_BANKROLL, 0)
+
+        return self.strategies[seats, (state * CHART_ROW_LENGTH + self.dealer_upcard[tables]) * HAND_FLAGS + flags]
+
+    def __split(self, tables, seats, hands):
+        if (self.hand_count[tables, seats] >= self.hand_hard.shape[2]).any():
+            self.__grow_hands()
+
+        index = (tables, seats, hands)
+        split_index = (tables, seats, self.hand_count[tables, seats])
+        ranks = self.hand_ranks[index + (1,)]
+        bet = self.hand_bet[index]
+
+        self.bankroll[tables, seats] -= bet
+        self.hand_count[tables, seats] += 1
+
+        self.hand_hard[split_index] = RANK_HARD_VALUES[ranks]
+        self.hand_aces[split_index] = ranks == RANK_ACE
+        self.hand_cards[split_index] = 1
+        self.hand_ranks[split_index + (0,)] = ranks
+        self.hand_bet[split_index] = bet
+        self.hand_blackjack[split_index] = False
+
+        self.hand_hard[index] -= RANK_HARD_VALUES[ranks]
+        self.hand_aces[index] -= ranks == RANK_ACE
+        self.hand_cards[index] = 1
+
+    def __play_players(self, active):
+        next_seat = np.full((self.num_tables, self.num_players + 1), self.num_players, dtype=np.int64)
+
+        for seat in range(self.num_players - 1, -1, -1):
+            next_seat[:, seat] = np.where(active[:, seat], seat, next_seat[:, seat + 1])
+
+        current_seat = next_seat[:, 0]
+        current_hand = np.zeros(self.num_tables, dtype=np.int64)
+
+        while True:
+            tables = np.flatnonzero(current_seat < self.num_players)
+
+            if len(tables) == 0:
+                break
+
+            seats = current_seat[tables]
+            hands = current_hand[tables]
+
+            single = self.hand_cards[tables, seats, hands] == 1
+
+            if single.any():
+                self.__deal(tables[single], seats[single], hands[single], self.shoe.draw(tables[single]))
+
+            action = self.__actions(tables, seats, hands)
+            stop = action == ACTION_STAND
+
+            double_down = action == ACTION_DOUBLE_DOWN
+
+            if double_down.any():
+                index = (tables[double_down], seats[double_down], hands[double_down])
+
+                self.bankroll[index[:2]] -= self.hand_bet[index]
+                self.hand_bet[index] *= 2
+                stop |= double_down
+
+            split = action == ACTION_SPLIT
+
+            if split.any():
+                self.__split(tables[split], seats[split], hands[split])
+
+            draw = action != ACTION_STAND
+
+            if draw.any():
+                self.__deal(tables[draw], seats[draw], hands[draw], self.shoe.draw(tables[draw]))
+
+            score, _ = self.score(self.hand_hard[tables, seats, hands], self.hand_aces[tables, seats, hands])
+            stop |= score >= 21
+
+            done = tables[stop]
+            current_hand[done] += 1
+
+            finished = done[current_hand[done] >= self.hand_count[done, current_seat[done]]]
+            current_seat[finished] = next_seat[finished, current_seat[finished] + 1]
+            current_hand[finished] = 0
+
+    def __play_dealer(self):
+        while True:
+            score, soft = self.score(self.dealer_hard, self.dealer_aces)
+            tables = np.flatnonzero((score < 17) | ((score == 17) & soft & self.settings.dealer_hit_soft_17))
+
+            if len(tables) == 0:
+                return score
+
+            ranks = self.shoe.draw(tables)
+
+            self.dealer_hard[tables] += RANK_HARD_VALUES[ranks]
+            self.dealer_aces[tables] += ranks == RANK_ACE
+
+    def __settle(self, dealer_score):
+        score, _ = self.score(self.hand_hard, self.hand_aces)
+        dealt = np.arange(self.hand_hard.shape[2]) < self.hand_count[:, :, None]
+
+        dealer_score = dealer_score[:, None, None]
+        dealer_bust = dealer_score > 21
+        bust = score > 21
+
+        win = dealt & ~bust & (dealer_bust | (score > dealer_score))
+        push = dealt & ~bust & ~win & (score == dealer_score)
+        lose = dealt & ~win & ~push
+
+        payout = np.where(self.hand_blackjack, self.settings.blackjack_payout, 1)
+        winnings = np.where(win, self.hand_bet * payout, 0)
+
+        self.bankroll += np.where(win | push, self.hand_bet + winnings, 0).sum(axis=2)
+
+        self.hands += self.hand_count
+        self.wins += win.sum(axis=2)
+        self.pushes += push.sum(axis=2)
+        self.losses += lose.sum(axis=2)
+        self.net += (winnings - np.where(lose, self.hand_bet, 0)).sum(axis=2)
+
+    def play_round(self):
+        if self.bankroll is None:
+            self.__setup()
+
+        self.round_count += 1
+
+        active = self.bankroll >= self.settings.min_bet
+        bets = np.where(active, self.seat_bets, 0)
+
+        self.bankroll -= bets
+
+        self.hand_hard[:] = 0
+        self.hand_aces[:] = 0
+        self.hand_cards[:] = 0
+        self.hand_ranks[:] = 0
+        self.hand_blackjack[:] = False
+        self.hand_bet[:] = 0
+        self.hand_bet[:, :, 0] = bets
+        self.hand_count[:] = active
+
+        self.dealer_hard = np.zeros(self.num_tables, dtype=np.int16)
+        self.dealer_aces = np.zeros(self.num_tables, dtype=np.int16)
+        self.dealer_upcard = np.zeros(self.num_tables, dtype=np.int64)
+
+        all_tables = np.arange(self.num_tables)
+        first_hand = np.zeros(self.num_tables, dtype=np.int64)
+
+        for _ in range(2):
+            for seat in range(self.num_players):
+                tables = np.flatnonzero(active[:, seat])
+                seats = np.full(len(tables), seat)
+
+                self.__deal(tables, seats, first_hand[tables], self.shoe.draw(tables))
+
+            ranks = self.shoe.draw(all_tables)
+
+            self.dealer_hard += RANK_HARD_VALUES[ranks]
+            self.dealer_aces += ranks == RANK_ACE
+            self.dealer_upcard = RANK_VALUES[ranks].astype(np.int64) - 2
+
+        self.__play_players(active)
+        self.__settle(self.__play_dealer())
+
+    def start(self, rounds=25):
+        if self.bankroll is None:
+            self.__setup()
+
+        self.shoe.reset()
+
+        for _ in range(rounds):
+            self.play_round()
+
+            self.shoe.reset(np.flatnonzero(self.shoe.last_round))
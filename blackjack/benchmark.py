@@ -0,0 +1,332 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+from itertools import product
+
+from blackjack.cards import Shoe
+from blackjack.game import Game
+from blackjack.game import GameSettings
+from blackjack.hand import Hand
+from blackjack.handlog import HandLog
+from blackjack.player import BetStrategyType
+from blackjack.player import Player
+from blackjack.rng import default_rng
+
+BENCHMARK_DECKS = [1, 2, 6, 8]
+BENCHMARK_HAND_LOG_MAX_OVERHEAD = 0.2
+BENCHMARK_HAND_LOG_PAIRS = 21
+BENCHMARK_PLAYERS = range(1, 8)
+BENCHMARK_BET_STRATEGY_SETTINGS = {
+    BetStrategyType.COUNT: {'count_ramp': {1: 2, 2: 4, 3: 8}},
+    BetStrategyType.SERIES: {'series': [1, 2, 3, 1]},
+    BetStrategyType.STREAK: {'streak_rates': {-2: 2, -1: 1, 0: 1, 1: 2, 2: 3}},
+}
+BENCHMARK_REPEAT = 3
+BENCHMARK_ROUNDS = 2000
+BENCHMARK_SEED = 1
+BENCHMARK_THRESHOLD = 0.1
+
+
+def build_game(num_decks, num_players, bet_strategy_type, seed):
+    game = Game(GameSettings(num_decks=num_decks), rng=default_rng(seed))
+
+    for _ in range(num_players):
+        game.add_player({
+            'bankroll': 10 ** 9,
+            'bet_strategy_type': bet_strategy_type,
+            'bet_strategy_settings': dict(BENCHMARK_BET_STRATEGY_SETTINGS.get(bet_strategy_type, {})),
+        })
+
+    return game
+
+
+def measure(function, operations, repeat, rng=None, seed=None):
+    best = None
+
+    for _ in range(repeat):
+        if rng is not None:
+            rng.seed(seed)
+
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+
+        best = elapsed if best is None else min(best, elapsed)
+
+    return {'operations': operations, 'seconds': best, 'ops_per_sec': operations / best if best > 0 else 0.0}
+
+
+def benchmark_game(num_decks, num_players, bet_strategy_type, rounds, repeat, seed):
+    # Building a game deals nothing, so it is done ahead for every repeat and stays out of the timing
+    games = [build_game(num_decks, num_players, bet_strategy_type, seed) for _ in range(repeat)]
+
+    def start():
+        games.pop().start(rounds=rounds)
+
+    result = measure(start, rounds, repeat)
+
+    # The same seed replays the same rounds, so the hand count is taken from an untimed run
+    hands = sum(1 for _ in build_game(num_decks, num_players, bet_strategy_type, seed).records(rounds=rounds))
+
+    result['hands'] = hands
+    result['hands_per_sec'] = hands / result['seconds'] if result['seconds'] > 0 else 0.0
+
+    return result
+
+
+def benchmark_play_round(num_decks, num_players, rounds, repeat, seed):
+    # Every repeat plays the same rounds from a fresh game, built ahead so setup stays out of the timing
+    games = [build_game(num_decks, num_players, BetStrategyType.STATIC, seed) for _ in range(repeat)]
+
+    def play_rounds():
+        game = games.pop()
+        game.shoe.reset()
+
+        for _ in range(rounds):
+            game.play_round()
+
+            if game.shoe.last_round:
+                game.shoe.reset()
+
+    return measure(play_rounds, rounds, repeat)
+
+
+def benchmark_hand_log(num_players, rounds, repeat, seed):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'hands.log')
+
+        def play(hand_log):
+            game = build_game(8, num_players, BetStrategyType.STATIC, seed)
+            game.hand_log = hand_log
+
+            # CPU time leaves out other processes, which otherwise swing single runs by tens of percent
+            start = time.process_time()
+            game.start(rounds=rounds)
+
+            if hand_log is not None:
+                hand_log.close()
+
+            return time.process_time() - start
+
+        logged = []
+        ratios = []
+
+        # Each pair plays the same rounds with and without the log, taking turns at going first, and the overhead
+        # is the median pair ratio so a few disturbed runs can not move it
+        for index in range(max(repeat, BENCHMARK_HAND_LOG_PAIRS)):
+            if index % 2:
+                logged_seconds = play(HandLog(path))
+                plain_seconds = play(None)
+            else:
+                plain_seconds = play(None)
+                logged_seconds = play(HandLog(path))
+
+            logged.append(logged_seconds)
+
+            if plain_seconds > 0:
+                ratios.append(logged_seconds / plain_seconds - 1)
+
+        size = os.path.getsize(path)
+
+    return {
+        'operations': rounds,
+        'seconds': min(logged),
+        'ops_per_sec': rounds / min(logged) if min(logged) > 0 else 0.0,
+        'overhead': statistics.median(ratios) if ratios else 0.0,
+        'bytes_per_round': size / rounds if rounds else 0.0,
+    }
+
+
+def benchmark_shoe(num_decks, rounds, repeat, seed):
+    shoe = Shoe(num_decks=num_decks, rng=default_rng(seed))
+
+    def reset():
+        for _ in range(rounds):
+            shoe.reset()
+
+    def shuffle():
+        for _ in range(rounds):
+            shoe.shuffle()
+
+    return measure(reset, rounds, repeat, shoe.rng, seed), measure(shuffle, rounds, repeat, shoe.rng, seed)
+
+
+def benchmark_numpy_shuffle(num_decks, rounds, repeat, seed):
+    import numpy as np
+
+    shoe = Shoe(num_decks=num_decks, rng=np.random.default_rng(seed))
+
+    def shuffle():
+        for _ in range(rounds):
+            shoe.shuffle()
+
+    return measure(shuffle, rounds, repeat)
+
+
+def benchmark_hand_deal(rounds, repeat, seed):
+    shoe = Shoe(num_decks=8, rng=default_rng(seed))
+    cards = [shoe.draw() for _ in range(6)]
+
+    def deal():
+        for _ in range(rounds):
+            hand = Hand()
+
+            for card in cards:
+                hand.deal(card)
+
+    return measure(deal, rounds * len(cards), repeat)
+
+
+def benchmark_player_action(rounds, repeat, seed):
+    shoe = Shoe(num_decks=8, rng=default_rng(seed))
+    player = Player({'bankroll': 10 ** 9, 'game_settings': GameSettings()})
+    situations = []
+
+    for _ in range(200):
+        if shoe.num_cards < 3:
+            shoe.reset()
+
+        hand = Hand()
+        hand.deal(shoe.draw())
+        hand.deal(shoe.draw())
+        situations.append((hand, shoe.draw()))
+
+    def action():
+        for _ in range(rounds // len(situations) + 1):
+            for hand, dealer_card in situations:
+                player.action(hand, dealer_card)
+
+    return measure(action, (rounds // len(situations) + 1) * len(situations), repeat)
+
+
+def run_benchmarks(rounds=BENCHMARK_ROUNDS, repeat=BENCHMARK_REPEAT, seed=BENCHMARK_SEED, decks=None, players=None,
+                   bet_strategy_types=None):
+    decks = decks if decks else BENCHMARK_DECKS
+    players = players if players else BENCHMARK_PLAYERS
+    bet_strategy_types = bet_strategy_types if bet_strategy_types else list(BetStrategyType)
+
+    results = {}
+
+    for num_decks, num_players, bet_strategy_type in product(decks, players, bet_strategy_types):
+        name = 'game.start/decks={}/players={}/bet={}'.format(num_decks, num_players,
+                                                              bet_strategy_type.name.lower())
+        results[name] = benchmark_game(num_decks, num_players, bet_strategy_type, rounds, repeat, seed)
+
+    for num_decks, num_players in product(decks, players):
+        name = 'game.play_round/decks={}/players={}'.format(num_decks, num_players)
+        results[name] = benchmark_play_round(num_decks, num_players, rounds, repeat, seed)
+
+    for num_decks in decks:
+        reset, shuffle = benchmark_shoe(num_decks, max(rounds // 20, 1), repeat, seed)
+
+        results['shoe.reset/decks={}'.format(num_decks)] = reset
+        results['shoe.shuffle/decks={}'.format(num_decks)] = shuffle
+
+    # Games shuffle with random.Random unless given a NumPy Generator, which is measured when NumPy is installed
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+
+    if numpy is not None:
+        for num_decks in decks:
+            results['shoe.shuffle/decks={}/rng=numpy'.format(num_decks)] = \
+                benchmark_numpy_shuffle(num_decks, max(rounds // 20, 1), repeat, seed)
+
+    for num_players in players:
+        results['hand_log/players={}'.format(num_players)] = benchmark_hand_log(num_players, rounds, repeat, seed)
+
+    results['hand.deal'] = benchmark_hand_deal(rounds * 10, repeat, seed)
+    results['player.action'] = benchmark_player_action(rounds * 10, repeat, seed)
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'rounds': rounds,
+            'repeat': repeat,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def compare(baseline, current, threshold=BENCHMARK_THRESHOLD):
+    regressions = []
+
+    for name, result in sorted(current['results'].items()):
+        baseline_result = baseline['results'].get(name, None)
+
+        # Overheads are held to a fixed limit rather than to the baseline, so they can not creep up run after run
+        if result.get('overhead', 0.0) > BENCHMARK_HAND_LOG_MAX_OVERHEAD:
+            regressions.append((name, BENCHMARK_HAND_LOG_MAX_OVERHEAD, result['overhead'], result['overhead']))
+            continue
+
+        if not baseline_result or baseline_result['ops_per_sec'] <= 0:
+            continue
+
+        change = result['ops_per_sec'] / baseline_result['ops_per_sec'] - 1
+
+        if change < -threshold:
+            regressions.append((name, baseline_result['ops_per_sec'], result['ops_per_sec'], change))
+
+    return regressions
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog='python -m blackjack.benchmark')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='Run the benchmark suite')
+    run_parser.add_argument('--output', '-o', default='-')
+    run_parser.add_argument('--rounds', type=int, default=BENCHMARK_ROUNDS)
+    run_parser.add_argument('--repeat', type=int, default=BENCHMARK_REPEAT)
+    run_parser.add_argument('--seed', type=int, default=BENCHMARK_SEED)
+    run_parser.add_argument('--decks', type=int, nargs='+', choices=BENCHMARK_DECKS)
+    run_parser.add_argument('--players', type=int, nargs='+', choices=BENCHMARK_PLAYERS)
+
+    compare_parser = commands.add_parser('compare', help='Compare benchmark results against a baseline')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=BENCHMARK_THRESHOLD)
+
+    args = parser.parse_args(args)
+
+    if args.command == 'run':
+        results = run_benchmarks(args.rounds, args.repeat, args.seed, args.decks, args.players)
+        output = json.dumps(results, indent=2, sort_keys=True)
+
+        if args.output == '-':
+            print(output)
+        else:
+            with open(args.output, 'w') as file:
+                file.write(output + '\n')
+
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+
+    with open(args.current) as file:
+        current = json.load(file)
+
+    regressions = compare(baseline, current, args.threshold)
+
+    for name, baseline_ops, current_ops, change in regressions:
+        if 'overhead' in current['results'][name]:
+            print('{}: {:.1%} overhead, the limit is {:.1%}'.format(name, current_ops, baseline_ops))
+        else:
+            print('{}: {:.1f} -> {:.1f} ops/sec ({:+.1%})'.format(name, baseline_ops, current_ops, change))
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,11 @@
-import random
+from array import array
 from collections import namedtuple
+from functools import cached_property
 from itertools import product
-from random import shuffle
+
+from blackjack.rng import default_rng
+from blackjack.rng import randint
+from blackjack.rng import shuffle
 
 CARD_RANKS = [
     ('2', 2), ('3', 3), ('4', 4), ('5', 5),
@@ -23,54 +27,242 @@ class Card(namedtuple('Card', ['rank', 'value', 'suit'])):
     def __str__(self):
         return '{} - {}'.format(self.rank, self.suit.title())
 
+    # Dealt cards are the shared instances in CARDS, so each looks its code up once and keeps it
+    @cached_property
+    def code(self):
+        return CARD_CODES[self]
+
+
+# Cards are encoded as their index in a new deck, so each card is one byte and its rank and value are table lookups
+CARDS = tuple(Card(*card_type[0] + (card_type[1],)) for card_type in product(CARD_RANKS, CARD_SUITS))
+
+CARD_CODES = {card: code for code, card in enumerate(CARDS)}
+CARD_CODE_RANKS = bytes(code // len(CARD_SUITS) for code in range(len(CARDS)))
+CARD_CODE_VALUES = bytes(card.value for card in CARDS)
+
+CARD_CODE_VALUE_TABLE = CARD_CODE_VALUES + bytes(256 - len(CARD_CODE_VALUES))
+CARD_VALUES = range(2, 12)
+
+ACE_VALUE = 11
+
+
+class CountSystem(namedtuple('CountSystem', ['name', 'tags', 'initial_count_per_deck'])):
+    @property
+    def card_code_tags(self):
+        return tuple(self.tags[card.value - CARD_VALUES.start] for card in CARDS)
+
+    def initial_count(self, num_decks):
+        return self.initial_count_per_deck * (num_decks - 1)
+
+
+# Tags are listed by card value from two to ace
+COUNT_SYSTEMS = {
+    'hi-lo': CountSystem('hi-lo', (1, 1, 1, 1, 1, 0, 0, 0, -1, -1), 0),
+    'ko': CountSystem('ko', (1, 1, 1, 1, 1, 1, 0, 0, -1, -1), -4),
+    'omega-ii': CountSystem('omega-ii', (1, 1, 2, 2, 2, 1, 0, -1, -2, 0), 0),
+}
+
 
 class Deck:
     def __init__(self):
-        self.cards = [Card(*card_type[0] + (card_type[1],)) for card_type in product(CARD_RANKS, CARD_SUITS)]
+        self.cards = list(CARDS)
 
 
 class Shoe:
-    def __init__(self, num_decks):
+    def __init__(self, num_decks, count_system='hi-lo', rng=None):
         if num_decks <= 0:
             raise ValueError('Shoe must contain one or more decks')
 
-        self.cards = []
+        if count_system not in COUNT_SYSTEMS:
+            raise ValueError('Count system is not valid')
+
+        self.bank = None
+        self.bank_index = 0
+        self.bank_step = 1
+        self.card_codes = array('B')
+        self.count_system = COUNT_SYSTEMS[count_system]
+        self.count_tags = self.count_system.card_code_tags
+        self.cut_card = 0
+        self.instrumentation = None
         self.last_round = False
+        self.num_cards = 0
         self.num_decks = num_decks
+        self.rng = rng if rng is not None else default_rng()
+        self.running_count = 0
+        self.shuffle_size = 0
         self.stop_card = None
 
         self.reset()
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+
+        # Replayed cards are a view into the bank's mapping, so a pickled shoe carries its own copy
+        if isinstance(self.card_codes, memoryview):
+            state['card_codes'] = array('B', self.card_codes)
+
+        return state
+
+    # The shuffled cards stay in place, the cut card is an offset into them and cards are dealt from the end
+    def __index(self, position):
+        index = position + self.cut_card
+
+        return index - self.shuffle_size if index >= self.shuffle_size else index
+
     @property
-    def num_cards(self):
-        return len(self.cards)
+    def cards(self):
+        return [CARDS[self.card_codes[self.__index(position)]] for position in range(self.num_cards)]
+
+    @cards.setter
+    def cards(self, cards):
+        self.card_codes = array('B', [CARD_CODES[card] for card in cards])
+        self.cut_card = 0
+        self.num_cards = len(self.card_codes)
+        self.running_count = self.count_system.initial_count(self.num_decks)
+        self.shuffle_size = self.num_cards
+
+    def __remaining_codes(self):
+        end = self.cut_card + self.num_cards
+
+        if end > self.shuffle_size:
+            return self.card_codes[self.cut_card:self.shuffle_size] + self.card_codes[:end - self.shuffle_size]
+
+        return self.card_codes[self.cut_card:end]
+
+    def burn(self, count):
+        if count > self.num_cards:
+            raise IndexError('Shoe contains no cards`')
+
+        if count <= 0:
+            return
+
+        if self.stop_card and self.num_cards - count < self.stop_card:
+            self.last_round = True
+
+        self.num_cards -= count
+
+    def composition(self):
+        values = self.__remaining_codes().tobytes().translate(CARD_CODE_VALUE_TABLE)
+
+        return [values.count(value) for value in CARD_VALUES]
+
+    @property
+    def true_count(self):
+        if self.num_cards <= 0:
+            return float(self.running_count)
+
+        return self.running_count * CARDS_PER_DECK / self.num_cards
 
     def draw(self):
+        return CARDS[self.draw_code()]
+
+    def draw_code(self):
         if self.num_cards <= 0:
             raise IndexError('Shoe contains no cards`')
 
         if self.stop_card and self.num_cards <= self.stop_card:
             self.last_round = True
 
-        return self.cards.pop()
+        self.num_cards -= 1
+
+        code = self.card_codes[self.__index(self.num_cards)]
+        self.running_count += self.count_tags[code]
+
+        return code
+
+    def draw_many(self, count):
+        if count > self.num_cards:
+            raise IndexError('Shoe contains no cards`')
+
+        if count <= 0:
+            return []
+
+        if self.stop_card and self.num_cards - count < self.stop_card:
+            self.last_round = True
+
+        self.num_cards -= count
+
+        codes = [self.card_codes[self.__index(position)]
+                 for position in range(self.num_cards + count - 1, self.num_cards - 1, -1)]
+
+        self.running_count += sum([self.count_tags[code] for code in codes])
+
+        return [CARDS[code] for code in codes]
+
+    def load(self, card_codes, stop_card=None):
+        self.card_codes = array('B', card_codes)
+        self.cut_card = 0
+        self.last_round = False
+        self.num_cards = len(self.card_codes)
+        self.running_count = self.count_system.initial_count(self.num_decks)
+        self.shuffle_size = self.num_cards
+        self.stop_card = stop_card
+
+    def replay(self, bank, start=0, step=1):
+        if bank is not None and bank.num_decks != self.num_decks:
+            raise ValueError('Shoe bank does not match the number of decks')
+
+        # Only the cursor is set, the next reset loads the first shoe so a game starting after this deals it
+        self.bank = bank
+        self.bank_index = start
+        self.bank_step = step
 
     def reset(self):
-        self.cards = [card for card in Deck().cards for _ in range(self.num_decks)]
+        if self.bank is not None:
+            self.__reset_from_bank()
+            return
+
+        if not isinstance(self.card_codes, array) or len(self.card_codes) != CARDS_PER_DECK * self.num_decks:
+            self.card_codes = array('B', range(CARDS_PER_DECK)) * self.num_decks
+
+        self.cut_card = 0
         self.last_round = False
+        self.num_cards = len(self.card_codes)
+        self.running_count = self.count_system.initial_count(self.num_decks)
+        self.shuffle_size = self.num_cards
         self.stop_card = None
 
+        if self.instrumentation is not None:
+            self.instrumentation.count('reshuffles')
+
         self.shuffle()
 
+    def __reset_from_bank(self):
+        _, self.stop_card, self.card_codes = self.bank.shoe(self.bank_index)
+        self.bank_index += self.bank_step
+
+        # Banked cards are already cut, so they are dealt straight from the mapping without a copy
+        self.cut_card = 0
+        self.last_round = False
+        self.num_cards = len(self.card_codes)
+        self.running_count = self.count_system.initial_count(self.num_decks)
+        self.shuffle_size = self.num_cards
+
+        if self.instrumentation is not None:
+            self.instrumentation.count('reshuffles')
+
+    def snapshot(self):
+        return self.__remaining_codes(), self.stop_card
+
     def shuffle(self):
-        shuffle(self.cards)
+        if self.cut_card and self.num_cards < self.shuffle_size:
+            self.card_codes[:self.shuffle_size] = \
+                self.card_codes[self.cut_card:self.shuffle_size] + self.card_codes[:self.cut_card]
+
+        if self.num_cards == len(self.card_codes):
+            shuffle(self.rng, self.card_codes)
+        else:
+            shuffle(self.rng, memoryview(self.card_codes)[:self.num_cards])
+
+        self.shuffle_size = self.num_cards
 
         cut_card_min = round(self.num_cards * CUT_CARD_PENETRATION_MIN)
         cut_card_max = round(self.num_cards * CUT_CARD_PENETRATION_MAX)
 
-        cut_card = random.randint(cut_card_min, cut_card_max)
-        self.cards = self.cards[cut_card:] + self.cards[:cut_card]
+        cut_card = randint(self.rng, cut_card_min, cut_card_max)
+        self.cut_card = cut_card if cut_card < self.shuffle_size else 0
 
         stop_card_min = round(self.num_cards * STOP_CARD_PENETRATION_MIN)
         stop_card_max = round(self.num_cards * STOP_CARD_PENETRATION_MAX)
 
-        self.stop_card = random.randint(stop_card_min, stop_card_max)
+        self.stop_card = randint(self.rng, stop_card_min, stop_card_max)
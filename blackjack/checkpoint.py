@@ -0,0 +1,41 @@
+import os
+import pickle
+import tempfile
+
+CHECKPOINT_MAGIC = b'BJCP'
+CHECKPOINT_VERSION = 2
+
+
+def write_checkpoint(path, game):
+    # The game owns its random number generator, so pickling the game also captures where its stream is
+    data = CHECKPOINT_MAGIC + bytes([CHECKPOINT_VERSION]) + pickle.dumps(game, pickle.HIGHEST_PROTOCOL)
+
+    # The checkpoint is written beside its final path and swapped in, so a killed run never leaves a partial file
+    directory = os.path.dirname(os.path.abspath(path))
+    file_descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix='.checkpoint-')
+
+    try:
+        with os.fdopen(file_descriptor, 'wb') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def read_checkpoint(path):
+    with open(path, 'rb') as file:
+        data = file.read()
+
+    header_size = len(CHECKPOINT_MAGIC) + 1
+
+    if data[:len(CHECKPOINT_MAGIC)] != CHECKPOINT_MAGIC:
+        raise ValueError('Checkpoint is not valid')
+
+    if data[header_size - 1] != CHECKPOINT_VERSION:
+        raise ValueError('Checkpoint version is not supported')
+
+    return pickle.loads(data[header_size:])
@@ -0,0 +1,142 @@
+import math
+
+from blackjack.cards import Shoe
+from blackjack.game import Game
+from blackjack.game import GameSettings
+from blackjack.rng import child_rng
+from blackjack.runner import shard_sizes
+
+COMPARE_SHARD_SHOES = 100
+
+
+class ComparisonReport:
+    def __init__(self, shoes=None):
+        self.shoes = shoes if shoes else []
+
+    def __statistics(self, paired):
+        count = len(self.shoes)
+
+        if count == 0:
+            return 0.0, 0.0
+
+        net_a, rounds_a, net_b, rounds_b = [sum(column) for column in zip(*self.shoes)]
+        mean_a = net_a / rounds_a if rounds_a else 0.0
+        mean_b = net_b / rounds_b if rounds_b else 0.0
+
+        if count < 2:
+            return mean_a - mean_b, math.inf
+
+        # Per round means are ratio estimates, so their errors come from the linearized residual of every shoe
+        residuals_a = [(shoe[0] - mean_a * shoe[1]) * count / rounds_a for shoe in self.shoes]
+        residuals_b = [(shoe[2] - mean_b * shoe[3]) * count / rounds_b for shoe in self.shoes]
+
+        if paired:
+            variance = sum((a - b) ** 2 for a, b in zip(residuals_a, residuals_b)) / (count - 1)
+        else:
+            variance = (sum(a ** 2 for a in residuals_a) + sum(b ** 2 for b in residuals_b)) / (count - 1)
+
+        return mean_a - mean_b, math.sqrt(variance / count)
+
+    def difference(self):
+        return self.__statistics(paired=True)
+
+    def independent_standard_error(self):
+        return self.__statistics(paired=False)[1]
+
+    def merge(self, other):
+        self.shoes.extend(other.shoes)
+
+        return self
+
+    def summary(self):
+        difference, standard_error = self.difference()
+        independent_standard_error = self.independent_standard_error()
+
+        return {
+            'shoes': len(self.shoes),
+            'rounds': [sum(shoe[1] for shoe in self.shoes), sum(shoe[3] for shoe in self.shoes)],
+            'difference': difference,
+            'standard_error': standard_error,
+            'independent_standard_error': independent_standard_error,
+            'variance_ratio': (independent_standard_error / standard_error) ** 2 if standard_error else math.inf,
+        }
+
+
+def play_synchronized(games, card_codes, stop_card):
+    for game in games:
+        game.shoe.load(card_codes, stop_card)
+
+    # Every round starts from the same card, the variants that used fewer cards burn up to the furthest one
+    while not games[0].shoe.last_round:
+        for game in games:
+            game.play_round()
+
+        num_cards = min(game.shoe.num_cards for game in games)
+
+        for game in games:
+            game.shoe.burn(game.shoe.num_cards - num_cards)
+
+        last_round = any(game.shoe.last_round for game in games)
+
+        for game in games:
+            game.shoe.last_round = last_round
+
+
+def play_comparison_shard(settings, variants, shoes, seed, index, reverse_pass=True):
+    settings = settings if settings else GameSettings()
+    source = Shoe(num_decks=settings.num_decks, rng=child_rng(seed, index))
+    games = []
+
+    for variant in variants:
+        game = Game(settings)
+        game.add_player(dict(variant))
+        games.append(game)
+
+    report = ComparisonReport()
+
+    for _ in range(shoes):
+        source.reset()
+        card_codes, stop_card = source.snapshot()
+
+        # Play stops at the cut card long before the shoe runs out, so the reversed ordering deals other cards of
+        # the same shuffle. It adds rounds for the price of no extra shuffle, the two passes are not negatively
+        # correlated
+        orderings = [card_codes, card_codes[::-1]] if reverse_pass else [card_codes]
+        shoe = [0, 0] * len(games)
+
+        for ordering in orderings:
+            bankrolls = [game.players[0].bankroll for game in games]
+            round_counts = [game.round_count for game in games]
+
+            play_synchronized(games, ordering, stop_card)
+
+            for game_index, game in enumerate(games):
+                shoe[game_index * 2] += game.players[0].bankroll - bankrolls[game_index]
+                shoe[game_index * 2 + 1] += game.round_count - round_counts[game_index]
+
+        report.shoes.append(tuple(shoe))
+
+    return report
+
+
+def compare_strategies(settings, variant_a, variant_b, shoes, seed=0, workers=1, shard_shoes=COMPARE_SHARD_SHOES,
+                       reverse_pass=True):
+    sizes = shard_sizes(shoes, shard_shoes)
+    count = len(sizes)
+    args = ([settings] * count, [[variant_a, variant_b]] * count, sizes, [seed] * count, range(count),
+            [reverse_pass] * count)
+
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            shards = list(executor.map(play_comparison_shard, *args))
+    else:
+        shards = list(map(play_comparison_shard, *args))
+
+    report = ComparisonReport()
+
+    for shard in shards:
+        report.merge(shard)
+
+    return report
@@ -0,0 +1,107 @@
+import json
+
+from blackjack.hand import HandResult
+from blackjack.player import BetStrategyType
+from blackjack.player import CHART_BASIC_STRATEGY
+from blackjack.player import CHART_MODIFIED_STRATEGY
+from blackjack.runner import SHARD_ROUNDS
+from blackjack.settings import GameSettings
+
+CONFIG_PLAYER_STRATEGIES = {
+    'basic': CHART_BASIC_STRATEGY,
+    'modified': CHART_MODIFIED_STRATEGY,
+}
+CONFIG_ROUNDS = 10000
+CONFIG_SEAT_KEYS = ('bankroll', 'bet_limit', 'bet_strategy', 'bet_strategy_settings', 'count', 'player_strategy')
+
+# Table keys are strings in TOML and JSON, so keyed bet strategy settings are turned back into numbers
+CONFIG_NUMERIC_KEYS = ('count_ramp', 'streak_rates')
+
+
+def load_config(path):
+    if str(path).endswith('.toml'):
+        try:
+            import tomllib
+        except ImportError:
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise ImportError('tomli is required to read TOML files before Python 3.11')
+
+        with open(path, 'rb') as file:
+            return tomllib.load(file)
+
+    with open(path) as file:
+        return json.load(file)
+
+
+def number(value):
+    value = float(value)
+
+    return int(value) if value.is_integer() else value
+
+
+def seat_settings(seat):
+    unknown = set(seat) - set(CONFIG_SEAT_KEYS)
+
+    if unknown:
+        raise ValueError('Seat settings {} are not valid'.format(sorted(unknown)))
+
+    settings = {key: seat[key] for key in ('bankroll', 'bet_limit') if key in seat}
+    bet_strategy_settings = dict(seat.get('bet_strategy_settings', {}))
+
+    for key in CONFIG_NUMERIC_KEYS:
+        if key in bet_strategy_settings:
+            bet_strategy_settings[key] = {number(threshold): value
+                                          for threshold, value in bet_strategy_settings[key].items()}
+
+    if 'series_reset_result' in bet_strategy_settings:
+        reset_result = bet_strategy_settings['series_reset_result']
+
+        try:
+            bet_strategy_settings['series_reset_result'] = HandResult[reset_result.upper()]
+        except (AttributeError, KeyError):
+            raise ValueError('Series reset result {} is not valid'.format(reset_result))
+
+    bet_strategy = seat.get('bet_strategy', 'static')
+
+    try:
+        settings['bet_strategy_type'] = BetStrategyType[bet_strategy.upper()]
+    except (AttributeError, KeyError):
+        raise ValueError('Bet strategy {} is not valid'.format(bet_strategy))
+
+    player_strategy = seat.get('player_strategy', 'basic')
+
+    if not isinstance(player_strategy, str) or player_strategy not in CONFIG_PLAYER_STRATEGIES:
+        raise ValueError('Player strategy {} is not valid'.format(player_strategy))
+
+    settings['bet_strategy_settings'] = bet_strategy_settings
+    settings['player_strategy'] = CONFIG_PLAYER_STRATEGIES[player_strategy]
+
+    return [dict(settings, bet_strategy_settings=dict(bet_strategy_settings)) for _ in range(seat.get('count', 1))]
+
+
+def simulation_config(config):
+    unknown = set(config) - {'rounds', 'seats', 'seed', 'seeds', 'shard_rounds', 'table', 'workers'}
+
+    if unknown:
+        raise ValueError('Config settings {} are not valid'.format(sorted(unknown)))
+
+    try:
+        settings = GameSettings(**config.get('table', {}))
+    except TypeError:
+        raise ValueError('Table settings are not valid')
+
+    players = [player for seat in config.get('seats', [{}]) for player in seat_settings(seat)]
+
+    if not players:
+        raise ValueError('Config needs at least one seat')
+
+    return {
+        'settings': settings,
+        'players': players,
+        'rounds': config.get('rounds', CONFIG_ROUNDS),
+        'seeds': config.get('seeds', [config.get('seed', 0)]),
+        'shard_rounds': config.get('shard_rounds', SHARD_ROUNDS),
+        'workers': config.get('workers', 1),
+    }
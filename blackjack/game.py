@@ -1,83 +1,290 @@
+import time
+
+from collections import namedtuple
+
+from blackjack.analysis import fresh_shoe_dealer_distribution
+from blackjack.cards import CARD_VALUES
 from blackjack.cards import Shoe
 from blackjack.player import Player
 from blackjack.player import PlayerAction
+from blackjack.rng import default_rng
+from blackjack.settings import GameSettings
+from blackjack.stats import PlayerStats
+
+CONVERGENCE_MIN_HANDS = 30
+CONVERGENCE_MIN_ROUNDS = 100
+CONVERGENCE_Z = 1.96
 
 
-class GameSettings:
-    def __init__(self, blackjack_payout=1.5, min_bet=10, max_bet=1000, num_decks=8):
-        self.blackjack_payout = blackjack_payout
-        self.min_bet = min_bet
-        self.max_bet = max_bet
-        self.num_decks = num_decks
+class RoundRecord(namedtuple('RoundRecord', ['round', 'seat', 'hand', 'bet', 'result', 'winnings', 'reshuffle'])):
+    __slots__ = ()
 
 
 class Game:
-    def __init__(self, settings=None):
+    def __init__(self, settings=None, instrumentation=None, rng=None, hand_log=None):
+        self.checkpoint_interval = None
+        self.checkpoint_path = None
+        self.convergence_reason = None
+        self.hand_log = hand_log
+        self.instrumentation = instrumentation
         self.settings = settings if settings else GameSettings()
         self.players = [Player.dealer(self.settings)]
         self.round_count = 0
-        self.shoe = Shoe(num_decks=self.settings.num_decks)
+        self.rng = rng if rng is not None else default_rng()
+        self.round_limit = 0
+        self.shoe = Shoe(num_decks=self.settings.num_decks, count_system=self.settings.count_system, rng=self.rng)
+        self.shoe.instrumentation = instrumentation
+        self.stats = {}
+
+    # Instrumentation and hand logs belong to the running process, so neither is checkpointed
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['hand_log'] = None
+        state['instrumentation'] = None
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.shoe.instrumentation = None
+
+    def __play_rounds(self):
+        while self.round_count < self.round_limit:
+            self.play_round()
+
+            if self.shoe.last_round:
+                self.shoe.reset()
+
+            interval = self.checkpoint_interval
+
+            if self.checkpoint_path and interval and self.round_count % interval == 0:
+                self.checkpoint(self.checkpoint_path)
+
+        if self.instrumentation is not None:
+            self.instrumentation.finish()
 
     def add_player(self, player_settings=None):
         player_settings = player_settings if player_settings else {}
         player_settings['game_settings'] = self.settings
+        player_settings['shoe'] = self.shoe
 
         player_settings['number'] = len(self.players)
         self.players.insert(len(self.players) - 1, Player(player_settings))
 
+    def apply_action(self, player, hand, action):
+        stop = False
+
+        if action == PlayerAction.HIT:
+            hand.deal(self.shoe.draw())
+        elif action == PlayerAction.DOUBLE_DOWN:
+            if self.instrumentation is not None:
+                self.instrumentation.count('double_downs')
+
+            player.bankroll -= hand.bet
+            hand.bet *= 2
+            hand.deal(self.shoe.draw())
+            stop = True
+        elif action == PlayerAction.SPLIT:
+            if self.instrumentation is not None:
+                self.instrumentation.count('splits')
+
+            split_hand = player.new_hand(bet=hand.bet)
+            split_hand.deal(hand.split())
+
+            hand.deal(self.shoe.draw())
+        elif action == PlayerAction.STAND:
+            stop = True
+
+        return stop or hand.score >= 21
+
     def play_hand(self, player, hand):
         stop = False
 
         if len(hand.cards) == 1:
             hand.deal(self.shoe.draw())
 
-        dealer_card = self.players[-1].hands[0].cards[1]
+        dealer_card = self.dealer_card
+        composition_dependent = player.composition_dependent
+        hand_log = self.hand_log if not player.dealer else None
 
         while not stop:
-            action = player.action(hand, dealer_card)
-
-            if action == PlayerAction.HIT:
-                hand.deal(self.shoe.draw())
-            elif action == PlayerAction.DOUBLE_DOWN:
-                player.bankroll -= hand.bet
-                hand.bet *= 2
-                hand.deal(self.shoe.draw())
-                stop = True
-            elif action == PlayerAction.SPLIT:
-                split_hand = player.new_hand(bet=hand.bet)
-                split_hand.cards.append(hand.cards.pop())
-
-                hand.deal(self.shoe.draw())
-            elif action == PlayerAction.STAND:
-                stop = True
-
-            if hand.score >= 21:
-                stop = True
+            action = player.action(hand, dealer_card, self.unseen_composition() if composition_dependent else None)
+            stop = self.apply_action(player, hand, action)
+
+            if hand_log is not None:
+                hand_log.decision(player.number, hand, action)
+
+    def converge(self, half_width, z=CONVERGENCE_Z, time_budget=None, max_rounds=None,
+                 min_rounds=CONVERGENCE_MIN_ROUNDS, min_hands=CONVERGENCE_MIN_HANDS, clock=time.monotonic):
+        if half_width <= 0:
+            raise ValueError('Half width must be positive')
+
+        started = clock()
+        rounds = 0
+
+        self.convergence_reason = None
+        self.shoe.reset()
+
+        while self.convergence_reason is None:
+            self.play_round()
+            rounds += 1
+
+            for player in self.players[:-1]:
+                stats = self.stats.setdefault(player.number, PlayerStats())
+
+                for hand in player.hands:
+                    stats.add(hand)
+
+            if self.shoe.last_round:
+                self.shoe.reset()
+
+            # Players that went broke stop adding hands and their frozen intervals would never narrow, so only
+            # players still betting decide convergence, each once it has enough hands for its interval to mean much
+            active = [self.stats[player.number] for player in self.players[:-1]
+                      if player.bankroll >= self.settings.min_bet]
+
+            if not active:
+                self.convergence_reason = 'broke'
+            elif rounds >= min_rounds and all(stats.hands >= min_hands and stats.half_width(z) <= half_width
+                                              for stats in active):
+                self.convergence_reason = 'converged'
+            elif max_rounds is not None and rounds >= max_rounds:
+                self.convergence_reason = 'max_rounds'
+            elif time_budget is not None and clock() - started >= time_budget:
+                self.convergence_reason = 'time_budget'
+
+        if self.instrumentation is not None:
+            self.instrumentation.finish()
+
+        return self.results(z)
+
+    @property
+    def dealer_card(self):
+        return self.players[-1].hands[0].cards[0 if self.settings.analytic_dealer else 1]
+
+    def unseen_composition(self):
+        composition = self.shoe.composition()
+
+        if not self.settings.analytic_dealer:
+            hole_card = self.players[-1].hands[0].cards[0]
+            composition[hole_card.value - CARD_VALUES.start] += 1
+
+        return composition
+
+    def begin_round(self):
+        instrumentation = self.instrumentation
+
+        if instrumentation is not None:
+            instrumentation.start_round(self.shoe.num_cards)
 
-    def play_round(self):
         self.round_count += 1
 
         for player in self.players:
             player.reset_hands()
-            player.new_hand()
 
-        for _ in range(2):
-            for player in self.players:
-                for hand in player.hands:
-                    hand.deal(self.shoe.draw())
+            if player.new_hand() is None and instrumentation is not None:
+                instrumentation.count('broke_players')
 
-        for player in self.players:
+        # Without a hole card the dealer is only dealt the upcard in the second pass
+        hands = [hand for player in self.players for hand in player.hands]
+        first_hands = hands[:-1] if self.settings.analytic_dealer else hands
+
+        for hand, card in zip(first_hands + hands, self.shoe.draw_many(len(first_hands) + len(hands))):
+            hand.deal(card)
+
+        if instrumentation is not None:
+            instrumentation.lap('deal')
+
+    def finish_round(self):
+        instrumentation = self.instrumentation
+
+        if instrumentation is not None:
+            instrumentation.lap('player')
+
+        dealer = self.players[-1]
+
+        if self.settings.analytic_dealer:
+            distribution = fresh_shoe_dealer_distribution(self.dealer_card.value, self.settings.num_decks,
+                                                          self.settings.dealer_hit_soft_17)
+        else:
+            for hand in dealer.hands:
+                self.play_hand(dealer, hand)
+
+        if instrumentation is not None:
+            instrumentation.lap('dealer')
+
+        for player in self.players[:-1]:
+            if self.settings.analytic_dealer:
+                player.calculate_expected_results(distribution)
+            else:
+                player.calculate_hand_results(dealer.hands[0])
+
+        if self.hand_log is not None:
+            self.hand_log.end_round(self)
+
+        if instrumentation is not None:
+            instrumentation.lap('settle')
+            instrumentation.end_round(self)
+
+    def play_round(self):
+        self.begin_round()
+
+        for player in self.players[:-1]:
             for hand in player.hands:
                 self.play_hand(player, hand)
 
-        for player in self.players[:-1]:
-            player.calculate_hand_results(self.players[-1].hands[0])
+        self.finish_round()
 
-    def start(self, rounds=25):
+    def records(self, rounds=25):
         self.shoe.reset()
 
         for _ in range(rounds):
             self.play_round()
 
-            if self.shoe.last_round:
+            reshuffle = self.shoe.last_round
+
+            for player in self.players[:-1]:
+                for hand in player.hands:
+                    yield RoundRecord(self.round_count, player.number, hand.number, hand.bet, hand.result,
+                                      hand.winnings, reshuffle)
+
+            if reshuffle:
                 self.shoe.reset()
+
+        if self.instrumentation is not None:
+            self.instrumentation.finish()
+
+    def checkpoint(self, path):
+        # Checkpointing pulls in pickle and tempfile, which short runs that never checkpoint do not need to load
+        from blackjack.checkpoint import write_checkpoint
+
+        write_checkpoint(path, self)
+
+    @classmethod
+    def resume(cls, path, instrumentation=None, hand_log=None):
+        from blackjack.checkpoint import read_checkpoint
+
+        game = read_checkpoint(path)
+        game.hand_log = hand_log
+        game.instrumentation = instrumentation
+        game.shoe.instrumentation = instrumentation
+
+        game.__play_rounds()
+
+        return game
+
+    def results(self, z=CONVERGENCE_Z):
+        return {
+            'rounds': self.round_count,
+            'reason': self.convergence_reason,
+            'players': {number: dict(stats.summary(), half_width=stats.half_width(z))
+                        for number, stats in sorted(self.stats.items())},
+        }
+
+    def start(self, rounds=25, checkpoint_path=None, checkpoint_interval=None):
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoint_path = checkpoint_path
+        self.round_limit = self.round_count + rounds
+
+        self.shoe.reset()
+        self.__play_rounds()
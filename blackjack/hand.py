@@ -1,5 +1,10 @@
 from enum import Enum
 
+from blackjack.cards import ACE_VALUE
+
+DEALER_SCORES = range(17, 22)
+DEALER_BUST = len(DEALER_SCORES)
+
 
 class HandResult(Enum):
     WIN = 1
@@ -11,38 +16,29 @@ class HandResult(Enum):
 
 
 class Hand:
+    __slots__ = ('ace_count', 'bet', 'blackjack', 'bust', 'cards', 'expected_value', 'hard_score', 'number',
+                 'result', 'soft', 'score', 'variance', 'winnings')
+
     def __init__(self, bet=10, number=1):
+        self.ace_count = 0
         self.bet = bet
         self.blackjack = False
         self.bust = False
         self.cards = []
+        self.expected_value = None
+        self.hard_score = 0
         self.number = number
         self.result = None
         self.soft = False
         self.score = 0
+        self.variance = None
         self.winnings = 0
 
     def __update_score(self):
-        self.score = sum([card.value for card in self.cards])
-
-        ace_count = 0
-        hard_ace_count = 0
-
-        for card in self.cards:
-            if card.rank == 'A':
-                ace_count += 1
-
-                if self.score > 21:
-                    hard_ace_count += 1
-                    self.score -= 10
-
-        if ace_count > hard_ace_count:
-            self.soft = True
-        else:
-            self.soft = False
-
-        if self.score > 21:
-            self.bust = True
+        # Aces are counted as one in the hard score, at most one ace can be counted as eleven without busting
+        self.soft = self.ace_count > 0 and self.hard_score <= 11
+        self.score = self.hard_score + 10 if self.soft else self.hard_score
+        self.bust = self.score > 21
 
         if self.score == 21 and len(self.cards) == 2:
             self.blackjack = True
@@ -57,6 +53,58 @@ class Hand:
 
         return self.result
 
+    def calculate_expected_result(self, dealer_distribution, blackjack_payout):
+        win = 0.0
+        push = 0.0
+        lose = 0.0
+
+        if self.bust:
+            lose = 1.0
+        else:
+            win = dealer_distribution[DEALER_BUST]
+
+            for dealer_score, probability in zip(DEALER_SCORES, dealer_distribution):
+                if dealer_score < self.score:
+                    win += probability
+                elif dealer_score == self.score:
+                    push += probability
+                else:
+                    lose += probability
+
+        win_amount = self.bet * blackjack_payout if self.blackjack else self.bet
+
+        self.expected_value = win * win_amount - lose * self.bet
+        self.variance = win * win_amount ** 2 + lose * self.bet ** 2 - self.expected_value ** 2
+
+        if self.expected_value > 0:
+            self.result = HandResult.WIN
+        elif self.expected_value < 0:
+            self.result = HandResult.LOSE
+        else:
+            self.result = HandResult.PUSH
+
+        return self.result
+
     def deal(self, card):
         self.cards.append(card)
+
+        if card.value == ACE_VALUE:
+            self.ace_count += 1
+            self.hard_score += 1
+        else:
+            self.hard_score += card.value
+
         self.__update_score()
+
+    def split(self):
+        card = self.cards.pop()
+
+        if card.value == ACE_VALUE:
+            self.ace_count -= 1
+            self.hard_score -= 1
+        else:
+            self.hard_score -= card.value
+
+        self.__update_score()
+
+        return card
@@ -0,0 +1,218 @@
+import bz2
+import gzip
+import lzma
+import struct
+import time
+
+from collections import namedtuple
+from functools import partial
+
+from blackjack.cards import CARDS
+from blackjack.hand import HandResult
+from blackjack.player import PlayerAction
+
+HANDLOG_BUFFER_SIZE = 1 << 20
+# The fastest levels keep compression in step with the simulation, the fixed width records still shrink severalfold
+HANDLOG_COMPRESSION = {
+    None: open,
+    'bz2': partial(bz2.open, compresslevel=1),
+    'gzip': partial(gzip.open, compresslevel=1),
+    'lzma': partial(lzma.open, preset=0),
+}
+HANDLOG_COMPRESSION_MAGIC = {
+    b'BZh': bz2.open,
+    b'\x1f\x8b': gzip.open,
+    b'\xfd7zXZ\x00': lzma.open,
+}
+HANDLOG_MAGIC = b'BJHL'
+HANDLOG_NO_CARD = 0xff
+HANDLOG_VERSION = 1
+
+# Every record leads with its type, decisions and settled hands of a round are followed by the round's own record
+HANDLOG_DECISION = struct.Struct('<BBBBB')
+HANDLOG_HAND = struct.Struct('<BBBBBdBd')
+HANDLOG_ROUND = struct.Struct('<BQBBB')
+HANDLOG_DRAW_ACTIONS = frozenset(action.value for action in (PlayerAction.HIT, PlayerAction.DOUBLE_DOWN))
+# Room kept past the buffer size for the round in progress, far more than any table writes in one round
+HANDLOG_ROUND_BYTES = 1 << 16
+
+HANDLOG_RECORD_DECISION = 1
+HANDLOG_RECORD_HAND = 2
+HANDLOG_RECORD_ROUND = 3
+HANDLOG_RECORDS = {
+    HANDLOG_RECORD_DECISION: HANDLOG_DECISION,
+    HANDLOG_RECORD_HAND: HANDLOG_HAND,
+    HANDLOG_RECORD_ROUND: HANDLOG_ROUND,
+}
+
+# Hits and doubles log the card they drew, so a hand's cards are its first two followed by those draws. The card a
+# split deals is already among the hand's first cards, so split decisions log no card
+LoggedDecision = namedtuple('LoggedDecision', ['seat', 'hand', 'action', 'card'])
+LoggedHand = namedtuple('LoggedHand', ['seat', 'hand', 'first_cards', 'bet', 'result', 'winnings'])
+LoggedRound = namedtuple('LoggedRound', ['round', 'upcard', 'dealer_score', 'reshuffle', 'decisions', 'hands'])
+
+
+class HandLog:
+    def __init__(self, path, buffer_size=HANDLOG_BUFFER_SIZE, flush_interval=None, rotate_bytes=None,
+                 compression=None, clock=time.monotonic):
+        if compression not in HANDLOG_COMPRESSION:
+            raise ValueError('Compression is not valid')
+
+        if buffer_size <= 0:
+            raise ValueError('Buffer size must be positive')
+
+        if rotate_bytes is not None and rotate_bytes <= 0:
+            raise ValueError('Rotate bytes must be positive')
+
+        self.buffer = bytearray(buffer_size + HANDLOG_ROUND_BYTES)
+        self.buffer_size = buffer_size
+        self.bytes_written = 0
+        self.clock = clock
+        self.compression = compression
+        self.file = None
+        self.file_bytes = 0
+        self.flushed = clock()
+        self.flush_interval = flush_interval
+        self.offset = 0
+        self.path = path
+        self.paths = []
+        self.records_written = 0
+        self.rotate_bytes = rotate_bytes
+        self.round_end = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __open(self):
+        path = self.path if not self.paths else '{}.{}'.format(self.path, len(self.paths))
+
+        self.file = HANDLOG_COMPRESSION[self.compression](path, 'wb')
+        self.file.write(HANDLOG_MAGIC + bytes([HANDLOG_VERSION]))
+        self.file_bytes = 0
+        self.paths.append(path)
+
+    def close(self):
+        self.flush()
+
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    # Records are packed straight into the preallocated buffer, no tuples or bytes objects are built on the way
+    def decision(self, seat, hand, action):
+        # Enum members keep their value in _value_, reading it directly skips the slower value property and hash
+        value = action._value_
+
+        HANDLOG_DECISION.pack_into(self.buffer, self.offset, HANDLOG_RECORD_DECISION, seat, hand.number, value,
+                                   hand.cards[-1].code if value in HANDLOG_DRAW_ACTIONS else HANDLOG_NO_CARD)
+        self.offset += HANDLOG_DECISION.size
+        self.records_written += 1
+
+    def end_round(self, game):
+        buffer = self.buffer
+        offset = self.offset
+        players = game.players
+        records = 1
+
+        for player in players[:-1]:
+            number = player.number
+
+            for hand in player.hands:
+                cards = hand.cards
+                result = hand.result
+
+                HANDLOG_HAND.pack_into(buffer, offset, HANDLOG_RECORD_HAND, number, hand.number, cards[0].code,
+                                       cards[1].code if len(cards) > 1 else HANDLOG_NO_CARD, hand.bet,
+                                       result._value_ if result is not None else 0, hand.winnings)
+                offset += HANDLOG_HAND.size
+                records += 1
+
+        HANDLOG_ROUND.pack_into(buffer, offset, HANDLOG_RECORD_ROUND, game.round_count, game.dealer_card.code,
+                                0 if game.settings.analytic_dealer else players[-1].hands[0].score,
+                                game.shoe.last_round)
+
+        self.offset = self.round_end = offset + HANDLOG_ROUND.size
+        self.records_written += records
+
+        # Flushing and rotating only between rounds keeps every file readable on its own
+        if self.round_end >= self.buffer_size or \
+                (self.flush_interval is not None and self.clock() - self.flushed >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        self.flushed = self.clock()
+        end = self.round_end
+
+        if not end:
+            return
+
+        if self.file is None or (self.rotate_bytes is not None and self.file_bytes >= self.rotate_bytes):
+            if self.file is not None:
+                self.file.close()
+
+            self.__open()
+
+        with memoryview(self.buffer) as data:
+            self.file.write(data[:end])
+
+        self.file.flush()
+
+        # Decisions of a round still being played stay behind for the next flush
+        self.buffer[:self.offset - end] = self.buffer[end:self.offset]
+        self.offset -= end
+        self.round_end = 0
+        self.bytes_written += end
+        self.file_bytes += end
+
+
+def open_hand_log(path):
+    with open(path, 'rb') as file:
+        head = file.read(max(len(magic) for magic in HANDLOG_COMPRESSION_MAGIC))
+
+    opener = next((value for key, value in HANDLOG_COMPRESSION_MAGIC.items() if head.startswith(key)), open)
+
+    return opener(path, 'rb')
+
+
+def read_hand_log(path):
+    with open_hand_log(path) as file:
+        data = file.read()
+
+    if data[:len(HANDLOG_MAGIC)] != HANDLOG_MAGIC:
+        raise ValueError('Hand log is not valid')
+
+    if data[len(HANDLOG_MAGIC)] != HANDLOG_VERSION:
+        raise ValueError('Hand log version is not supported')
+
+    offset = len(HANDLOG_MAGIC) + 1
+    decisions = []
+    hands = []
+
+    while offset < len(data):
+        record = HANDLOG_RECORDS.get(data[offset])
+
+        if record is None or offset + record.size > len(data):
+            raise ValueError('Hand log is not valid')
+
+        fields = record.unpack_from(data, offset)
+        offset += record.size
+
+        if record is HANDLOG_DECISION:
+            _, seat, hand, action, card = fields
+            decisions.append(LoggedDecision(seat, hand, PlayerAction(action),
+                                            CARDS[card] if card != HANDLOG_NO_CARD else None))
+        elif record is HANDLOG_HAND:
+            _, seat, hand, first_card, second_card, bet, result, winnings = fields
+            first_cards = tuple(CARDS[card] for card in (first_card, second_card) if card != HANDLOG_NO_CARD)
+            result = HandResult(result) if result else None
+            hands.append(LoggedHand(seat, hand, first_cards, bet, result, winnings))
+        else:
+            _, round_count, upcard, dealer_score, reshuffle = fields
+
+            yield LoggedRound(round_count, CARDS[upcard], dealer_score, bool(reshuffle), decisions, hands)
+
+            decisions = []
+            hands = []
@@ -0,0 +1,80 @@
+import json
+import time
+
+INSTRUMENTATION_PHASES = ('deal', 'player', 'dealer', 'settle')
+
+
+class Instrumentation:
+    def __init__(self, snapshot_interval=None, snapshot_callback=None, output_path=None, clock=time.perf_counter):
+        if snapshot_interval is not None and snapshot_interval <= 0:
+            raise ValueError('Snapshot interval must be positive')
+
+        self.clock = clock
+        self.counters = {}
+        self.lap_start = None
+        self.output_path = output_path
+        self.round_cards = 0
+        self.rounds = 0
+        self.snapshot_callback = snapshot_callback
+        self.snapshot_interval = snapshot_interval
+        self.snapshots = []
+        self.started = clock()
+        self.timers = {phase: 0.0 for phase in INSTRUMENTATION_PHASES}
+
+    def count(self, event, amount=1):
+        self.counters[event] = self.counters.get(event, 0) + amount
+
+    def lap(self, phase):
+        now = self.clock()
+
+        self.timers[phase] += now - self.lap_start
+        self.lap_start = now
+
+    def start_round(self, num_cards):
+        self.round_cards = num_cards
+        self.lap_start = self.clock()
+
+    def end_round(self, game):
+        self.rounds += 1
+
+        self.count('draws', self.round_cards - game.shoe.num_cards)
+
+        for player in game.players[:-1]:
+            for hand in player.hands:
+                self.count('hands')
+
+                if hand.bust:
+                    self.count('busts')
+
+                if hand.blackjack:
+                    self.count('blackjacks')
+
+        if self.snapshot_interval and self.rounds % self.snapshot_interval == 0:
+            snapshot = self.summary()
+
+            if self.snapshot_callback:
+                self.snapshot_callback(snapshot)
+            else:
+                self.snapshots.append(snapshot)
+
+    def finish(self):
+        if self.output_path:
+            self.write(self.output_path)
+
+    def summary(self):
+        elapsed = self.clock() - self.started
+        timed = sum(self.timers.values())
+
+        return {
+            'rounds': self.rounds,
+            'elapsed': elapsed,
+            'rounds_per_sec': self.rounds / elapsed if elapsed > 0 else 0.0,
+            'counters': dict(sorted(self.counters.items())),
+            'timers': {phase: {'seconds': seconds, 'share': seconds / timed if timed > 0 else 0.0}
+                       for phase, seconds in self.timers.items()},
+        }
+
+    def write(self, path):
+        with open(path, 'w') as file:
+            json.dump(self.summary(), file, indent=2)
+            file.write('\n')
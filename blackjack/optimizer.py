@@ -0,0 +1,171 @@
+import copy
+import math
+
+from collections import namedtuple
+
+from blackjack.cards import CARD_VALUES
+from blackjack.cards import Shoe
+from blackjack.compare import play_synchronized
+from blackjack.game import Game
+from blackjack.game import GameSettings
+from blackjack.player import CHART_BASIC_STRATEGY
+from blackjack.player import CompiledStrategy
+from blackjack.player import PlayerAction
+from blackjack.rng import child_rng
+
+OPTIMIZER_BANKROLL = 10 ** 9
+OPTIMIZER_BATCH_ROUNDS = 500
+OPTIMIZER_MAX_BATCHES = 100
+OPTIMIZER_MIN_BATCHES = 5
+OPTIMIZER_Z = 3.0
+
+CellChange = namedtuple('CellChange', ['cell', 'previous_action', 'action', 'mean', 'half_width', 'batches'])
+OptimizationResult = namedtuple('OptimizationResult', ['chart', 'changes', 'rounds'])
+
+
+class Candidate:
+    def __init__(self, cell, action, chart):
+        self.action = action
+        self.cell = cell
+        self.chart = chart
+        self.differences = []
+        self.status = None
+
+    def interval(self, z=OPTIMIZER_Z):
+        count = len(self.differences)
+        mean = sum(self.differences) / count if count > 0 else 0.0
+
+        if count < 2:
+            return mean, math.inf
+
+        variance = sum((difference - mean) ** 2 for difference in self.differences) / (count - 1)
+
+        return mean, z * math.sqrt(variance / count)
+
+    def update(self, difference, min_batches=OPTIMIZER_MIN_BATCHES, z=OPTIMIZER_Z):
+        self.differences.append(difference)
+
+        if len(self.differences) < min_batches:
+            return
+
+        mean, half_width = self.interval(z)
+
+        if mean + half_width < 0:
+            self.status = 'worse'
+        elif mean - half_width > 0:
+            self.status = 'better'
+
+
+def candidate_actions(cell):
+    actions = [PlayerAction.HIT, PlayerAction.STAND, PlayerAction.DOUBLE_DOWN]
+
+    return actions + [PlayerAction.SPLIT] if cell[0] == 'pair' else actions
+
+
+def chart_cells(chart):
+    return [(chart_key, row_key, upcard_value)
+            for chart_key in ('hard', 'soft', 'pair')
+            for row_key in chart[chart_key]
+            for upcard_value in CARD_VALUES]
+
+
+def play_batch(settings, charts, rounds, seed, index):
+    settings = settings if settings else GameSettings()
+    source = Shoe(num_decks=settings.num_decks, rng=child_rng(seed, index))
+    games = []
+
+    for chart in charts:
+        game = Game(settings)
+        game.add_player({'bankroll': OPTIMIZER_BANKROLL, 'player_strategy': chart})
+        games.append(game)
+
+    # Whole shoes are played in step as in compare, so a split or double in one chart can not move others' cards
+    while games[0].round_count < rounds:
+        source.reset()
+        play_synchronized(games, *source.snapshot())
+
+    round_count = games[0].round_count
+
+    return round_count, [(game.players[0].bankroll - OPTIMIZER_BANKROLL) / round_count for game in games]
+
+
+def replace_cell(chart, cell, action):
+    chart_key, row_key, upcard_value = cell
+
+    chart = {key: {row: list(actions) for row, actions in rows.items()} for key, rows in chart.items()}
+    chart[chart_key][row_key][upcard_value - CARD_VALUES.start] = action
+
+    return chart
+
+
+def optimize_chart(settings=None, chart=CHART_BASIC_STRATEGY, cells=None, seed=0, workers=1,
+                   batch_rounds=OPTIMIZER_BATCH_ROUNDS, min_batches=OPTIMIZER_MIN_BATCHES,
+                   max_batches=OPTIMIZER_MAX_BATCHES, z=OPTIMIZER_Z, passes=1):
+    CompiledStrategy.validate(chart)
+
+    if batch_rounds <= 0 or min_batches < 2 or max_batches < min_batches:
+        raise ValueError('Batch settings are not valid')
+
+    cells = cells if cells is not None else chart_cells(chart)
+    incumbent = copy.deepcopy(chart)
+    changes = []
+    rounds = 0
+
+    if workers > 1:
+        # Process pools are slow to import, so single process runs never load them
+        from concurrent.futures import ProcessPoolExecutor
+
+        executor = ProcessPoolExecutor(max_workers=workers)
+    else:
+        executor = None
+
+    try:
+        for pass_index in range(passes):
+            candidates = [Candidate(cell, action, replace_cell(incumbent, cell, action)) for cell in cells
+                          for action in candidate_actions(cell)
+                          if action != incumbent[cell[0]][cell[1]][cell[2] - CARD_VALUES.start]]
+
+            # Every candidate plays beside the incumbent on the batch's shoes, so pairs share common random numbers
+            for batch_index in range(pass_index * max_batches, (pass_index + 1) * max_batches):
+                active = [candidate for candidate in candidates if candidate.status is None]
+
+                if not active:
+                    break
+
+                count = len(active)
+                args = ([settings] * count, [[incumbent, candidate.chart] for candidate in active],
+                        [batch_rounds] * count, [seed] * count, [batch_index] * count)
+
+                batches = list(executor.map(play_batch, *args) if executor else map(play_batch, *args))
+
+                for candidate, (round_count, (incumbent_mean, candidate_mean)) in zip(active, batches):
+                    candidate.update(candidate_mean - incumbent_mean, min_batches, z)
+                    rounds += round_count * 2
+
+            pass_changes = []
+
+            for cell in cells:
+                better = [candidate for candidate in candidates
+                          if candidate.cell == cell and candidate.status == 'better']
+
+                if not better:
+                    continue
+
+                best = max(better, key=lambda candidate: candidate.interval(z)[0])
+                mean, half_width = best.interval(z)
+
+                pass_changes.append(CellChange(cell, incumbent[cell[0]][cell[1]][cell[2] - CARD_VALUES.start],
+                                               best.action, mean, half_width, len(best.differences)))
+
+            for change in pass_changes:
+                incumbent = replace_cell(incumbent, change.cell, change.action)
+
+            changes.extend(pass_changes)
+
+            if not pass_changes:
+                break
+    finally:
+        if executor:
+            executor.shutdown()
+
+    return OptimizationResult(incumbent, changes, rounds)
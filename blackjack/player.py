@@ -1,9 +1,13 @@
 import copy
 
+from collections import namedtuple
 from enum import Enum
 
+from blackjack.cards import ACE_VALUE
+from blackjack.cards import CARD_RANKS
 from blackjack.hand import Hand
 from blackjack.hand import HandResult
+from blackjack.stats import BankrollTracker
 
 
 class BetStrategyType(Enum):
@@ -12,6 +16,7 @@ class BetStrategyType(Enum):
     SERIES = 3
     STATIC = 4
     STREAK = 5
+    COUNT = 6
 
     def __str__(self):
         return str(self.name).title()
@@ -82,8 +87,27 @@ CHART_MODIFIED_STRATEGY['hard'][10] = [PlayerAction.DOUBLE_DOWN] * 7 + [PlayerAc
 CHART_MODIFIED_STRATEGY['hard'][11] = [PlayerAction.DOUBLE_DOWN] * 8 + [PlayerAction.STAND] * 2
 CHART_MODIFIED_STRATEGY['pair']['A'] = [PlayerAction.SPLIT] * 8 + [PlayerAction.HIT] + [PlayerAction.SPLIT]
 
+CHART_HARD_SCORES = range(4, 22)
+CHART_SOFT_SCORES = range(12, 22)
+CHART_PAIR_RANKS = [rank for rank, _ in CARD_RANKS]
+CHART_PAIR_VALUES = {rank: value for rank, value in CARD_RANKS}
+CHART_ROW_LENGTH = 10
+
+HAND_STATE_SOFT_OFFSET = len(CHART_HARD_SCORES)
+HAND_STATE_PAIR_OFFSET = HAND_STATE_SOFT_OFFSET + len(CHART_SOFT_SCORES)
+HAND_STATE_PAIR_INDEX = {rank: HAND_STATE_PAIR_OFFSET + index for index, rank in enumerate(CHART_PAIR_RANKS)}
+HAND_STATES = HAND_STATE_PAIR_OFFSET + len(CHART_PAIR_RANKS)
+
+HAND_FLAG_MORE_CARDS = 1
+HAND_FLAG_LOW_BANKROLL = 2
+HAND_FLAGS = 4
+
 BET_STRATEGY_MAX_HAND_HISTORY = 20
 
+COMPILED_STRATEGY_CACHE_SIZE = 64
+
+HandRecord = namedtuple('HandRecord', ['result', 'bet', 'winnings'])
+
 
 class BetStrategy:
     def __init__(self, settings):
@@ -91,11 +115,29 @@ class BetStrategy:
 
         self.bet_limit = settings.pop('bet_limit', None)
         self.game_settings = settings.pop('game_settings', None)
-        self.hand_history = []
+        self.hand_count = 0
+        self.hand_records = [None] * BET_STRATEGY_MAX_HAND_HISTORY
+        self.shoe = settings.pop('shoe', None)
         self.strategy_type = settings.pop('strategy_type', None)
+        self.streak_count = 0
+        self.streak_result = None
 
         self.extra_settings = settings
 
+        self.__select_strategy()
+
+    # The selected strategy is a bound private method that pickle can not find by name, so it is rebound on load
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['strategy']
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__select_strategy()
+
+    def __select_strategy(self):
         if self.strategy_type == BetStrategyType.MARTINGALE:
             self.strategy = self.__strategy_martingale
         elif self.strategy_type == BetStrategyType.PARLAY:
@@ -104,9 +146,33 @@ class BetStrategy:
             self.strategy = self.__strategy_series
         elif self.strategy_type == BetStrategyType.STREAK:
             self.strategy = self.__strategy_streak
+        elif self.strategy_type == BetStrategyType.COUNT:
+            self.strategy = self.__strategy_count
         else:
             self.strategy = self.__strategy_static
 
+    def __strategy_count(self):
+        if not hasattr(self, 'count_ramp'):
+            count_ramp = self.extra_settings.get('count_ramp', None)
+
+            if not count_ramp or not isinstance(count_ramp, dict) or len(count_ramp) <= 0:
+                raise ValueError('Count ramp is not valid')
+
+            self.count_ramp = sorted(count_ramp.items(), reverse=True)
+
+        if not self.shoe:
+            raise ValueError('Shoe not provided')
+
+        true_count = self.shoe.true_count
+        units = 1
+
+        for threshold, threshold_units in self.count_ramp:
+            if true_count >= threshold:
+                units = threshold_units
+                break
+
+        return self.__validate_bet(self.game_settings.min_bet * units)
+
     def __strategy_martingale(self):
         bet = self.game_settings.min_bet
 
@@ -121,7 +187,7 @@ class BetStrategy:
     def __strategy_parlay(self):
         bet = self.game_settings.min_bet
 
-        if self.last_hand and self.last_hand.result.WIN:
+        if self.last_hand and self.last_hand.result == HandResult.WIN:
             bet = self.last_hand.bet + self.last_hand.winnings
 
         return self.__validate_bet(bet)
@@ -152,19 +218,7 @@ class BetStrategy:
         if not streak_rates or not isinstance(streak_rates, dict) or len(streak_rates) <= 0:
             raise ValueError('Streak rates are not valid')
 
-        streak_count = 0
-
-        if self.last_hand:
-            for hand in self.hand_history[::-1]:
-                if hand.result == self.last_hand.result == hand.result:
-                    streak_count += 1
-                else:
-                    break
-
-            if self.last_hand.result == HandResult.LOSE:
-                streak_count -= 1
-
-        bet = self.game_settings.min_bet * streak_rates.get(streak_count, 1)
+        bet = self.game_settings.min_bet * streak_rates.get(self.streak, 1)
 
         return self.__validate_bet(bet)
 
@@ -177,19 +231,154 @@ class BetStrategy:
 
         return bet
 
+    # Hand records are kept in a fixed size ring buffer, the oldest record is overwritten once it is full
+    @property
+    def hand_history(self):
+        start = max(self.hand_count - len(self.hand_records), 0)
+
+        return [self.hand_records[index % len(self.hand_records)] for index in range(start, self.hand_count)]
+
     @property
     def last_hand(self):
-        return self.hand_history[-1] if len(self.hand_history) > 0 else None
+        return self.hand_records[(self.hand_count - 1) % len(self.hand_records)] if self.hand_count > 0 else None
 
     @last_hand.setter
     def last_hand(self, hand):
-        self.hand_history.append(hand)
-        self.hand_history = self.hand_history[:BET_STRATEGY_MAX_HAND_HISTORY]
+        if hand is None:
+            return
+
+        record = HandRecord(hand.result, hand.bet, hand.winnings)
+        self.hand_records[self.hand_count % len(self.hand_records)] = record
+        self.hand_count += 1
+
+        if hand.result == self.streak_result:
+            self.streak_count += 1
+        else:
+            self.streak_count = 1
+            self.streak_result = hand.result
+
+    @property
+    def streak(self):
+        if self.streak_result == HandResult.WIN:
+            return self.streak_count
+        elif self.streak_result == HandResult.LOSE:
+            return -self.streak_count
+
+        return 0
 
     def bet(self):
         return self.strategy()
 
 
+class CompiledStrategy:
+    cache = {}
+    composition_dependent = False
+
+    def __init__(self, chart, fallback_chart=CHART_BASIC_STRATEGY):
+        self.validate(chart)
+        self.validate(fallback_chart)
+
+        actions = []
+
+        for state, chart_key, score, row in self.__rows(chart):
+            for chart_index in range(CHART_ROW_LENGTH):
+                for flags in range(HAND_FLAGS):
+                    action = row[chart_index]
+
+                    if action == PlayerAction.DOUBLE_DOWN and flags & HAND_FLAG_MORE_CARDS:
+                        action = PlayerAction.HIT
+
+                    if flags & HAND_FLAG_LOW_BANKROLL:
+                        if action == PlayerAction.DOUBLE_DOWN:
+                            action = PlayerAction.HIT
+                        elif action == PlayerAction.SPLIT:
+                            action = fallback_chart['soft' if chart_key == 'soft' else 'hard'][score][chart_index]
+
+                    actions.append(action)
+
+        self.actions = tuple(actions)
+
+    # Tables with many seats share charts, so strategies are compiled once per distinct chart content
+    @classmethod
+    def compile(cls, chart, fallback_chart=CHART_BASIC_STRATEGY):
+        try:
+            key = tuple(tuple(row) for chart in (chart, fallback_chart) for _, _, _, row in cls.__rows(chart))
+            hash(key)
+        except (AttributeError, KeyError, TypeError):
+            return cls(chart, fallback_chart)
+
+        strategy = cls.cache.get(key, None)
+
+        if strategy is None:
+            strategy = cls(chart, fallback_chart)
+
+            if len(cls.cache) >= COMPILED_STRATEGY_CACHE_SIZE:
+                cls.cache.clear()
+
+            cls.cache[key] = strategy
+
+        return strategy
+
+    @staticmethod
+    def __rows(chart):
+        for score in CHART_HARD_SCORES:
+            yield score - CHART_HARD_SCORES.start, 'hard', score, chart['hard'][score]
+
+        for score in CHART_SOFT_SCORES:
+            yield HAND_STATE_SOFT_OFFSET + score - CHART_SOFT_SCORES.start, 'soft', score, chart['soft'][score]
+
+        for rank in CHART_PAIR_RANKS:
+            value = CHART_PAIR_VALUES[rank]
+
+            if value == ACE_VALUE:
+                yield HAND_STATE_PAIR_INDEX[rank], 'soft', value + 1, chart['pair'][rank]
+            else:
+                yield HAND_STATE_PAIR_INDEX[rank], 'hard', value * 2, chart['pair'][rank]
+
+    @staticmethod
+    def validate(chart):
+        if not isinstance(chart, dict):
+            raise ValueError('Strategy chart is not valid')
+
+        rows = [('hard', score) for score in CHART_HARD_SCORES] + \
+               [('soft', score) for score in CHART_SOFT_SCORES] + \
+               [('pair', rank) for rank in CHART_PAIR_RANKS]
+
+        for chart_key, chart_value in rows:
+            row = chart.get(chart_key, {}).get(chart_value, None)
+
+            if not isinstance(row, list) or len(row) != CHART_ROW_LENGTH:
+                raise ValueError('Strategy chart row {} {} is not valid'.format(chart_key, chart_value))
+
+            for action in row:
+                if not isinstance(action, PlayerAction):
+                    raise ValueError('Strategy chart row {} {} is not valid'.format(chart_key, chart_value))
+
+                if action == PlayerAction.SPLIT and chart_key != 'pair':
+                    raise ValueError('Strategy chart row {} {} can not split'.format(chart_key, chart_value))
+
+    @staticmethod
+    def hand_state(hand):
+        cards = hand.cards
+
+        if len(cards) == 2 and cards[0].rank == cards[1].rank:
+            return HAND_STATE_PAIR_INDEX[cards[0].rank]
+        elif hand.soft:
+            return HAND_STATE_SOFT_OFFSET + hand.score - CHART_SOFT_SCORES.start
+        else:
+            return hand.score - CHART_HARD_SCORES.start
+
+    def action(self, hand, dealer_card, bankroll, composition=None):
+        flags = HAND_FLAG_MORE_CARDS if len(hand.cards) > 2 else 0
+
+        if hand.bet > bankroll:
+            flags |= HAND_FLAG_LOW_BANKROLL
+
+        row = self.hand_state(hand) * CHART_ROW_LENGTH + dealer_card.value - 2
+
+        return self.actions[row * HAND_FLAGS + flags]
+
+
 class Player:
     def __init__(self, settings):
         settings = settings.copy()
@@ -202,6 +391,8 @@ class Player:
         self.game_settings = settings.pop('game_settings', None)
         self.number = settings.pop('number', 1)
         self.player_strategy = settings.pop('player_strategy', CHART_BASIC_STRATEGY)
+        self.shoe = settings.pop('shoe', None)
+        self.track_bankroll = settings.pop('track_bankroll', False)
 
         self.extra_settings = settings
 
@@ -210,10 +401,18 @@ class Player:
 
         self.bet_strategy_settings['bet_limit'] = self.bet_limit
         self.bet_strategy_settings['game_settings'] = self.game_settings
+        self.bet_strategy_settings['shoe'] = self.shoe
         self.bet_strategy_settings['strategy_type'] = self.bet_strategy_type
 
         self.bet_strategy = BetStrategy(self.bet_strategy_settings)
+        if self.dealer:
+            self.action_strategy = None
+        elif isinstance(self.player_strategy, dict):
+            self.action_strategy = CompiledStrategy.compile(self.player_strategy)
+        else:
+            self.action_strategy = self.player_strategy
 
+        self.bankroll_tracker = BankrollTracker(self.bankroll) if self.track_bankroll else None
         self.hands = []
 
     def __str__(self):
@@ -222,40 +421,18 @@ class Player:
     def __format__(self, format_spec):
         return format(str(self), format_spec)
 
-    def action(self, hand, dealer_card):
+    @property
+    def composition_dependent(self):
+        return self.action_strategy is not None and self.action_strategy.composition_dependent
+
+    def action(self, hand, dealer_card, composition=None):
         if self.dealer:
-            if hand.score < 17 or (hand.score == 17 and hand.soft):
+            if hand.score < 17 or (hand.score == 17 and hand.soft and self.game_settings.dealer_hit_soft_17):
                 action = PlayerAction.HIT
             else:
                 action = PlayerAction.STAND
         else:
-            chart_value = hand.score
-
-            if len(hand.cards) == 2 and hand.cards[0].rank == hand.cards[1].rank:
-                chart_key = 'pair'
-                chart_value = hand.cards[0].rank
-            elif hand.soft:
-                chart_key = 'soft'
-            else:
-                chart_key = 'hard'
-
-            chart_index = dealer_card.value - 2
-
-            action = self.player_strategy[chart_key][chart_value][chart_index]
-
-            if action == PlayerAction.DOUBLE_DOWN and len(hand.cards) > 2:
-                action = PlayerAction.HIT
-
-            if hand.bet > self.bankroll and action != PlayerAction.HIT and action != PlayerAction.STAND:
-                if action == PlayerAction.DOUBLE_DOWN:
-                    action = PlayerAction.HIT
-                elif action == PlayerAction.SPLIT:
-                    if hand.soft:
-                        chart_key = 'soft'
-                    else:
-                        chart_key = 'hard'
-
-                    action = CHART_BASIC_STRATEGY[chart_key][hand.score][chart_index]
+            action = self.action_strategy.action(hand, dealer_card, self.bankroll, composition)
 
         return action
 
@@ -269,7 +446,22 @@ class Player:
             if not hand.result == HandResult.LOSE:
                 self.bankroll += hand.bet + hand.winnings
 
-        self.bet_strategy_type.last_hand = self.hands[-1] if len(self.hands) > 0 else None
+        self.__record_last_hand()
+
+    def calculate_expected_results(self, dealer_distribution):
+        for hand in self.hands:
+            hand.calculate_expected_result(dealer_distribution, self.game_settings.blackjack_payout)
+
+            hand.winnings = hand.expected_value
+            self.bankroll += hand.bet + hand.expected_value
+
+        self.__record_last_hand()
+
+    def __record_last_hand(self):
+        if self.bankroll_tracker is not None:
+            self.bankroll_tracker.update(self.bankroll, len(self.hands), self.game_settings.min_bet)
+
+        self.bet_strategy.last_hand = self.hands[-1] if len(self.hands) > 0 else None
 
     @classmethod
     def dealer(cls, game_settings):
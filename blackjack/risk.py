@@ -0,0 +1,347 @@
+import math
+
+from collections import namedtuple
+
+import numpy as np
+
+from blackjack.game import Game
+from blackjack.hand import HandResult
+from blackjack.player import BetStrategyType
+from blackjack.player import CHART_BASIC_STRATEGY
+from blackjack.rng import child_rng
+from blackjack.rng import default_rng
+from blackjack.settings import GameSettings
+
+RISK_DECIMALS = 9
+RISK_DENSE_STATES = 4000
+RISK_MAX_ITERATIONS = 10000
+RISK_MAX_STATES = 1000000
+RISK_OUTCOME_ROUNDS = 100000
+RISK_STRATEGY_BLOCK = 64
+RISK_TOLERANCE = 1e-10
+
+# Net, last hand bet and last hand winnings are multiples of the round's initial bet
+Outcome = namedtuple('Outcome', ['net', 'result', 'bet', 'winnings'])
+RiskResult = namedtuple('RiskResult', ['ruin_probability', 'expected_rounds', 'states', 'iterations'])
+SimulatedRisk = namedtuple('SimulatedRisk', ['ruin_probability', 'standard_error', 'expected_rounds', 'sessions'])
+
+
+def hand_net(hand):
+    if hand.result == HandResult.WIN:
+        return hand.winnings
+    elif hand.result == HandResult.LOSE:
+        return -hand.bet
+
+    return 0
+
+
+def outcome_distribution(settings=None, rounds=RISK_OUTCOME_ROUNDS, seed=0, player_strategy=CHART_BASIC_STRATEGY):
+    settings = settings if settings else GameSettings()
+
+    if settings.analytic_dealer:
+        raise ValueError('Outcomes need dealt dealer hands')
+
+    game = Game(settings, rng=default_rng(seed))
+    game.add_player({'bankroll': math.inf, 'player_strategy': player_strategy})
+    game.shoe.reset()
+
+    bet = settings.min_bet
+    player = game.players[0]
+    counts = {}
+
+    for _ in range(rounds):
+        game.play_round()
+
+        last_hand = player.hands[-1]
+        net = sum(hand_net(hand) for hand in player.hands) / bet
+        outcome = Outcome(round(net, RISK_DECIMALS), last_hand.result, round(last_hand.bet / bet, RISK_DECIMALS),
+                          round(last_hand.winnings / bet, RISK_DECIMALS))
+
+        counts[outcome] = counts.get(outcome, 0) + 1
+
+        if game.shoe.last_round:
+            game.shoe.reset()
+
+    return {outcome: count / rounds for outcome, count in counts.items()}
+
+
+class RiskModel:
+    def __init__(self, settings=None, bet_strategy_type=BetStrategyType.STATIC, bet_strategy_settings=None,
+                 bet_limit=None, outcomes=None):
+        self.bet_limit = bet_limit
+        self.bet_strategy_settings = bet_strategy_settings if bet_strategy_settings else {}
+        self.bet_strategy_type = bet_strategy_type
+        self.settings = settings if settings else GameSettings()
+        self.outcomes = outcomes if outcomes is not None else outcome_distribution(self.settings)
+
+        if self.bet_strategy_type == BetStrategyType.COUNT:
+            raise ValueError('Count strategies depend on the shoe and can not be modelled')
+
+        if self.bet_strategy_type == BetStrategyType.SERIES:
+            self.series = self.bet_strategy_settings.get('series', None)
+            self.series_reset_result = self.bet_strategy_settings.get('series_reset_result', HandResult.WIN)
+
+            if not self.series or not isinstance(self.series, list):
+                raise ValueError('Series is not valid')
+        elif self.bet_strategy_type == BetStrategyType.STREAK:
+            self.streak_rates = self.bet_strategy_settings.get('streak_rates', None)
+
+            if not self.streak_rates or not isinstance(self.streak_rates, dict):
+                raise ValueError('Streak rates are not valid')
+
+            # Streaks longer than every rate key all bet the default, so counting further adds no information
+            self.streak_cap = max(abs(key) for key in self.streak_rates) + 1
+
+    def __validate_bet(self, bet):
+        if self.settings.max_bet is not None and bet > self.settings.max_bet:
+            bet = self.settings.max_bet
+
+        if self.bet_limit is not None and bet > self.bet_limit:
+            bet = self.bet_limit
+
+        return bet
+
+    # Strategy states hold what BetStrategy remembers between rounds, and mirror its bet rules
+    def bet(self, state):
+        min_bet = self.settings.min_bet
+
+        if self.bet_strategy_type in (BetStrategyType.MARTINGALE, BetStrategyType.PARLAY):
+            bet = state
+        elif self.bet_strategy_type == BetStrategyType.SERIES:
+            bet = min_bet * self.series[self.__series_index(state)]
+        elif self.bet_strategy_type == BetStrategyType.STREAK:
+            streak_result, streak_count = state
+            streak = streak_count if streak_result == HandResult.WIN else \
+                -streak_count if streak_result == HandResult.LOSE else 0
+
+            bet = min_bet * self.streak_rates.get(streak, 1)
+        else:
+            bet = min_bet
+
+        return self.__validate_bet(bet)
+
+    def initial_state(self):
+        if self.bet_strategy_type in (BetStrategyType.MARTINGALE, BetStrategyType.PARLAY):
+            return self.settings.min_bet
+        elif self.bet_strategy_type == BetStrategyType.SERIES:
+            return len(self.series), None
+        elif self.bet_strategy_type == BetStrategyType.STREAK:
+            return None, 0
+
+        return None
+
+    def next_state(self, state, bet, outcome):
+        last_bet = bet * outcome.bet
+
+        if self.bet_strategy_type == BetStrategyType.MARTINGALE:
+            if outcome.result == HandResult.PUSH:
+                return round(last_bet, RISK_DECIMALS)
+            elif outcome.result == HandResult.LOSE:
+                return round(last_bet * 2, RISK_DECIMALS)
+
+            return self.settings.min_bet
+        elif self.bet_strategy_type == BetStrategyType.PARLAY:
+            if outcome.result == HandResult.WIN:
+                return round(last_bet + bet * outcome.winnings, RISK_DECIMALS)
+
+            return self.settings.min_bet
+        elif self.bet_strategy_type == BetStrategyType.SERIES:
+            return self.__series_index(state) + 1, outcome.result
+        elif self.bet_strategy_type == BetStrategyType.STREAK:
+            streak_result, streak_count = state
+
+            if outcome.result == streak_result:
+                return streak_result, min(streak_count + 1, self.streak_cap)
+
+            return outcome.result, 1
+
+        return None
+
+    def __series_index(self, state):
+        series_index, last_result = state
+
+        return 0 if series_index == len(self.series) or last_result == self.series_reset_result else series_index
+
+    def solve(self, bankroll, target, tolerance=RISK_TOLERANCE, max_iterations=RISK_MAX_ITERATIONS):
+        if target <= bankroll:
+            raise ValueError('Target must be above the starting bankroll')
+
+        min_bet = self.settings.min_bet
+        outcomes = list(self.outcomes)
+        nets = np.array([outcome.net for outcome in outcomes])
+        weights = np.array([self.outcomes[outcome] for outcome in outcomes])
+        strategies = {}
+        strategy_states = []
+        bets = np.zeros(RISK_STRATEGY_BLOCK)
+        successors = np.full((RISK_STRATEGY_BLOCK, len(outcomes)), -1, dtype=np.int64)
+        moving = np.abs(nets[nets != 0])
+        # A bet that big ends the session on any outcome that moves the bankroll, from any bankroll
+        bet_cap = target / moving.min() if len(moving) else math.inf
+
+        def strategy(state):
+            if self.bet_strategy_type in (BetStrategyType.MARTINGALE, BetStrategyType.PARLAY):
+                # Both only remember the bet, so states placing the same bet, or bets past the cap, are one state
+                state = min(self.bet(state), bet_cap)
+
+            number = strategies.get(state)
+
+            if number is None:
+                number = strategies[state] = len(strategy_states)
+                strategy_states.append(state)
+
+            return number
+
+        # Reachable states are explored a round at a time from the start, the ruin and target states absorb and are
+        # left out. Each state is a bankroll and a strategy state number, and each round's new states are numbered
+        # after the previous round's
+        start_bankroll = float(np.round(bankroll, RISK_DECIMALS))
+        start = (start_bankroll, strategy(self.initial_state()))
+        index = {start: 0} if min_bet <= bankroll else {}
+        frontier_bankrolls = np.array([start_bankroll] if index else [])
+        frontier_strategies = np.array([start[1]] if index else [], dtype=np.int64)
+        ruin = []
+        rows = []
+        columns = []
+        probabilities = []
+
+        while len(frontier_bankrolls):
+            for number in np.unique(frontier_strategies).tolist():
+                while number >= len(bets):
+                    bets = np.concatenate([bets, np.zeros(len(bets))])
+                    successors = np.concatenate([successors, np.full_like(successors, -1)])
+
+                if successors[number, 0] >= 0:
+                    continue
+
+                state = strategy_states[number]
+                bet = bets[number] = self.bet(state)
+                successors[number] = [strategy(self.next_state(state, bet, outcome)) for outcome in outcomes]
+
+            first_row = len(index) - len(frontier_bankrolls)
+            frontier_bets = bets[frontier_strategies]
+            next_bankrolls = np.round(frontier_bankrolls[:, None] + frontier_bets[:, None] * nets, RISK_DECIMALS)
+            ruined = next_bankrolls < min_bet
+            transient = ~ruined & (next_bankrolls < target)
+            ruin.append(ruined @ weights)
+
+            sources, targets = np.nonzero(transient)
+            # Packing each next state into a complex number lets a flat unique find the distinct ones quickly
+            next_states = next_bankrolls[transient] + 1j * successors[frontier_strategies[sources], targets]
+            unique_states, inverse = np.unique(next_states, return_inverse=True)
+            unique_columns = np.empty(len(unique_states), dtype=np.int64)
+            new_states = []
+
+            for position, (next_bankroll, next_strategy) in enumerate(zip(unique_states.real.tolist(),
+                                                                          unique_states.imag.tolist())):
+                state = (next_bankroll, int(next_strategy))
+                column = index.get(state)
+
+                if column is None:
+                    column = index[state] = len(index)
+                    new_states.append(position)
+
+                unique_columns[position] = column
+
+            if len(index) > RISK_MAX_STATES:
+                raise ValueError('Risk model has too many states')
+
+            rows.append(sources + first_row)
+            columns.append(unique_columns[inverse])
+            probabilities.append(weights[targets])
+            frontier_bankrolls = unique_states.real[new_states]
+            frontier_strategies = unique_states.imag[new_states].astype(np.int64)
+
+        if not index:
+            return RiskResult(1.0, 0.0, 0, 0)
+
+        size = len(index)
+        ruin = np.concatenate(ruin)
+        # Outcomes leading to the same state are merged into one entry, which keeps the products below small
+        entries, inverse = np.unique(np.concatenate(rows) * size + np.concatenate(columns), return_inverse=True)
+        rows, columns = np.divmod(entries, size)
+        probabilities = np.bincount(inverse, weights=np.concatenate(probabilities))
+
+        # Ruin probabilities and expected rounds both solve (I - Q) x = b over the transient states
+        if size <= RISK_DENSE_STATES:
+            matrix = np.eye(size)
+            np.subtract.at(matrix, (rows, columns), probabilities)
+
+            solution = np.linalg.solve(matrix, np.column_stack([ruin, np.ones(size)]))
+
+            return RiskResult(float(solution[0, 0]), float(solution[0, 1]), size, 1)
+
+        def multiply(vector):
+            return vector - np.bincount(rows, weights=probabilities * vector[columns], minlength=size)
+
+        ruin_probability, ruin_iterations = bicgstab(multiply, ruin, tolerance, max_iterations)
+        expected_rounds, rounds_iterations = bicgstab(multiply, np.ones(size), tolerance, max_iterations)
+
+        return RiskResult(float(ruin_probability[0]), float(expected_rounds[0]), size,
+                          ruin_iterations + rounds_iterations)
+
+
+# scipy is not a dependency, so large models use this BiCGSTAB over a matrix free product instead of sparse solvers
+def bicgstab(multiply, vector, tolerance=RISK_TOLERANCE, max_iterations=RISK_MAX_ITERATIONS):
+    solution = np.zeros_like(vector)
+    residual = vector - multiply(solution)
+    shadow = residual.copy()
+    direction = np.zeros_like(vector)
+    product = np.zeros_like(vector)
+    rho = alpha = omega = 1.0
+    limit = tolerance * (np.linalg.norm(vector) or 1.0)
+
+    for iteration in range(1, max_iterations + 1):
+        if np.linalg.norm(residual) <= limit:
+            return solution, iteration - 1
+
+        rho_next = shadow @ residual
+
+        if rho_next == 0 or omega == 0:
+            break
+
+        direction = residual + (rho_next / rho) * (alpha / omega) * (direction - omega * product)
+        product = multiply(direction)
+        alpha = rho_next / (shadow @ product)
+        half_step = residual - alpha * product
+        step_product = multiply(half_step)
+        step_norm = step_product @ step_product
+        omega = (step_product @ half_step) / step_norm if step_norm else 0.0
+
+        solution += alpha * direction + omega * half_step
+        residual = half_step - omega * step_product
+        rho = rho_next
+
+    if np.linalg.norm(residual) <= limit:
+        return solution, iteration
+
+    raise ValueError('Risk model did not converge')
+
+
+def simulate_ruin(settings, player_settings, target, sessions, seed=0, max_rounds=None):
+    settings = settings if settings else GameSettings()
+    ruined = 0
+    total_rounds = 0
+
+    for index in range(sessions):
+        game = Game(settings, rng=child_rng(seed, index))
+        game.add_player(dict(player_settings))
+        game.shoe.reset()
+
+        player = game.players[0]
+
+        while settings.min_bet <= player.bankroll < target:
+            if max_rounds is not None and game.round_count >= max_rounds:
+                break
+
+            game.play_round()
+
+            if game.shoe.last_round:
+                game.shoe.reset()
+
+        ruined += player.bankroll < settings.min_bet
+        total_rounds += game.round_count
+
+    ruin_probability = ruined / sessions if sessions else 0.0
+    standard_error = math.sqrt(ruin_probability * (1 - ruin_probability) / sessions) if sessions else math.inf
+
+    return SimulatedRisk(ruin_probability, standard_error, total_rounds / sessions if sessions else 0.0, sessions)
@@ -0,0 +1,40 @@
+import random
+
+RNG_SEED_BITS = 128
+
+
+def child_rng(seed, index):
+    # String seeds are hashed with SHA-512, so each index gets its own stream without drawing the ones before it
+    return random.Random('{}-{}'.format(seed, index))
+
+
+# Seeded results do not depend on NumPy being installed, a NumPy Generator passed in shuffles several times faster
+def default_rng(seed=None):
+    return random.Random(seed)
+
+
+def randint(rng, low, high):
+    if isinstance(rng, random.Random):
+        return rng.randint(low, high)
+
+    return int(rng.integers(low, high, endpoint=True))
+
+
+def shuffle(rng, buffer):
+    if isinstance(rng, random.Random):
+        rng.shuffle(buffer)
+        return
+
+    import numpy as np
+
+    rng.shuffle(np.frombuffer(buffer, dtype=np.uint8))
+
+
+def spawn(rng, count):
+    if count < 0:
+        raise ValueError('Count must not be negative')
+
+    if isinstance(rng, random.Random):
+        return [random.Random(rng.getrandbits(RNG_SEED_BITS)) for _ in range(count)]
+
+    return rng.spawn(count)
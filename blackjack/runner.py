@@ -0,0 +1,135 @@
+import copy
+
+from blackjack.game import Game
+from blackjack.rng import child_rng
+from blackjack.stats import PlayerStats
+from blackjack.stats import SessionSketches
+
+SHARD_ROUNDS = 10000
+SHARD_SESSIONS = 1000
+
+
+class SimulationReport:
+    def __init__(self, rounds=0, players=None):
+        self.rounds = rounds
+        self.players = players if players else {}
+
+    def merge(self, other):
+        self.rounds += other.rounds
+
+        for number, stats in other.players.items():
+            self.players.setdefault(number, PlayerStats()).merge(stats)
+
+        return self
+
+    def summary(self):
+        return {
+            'rounds': self.rounds,
+            'players': {number: stats.summary() for number, stats in sorted(self.players.items())},
+        }
+
+
+def play_shard(settings, players, rounds, seed, index):
+    game = Game(settings, rng=child_rng(seed, index))
+
+    for player_settings in players:
+        game.add_player(dict(player_settings))
+
+    report = SimulationReport(players={player.number: PlayerStats() for player in game.players[:-1]})
+
+    game.shoe.reset()
+
+    for _ in range(rounds):
+        game.play_round()
+
+        for player in game.players[:-1]:
+            for hand in player.hands:
+                report.players[player.number].add(hand)
+
+        if game.shoe.last_round:
+            game.shoe.reset()
+
+    report.rounds = rounds
+
+    return report
+
+
+def play_session_shard(settings, player_settings, rounds, sessions, seed, index, histogram=None):
+    sketches = SessionSketches(histogram=copy.deepcopy(histogram))
+    rng = child_rng(seed, index)
+
+    for _ in range(sessions):
+        game = Game(settings, rng=rng)
+        game.add_player(dict(player_settings, track_bankroll=True))
+        game.shoe.reset()
+
+        player = game.players[0]
+
+        # A session ends early once the player can no longer cover the minimum bet
+        for _ in range(rounds):
+            game.play_round()
+
+            if game.shoe.last_round:
+                game.shoe.reset()
+
+            if player.bankroll_tracker.ruin_hands is not None:
+                break
+
+        sketches.add(player.bankroll_tracker)
+
+    return sketches
+
+
+def shard_sizes(rounds, shard_rounds):
+    if rounds < 0:
+        raise ValueError('Rounds must not be negative')
+
+    if shard_rounds <= 0:
+        raise ValueError('Shard rounds must be positive')
+
+    return [min(shard_rounds, rounds - start) for start in range(0, rounds, shard_rounds)]
+
+
+def run_simulation(settings, players, rounds, seed=0, workers=1, shard_rounds=SHARD_ROUNDS):
+    sizes = shard_sizes(rounds, shard_rounds)
+    count = len(sizes)
+    args = ([settings] * count, [players] * count, sizes, [seed] * count, range(count))
+
+    if workers > 1:
+        # Process pools are slow to import, so single process runs such as short command line jobs never load them
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            shards = list(executor.map(play_shard, *args))
+    else:
+        shards = list(map(play_shard, *args))
+
+    report = SimulationReport()
+
+    for shard in shards:
+        report.merge(shard)
+
+    return report
+
+
+def run_sessions(settings, player_settings, sessions, rounds, seed=0, workers=1, shard_sessions=SHARD_SESSIONS,
+                 histogram=None):
+    sizes = shard_sizes(sessions, shard_sessions)
+    count = len(sizes)
+    args = ([settings] * count, [player_settings] * count, [rounds] * count, sizes, [seed] * count, range(count),
+            [histogram] * count)
+
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            shards = list(executor.map(play_session_shard, *args))
+    else:
+        shards = list(map(play_session_shard, *args))
+
+    sketches = SessionSketches(histogram=copy.deepcopy(histogram))
+
+    for shard in shards:
+        sketches.merge(shard)
+
+    return sketches
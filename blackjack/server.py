@@ -0,0 +1,416 @@
+import argparse
+import asyncio
+import json
+import sys
+
+from collections import deque
+
+from blackjack.cards import Card
+from blackjack.game import Game
+from blackjack.hand import Hand
+from blackjack.player import CHART_BASIC_STRATEGY
+from blackjack.player import CompiledStrategy
+from blackjack.player import PlayerAction
+from blackjack.rng import default_rng
+from blackjack.rng import spawn
+
+SERVER_DECISION_TIMEOUT = 5.0
+SERVER_LINE_LIMIT = 2 ** 16
+SERVER_MAX_PENDING = 64
+SERVER_ROUNDS = 25
+SERVER_SEATING_TIMEOUT = 30.0
+
+
+def decode_card(data):
+    return Card(*data)
+
+
+def encode_card(card):
+    return [card.rank, card.value, card.suit]
+
+
+def encode_message(message):
+    return (json.dumps(message, separators=(',', ':')) + '\n').encode()
+
+
+class Connection:
+    def __init__(self, reader, writer, max_pending=SERVER_MAX_PENDING):
+        self.closed = False
+        self.message_id = 0
+        self.pending = {}
+        self.reader = reader
+        self.seats = []
+        self.slots = asyncio.Semaphore(max_pending)
+        self.write_lock = asyncio.Lock()
+        self.writer = writer
+
+    async def __request(self, message):
+        # A client only has a bounded number of unanswered decisions, the rest of its tables wait for a slot
+        async with self.slots:
+            self.message_id += 1
+            message['id'] = self.message_id
+
+            future = asyncio.get_running_loop().create_future()
+            self.pending[self.message_id] = future
+
+            try:
+                await self.send(message)
+
+                return await future
+            finally:
+                self.pending.pop(message['id'], None)
+
+    def close(self):
+        if self.closed:
+            return
+
+        self.closed = True
+
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError('Connection closed'))
+
+        self.writer.close()
+
+    def receive(self, message):
+        future = self.pending.get(message.get('id'), None)
+
+        if future is not None and not future.done():
+            future.set_result(message.get('action'))
+
+    async def request(self, message, timeout):
+        return await asyncio.wait_for(self.__request(message), timeout)
+
+    async def send(self, message):
+        if self.closed:
+            raise ConnectionError('Connection closed')
+
+        self.writer.write(encode_message(message))
+
+        # Draining waits while the transport buffer is past its high water mark, so slow clients pause their tables
+        async with self.write_lock:
+            await self.writer.drain()
+
+
+class TableServer:
+    def __init__(self, settings=None, num_tables=1, seats=1, rounds=SERVER_ROUNDS, player_settings=None,
+                 decision_timeout=SERVER_DECISION_TIMEOUT, max_pending=SERVER_MAX_PENDING, rng=None,
+                 seating_timeout=SERVER_SEATING_TIMEOUT):
+        if num_tables <= 0:
+            raise ValueError('Number of tables must be positive')
+
+        if seats <= 0:
+            raise ValueError('Number of seats must be positive')
+
+        self.connections = set()
+        self.decision_timeout = decision_timeout
+        self.errors = 0
+        self.free_seats = deque((table, seat) for table in range(num_tables) for seat in range(1, seats + 1))
+        self.games = []
+        self.max_pending = max_pending
+        self.ready = [asyncio.Event() for _ in range(num_tables)]
+        self.rounds = rounds
+        self.seating_timeout = seating_timeout
+        self.seats = {}
+        self.server = None
+        self.timeouts = 0
+        self.unclaimed_seats = 0
+
+        for table_rng in spawn(rng if rng is not None else default_rng(), num_tables):
+            game = Game(settings, rng=table_rng)
+
+            for _ in range(seats):
+                game.add_player(dict(player_settings) if player_settings else None)
+
+            self.games.append(game)
+
+    async def __decide(self, table, player, hand):
+        game = self.games[table]
+        connection = self.seats.get((table, player.number), None)
+
+        if connection is not None and not connection.closed:
+            try:
+                action = await connection.request({
+                    'type': 'decide',
+                    'table': table,
+                    'seat': player.number,
+                    'hand': hand.number,
+                    'bet': hand.bet,
+                    'bankroll': player.bankroll,
+                    'cards': [encode_card(card) for card in hand.cards],
+                    'dealer_card': encode_card(game.dealer_card),
+                }, self.decision_timeout)
+
+                # Anything but the name of an action is a bad answer, whatever JSON type the client sent
+                if isinstance(action, str) and action in PlayerAction.__members__ and \
+                        self.__legal(player, hand, PlayerAction[action]):
+                    return PlayerAction[action]
+
+                self.errors += 1
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+            except ConnectionError:
+                self.errors += 1
+
+        # Seats without a working client fall back to their own strategy so the table keeps moving
+        composition = game.unseen_composition() if player.composition_dependent else None
+
+        return player.action(hand, game.dealer_card, composition)
+
+    async def __handle(self, reader, writer):
+        connection = Connection(reader, writer, self.max_pending)
+        self.connections.add(connection)
+
+        try:
+            while True:
+                line = await reader.readline()
+
+                if not line:
+                    break
+
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    await connection.send({'type': 'error', 'message': 'Message is not valid JSON'})
+                    continue
+
+                message_type = message.get('type', None) if isinstance(message, dict) else None
+
+                if message_type == 'action':
+                    connection.receive(message)
+                elif message_type == 'join':
+                    count = message.get('seats', 1)
+
+                    if isinstance(count, int) and count > 0:
+                        await connection.send({'type': 'seated', 'seats': self.__seat(connection, count)})
+                    else:
+                        await connection.send({'type': 'error', 'message': 'Seat count is not valid'})
+                else:
+                    await connection.send({'type': 'error', 'message': 'Message type is not valid'})
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            connection.close()
+            self.connections.discard(connection)
+
+    @staticmethod
+    def __legal(player, hand, action):
+        if action == PlayerAction.DOUBLE_DOWN:
+            return len(hand.cards) == 2 and hand.bet <= player.bankroll
+        elif action == PlayerAction.SPLIT:
+            pair = len(hand.cards) == 2 and hand.cards[0].rank == hand.cards[1].rank
+
+            return pair and hand.bet <= player.bankroll
+
+        return True
+
+    async def __play_hand(self, table, player, hand):
+        game = self.games[table]
+        stop = False
+
+        if len(hand.cards) == 1:
+            hand.deal(game.shoe.draw())
+
+        while not stop:
+            action = await self.__decide(table, player, hand)
+            stop = game.apply_action(player, hand, action)
+
+    async def __play_table(self, table):
+        game = self.games[table]
+
+        # Seats nobody claims in time are closed and play their own strategy, so no empty seat can stall the run
+        try:
+            await asyncio.wait_for(self.ready[table].wait(), self.seating_timeout)
+        except asyncio.TimeoutError:
+            unclaimed = [seat for seat in self.free_seats if seat[0] == table]
+
+            for seat in unclaimed:
+                self.free_seats.remove(seat)
+
+            self.unclaimed_seats += len(unclaimed)
+
+        game.round_limit = game.round_count + self.rounds
+        game.shoe.reset()
+
+        while game.round_count < game.round_limit:
+            game.begin_round()
+
+            for player in game.players[:-1]:
+                for hand in player.hands:
+                    await self.__play_hand(table, player, hand)
+
+            game.finish_round()
+
+            await self.__send_results(table)
+
+            if game.shoe.last_round:
+                game.shoe.reset()
+
+    def __seat(self, connection, count):
+        seats = []
+
+        while self.free_seats and len(seats) < count:
+            table, seat = self.free_seats.popleft()
+
+            self.seats[(table, seat)] = connection
+            seats.append([table, seat])
+
+            if all(self.seats.get((table, player.number), None) for player in self.games[table].players[:-1]):
+                self.ready[table].set()
+
+        connection.seats.extend(seats)
+
+        return seats
+
+    async def __send_results(self, table):
+        game = self.games[table]
+
+        for player in game.players[:-1]:
+            connection = self.seats.get((table, player.number), None)
+
+            if connection is None or connection.closed:
+                continue
+
+            try:
+                await asyncio.wait_for(connection.send({
+                    'type': 'result',
+                    'table': table,
+                    'seat': player.number,
+                    'round': game.round_count,
+                    'bankroll': player.bankroll,
+                    'dealer_cards': [encode_card(card) for card in game.players[-1].hands[0].cards],
+                    'hands': [{'bet': hand.bet, 'result': hand.result.name if hand.result else None,
+                               'winnings': hand.winnings} for hand in player.hands],
+                }), self.decision_timeout)
+            except (asyncio.TimeoutError, ConnectionError):
+                self.timeouts += 1
+
+    @property
+    def address(self):
+        return self.server.sockets[0].getsockname() if self.server else None
+
+    async def close(self):
+        for connection in list(self.connections):
+            try:
+                await asyncio.wait_for(connection.send({'type': 'done'}), self.decision_timeout)
+            except (asyncio.TimeoutError, ConnectionError):
+                pass
+
+            connection.close()
+
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def run(self):
+        await asyncio.gather(*[self.__play_table(table) for table in range(len(self.games))])
+
+        return self.games
+
+    async def start(self, host='127.0.0.1', port=0, path=None):
+        if path:
+            self.server = await asyncio.start_unix_server(self.__handle, path=path, limit=SERVER_LINE_LIMIT)
+        else:
+            self.server = await asyncio.start_server(self.__handle, host=host, port=port, limit=SERVER_LINE_LIMIT)
+
+        return self.address
+
+
+async def run_bot(host='127.0.0.1', port=None, path=None, seats=1, strategy=CHART_BASIC_STRATEGY):
+    strategy = CompiledStrategy(strategy)
+
+    if path:
+        reader, writer = await asyncio.open_unix_connection(path, limit=SERVER_LINE_LIMIT)
+    else:
+        reader, writer = await asyncio.open_connection(host, port, limit=SERVER_LINE_LIMIT)
+
+    stats = {'seats': [], 'decisions': 0, 'results': 0}
+
+    writer.write(encode_message({'type': 'join', 'seats': seats}))
+    await writer.drain()
+
+    try:
+        while True:
+            line = await reader.readline()
+
+            if not line:
+                break
+
+            message = json.loads(line)
+
+            if message['type'] == 'decide':
+                hand = Hand(bet=message['bet'], number=message['hand'])
+
+                for card in message['cards']:
+                    hand.deal(decode_card(card))
+
+                action = strategy.action(hand, decode_card(message['dealer_card']), message['bankroll'])
+                stats['decisions'] += 1
+
+                writer.write(encode_message({'type': 'action', 'id': message['id'], 'action': action.name}))
+                await writer.drain()
+            elif message['type'] == 'result':
+                stats['results'] += 1
+            elif message['type'] == 'seated':
+                stats['seats'].extend(message['seats'])
+            elif message['type'] == 'done':
+                break
+    finally:
+        writer.close()
+
+    return stats
+
+
+async def serve(args):
+    server = TableServer(num_tables=args.tables, seats=args.seats, rounds=args.rounds,
+                         player_settings={'bankroll': args.bankroll}, decision_timeout=args.timeout,
+                         rng=default_rng(args.seed), seating_timeout=args.seating_timeout)
+
+    address = await server.start(args.host, args.port, args.path)
+    print('Serving {} tables on {}'.format(args.tables, address), flush=True)
+
+    try:
+        games = await server.run()
+    finally:
+        await server.close()
+
+    for table, game in enumerate(games):
+        print('Table {}: {}'.format(table, ', '.join('{} {:.2f}'.format(player, player.bankroll)
+                                                   for player in game.players[:-1])))
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog='python -m blackjack.server')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser('serve', help='Host tables for bot players')
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=0)
+    serve_parser.add_argument('--path')
+    serve_parser.add_argument('--tables', type=int, default=1)
+    serve_parser.add_argument('--seats', type=int, default=1)
+    serve_parser.add_argument('--rounds', type=int, default=SERVER_ROUNDS)
+    serve_parser.add_argument('--bankroll', type=float, default=1000)
+    serve_parser.add_argument('--timeout', type=float, default=SERVER_DECISION_TIMEOUT)
+    serve_parser.add_argument('--seating-timeout', type=float, default=SERVER_SEATING_TIMEOUT)
+    serve_parser.add_argument('--seed', type=int)
+
+    bot_parser = commands.add_parser('bot', help='Play seats with the basic strategy bot')
+    bot_parser.add_argument('--host', default='127.0.0.1')
+    bot_parser.add_argument('--port', type=int)
+    bot_parser.add_argument('--path')
+    bot_parser.add_argument('--seats', type=int, default=1)
+
+    args = parser.parse_args(args)
+
+    if args.command == 'serve':
+        asyncio.run(serve(args))
+    else:
+        stats = asyncio.run(run_bot(args.host, args.port, args.path, args.seats))
+        print('Played {} seats, {} decisions'.format(len(stats['seats']), stats['decisions']))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,10 @@
+class GameSettings:
+    def __init__(self, blackjack_payout=1.5, min_bet=10, max_bet=1000, num_decks=8, dealer_hit_soft_17=True,
+                 analytic_dealer=False, count_system='hi-lo'):
+        self.analytic_dealer = analytic_dealer
+        self.blackjack_payout = blackjack_payout
+        self.count_system = count_system
+        self.dealer_hit_soft_17 = dealer_hit_soft_17
+        self.min_bet = min_bet
+        self.max_bet = max_bet
+        self.num_decks = num_decks
@@ -0,0 +1,194 @@
+import math
+import weakref
+
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from blackjack.game import Game
+from blackjack.rng import child_rng
+from blackjack.runner import SHARD_ROUNDS
+from blackjack.runner import SimulationReport
+from blackjack.runner import shard_sizes
+from blackjack.stats import PlayerStats
+
+SHARED_CHECKPOINT_ROUNDS = 1000
+SHARED_STATS_FIELDS = ('hands', 'wins', 'pushes', 'losses', 'net', 'mean', 'm2', 'resolved_variance')
+
+# Everything a worker needs to find its slots, small enough to pickle with every task
+SharedLayout = namedtuple('SharedLayout', ['name', 'shards', 'seats', 'checkpoints'])
+
+
+def layout_arrays(shards, seats, checkpoints):
+    return [
+        ('stats', np.float64, (shards, seats, len(SHARED_STATS_FIELDS))),
+        ('bankrolls', np.float64, (shards, checkpoints, seats)),
+        ('numbers', np.int64, (shards, seats)),
+        ('rounds', np.int64, (shards,)),
+        ('done', np.uint8, (shards,)),
+    ]
+
+
+def release_segment(segment, owner):
+    # Unlinking first removes the name even when views handed out to callers still pin the mapping open
+    if owner:
+        try:
+            segment.unlink()
+        except FileNotFoundError:
+            pass
+
+    try:
+        segment.close()
+    except BufferError:
+        pass
+
+
+class SharedResults:
+    def __init__(self, layout, segment, owner):
+        self.layout = layout
+        self.owner = owner
+        self.segment = segment
+
+        offset = 0
+
+        for name, dtype, shape in layout_arrays(layout.shards, layout.seats, layout.checkpoints):
+            count = math.prod(shape)
+            setattr(self, name, np.frombuffer(segment.buf, dtype=dtype, count=count, offset=offset).reshape(shape))
+            offset += count * np.dtype(dtype).itemsize
+
+        # Only the creating process unlinks, workers just unmap, so a crashed worker can not leak the segment
+        self.__finalizer = weakref.finalize(self, release_segment, segment, owner)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @classmethod
+    def attach(cls, layout):
+        return cls(layout, shared_memory.SharedMemory(name=layout.name), owner=False)
+
+    @property
+    def closed(self):
+        return not self.__finalizer.alive
+
+    @property
+    def completed(self):
+        return self.done.astype(bool)
+
+    @classmethod
+    def create(cls, shards, seats, checkpoints=0):
+        if shards < 0 or seats <= 0 or checkpoints < 0:
+            raise ValueError('Shared results layout is not valid')
+
+        size = sum(math.prod(shape) * np.dtype(dtype).itemsize
+                   for _, dtype, shape in layout_arrays(shards, seats, checkpoints))
+        segment = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        results = cls(SharedLayout(segment.name, shards, seats, checkpoints), segment, owner=True)
+
+        results.stats.fill(0)
+        results.bankrolls.fill(np.nan)
+        results.numbers.fill(0)
+        results.rounds.fill(0)
+        results.done.fill(0)
+
+        return results
+
+    def close(self):
+        for name, _, _ in layout_arrays(0, 0, 0):
+            setattr(self, name, None)
+
+        self.__finalizer()
+
+    def report(self):
+        if not self.completed.all():
+            raise ValueError('Shards {} did not complete'.format(np.flatnonzero(~self.completed).tolist()))
+
+        report = SimulationReport()
+
+        for shard in range(self.layout.shards):
+            shard_report = SimulationReport(rounds=int(self.rounds[shard]))
+
+            for seat in range(self.layout.seats):
+                stats = PlayerStats()
+
+                for field, value in zip(SHARED_STATS_FIELDS, self.stats[shard, seat].tolist()):
+                    setattr(stats, field, int(value) if field in ('hands', 'wins', 'pushes', 'losses') else value)
+
+                shard_report.players[int(self.numbers[shard, seat])] = stats
+
+            report.merge(shard_report)
+
+        return report
+
+    def write_stats(self, shard, seat, number, stats):
+        self.numbers[shard, seat] = number
+        self.stats[shard, seat] = [getattr(stats, field) for field in SHARED_STATS_FIELDS]
+
+
+def play_shared_shard(layout, settings, players, rounds, checkpoint_rounds, seed, index):
+    results = SharedResults.attach(layout)
+
+    try:
+        game = Game(settings, rng=child_rng(seed, index))
+
+        for player_settings in players:
+            game.add_player(dict(player_settings))
+
+        seats = game.players[:-1]
+        stats = [PlayerStats() for _ in seats]
+
+        game.shoe.reset()
+
+        for round_index in range(1, rounds + 1):
+            game.play_round()
+
+            for seat, player in enumerate(seats):
+                for hand in player.hands:
+                    stats[seat].add(hand)
+
+            if game.shoe.last_round:
+                game.shoe.reset()
+
+            if checkpoint_rounds and round_index % checkpoint_rounds == 0:
+                checkpoint = round_index // checkpoint_rounds - 1
+                results.bankrolls[index, checkpoint] = [player.bankroll for player in seats]
+
+        for seat, player in enumerate(seats):
+            results.write_stats(index, seat, player.number, stats[seat])
+
+        results.rounds[index] = rounds
+
+        # The flag goes last so a worker that dies part way leaves its shard marked incomplete
+        results.done[index] = 1
+    finally:
+        results.close()
+
+
+def run_shared_simulation(settings, players, rounds, seed=0, workers=1, shard_rounds=SHARD_ROUNDS,
+                          checkpoint_rounds=SHARED_CHECKPOINT_ROUNDS):
+    if checkpoint_rounds < 0:
+        raise ValueError('Checkpoint rounds must not be negative')
+
+    sizes = shard_sizes(rounds, shard_rounds)
+    count = len(sizes)
+    checkpoints = shard_rounds // checkpoint_rounds if checkpoint_rounds else 0
+    results = SharedResults.create(count, len(players), checkpoints)
+    args = ([results.layout] * count, [settings] * count, [players] * count, sizes, [checkpoint_rounds] * count,
+            [seed] * count, range(count))
+
+    try:
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(play_shared_shard, *args))
+        else:
+            list(map(play_shared_shard, *args))
+    except BaseException:
+        results.close()
+        raise
+
+    return results
@@ -0,0 +1,138 @@
+import mmap
+import os
+import struct
+import tempfile
+
+from blackjack.cards import CARDS_PER_DECK
+from blackjack.cards import Shoe
+from blackjack.rng import child_rng
+from blackjack.runner import shard_sizes
+
+SHOE_BANK_CHUNK_SHOES = 10000
+SHOE_BANK_MAGIC = b'BJSB'
+SHOE_BANK_VERSION = 1
+
+# Magic, version, decks, cards per shoe and shoe count, then per shoe the cut card, stop card and card codes
+SHOE_BANK_HEADER = struct.Struct('<4sBHIQ')
+SHOE_BANK_RECORD = struct.Struct('<II')
+
+
+def shoe_bank_chunk(num_decks, shoes, seed, index):
+    shoe = Shoe(num_decks, rng=child_rng(seed, index))
+    records = []
+
+    for shoe_index in range(shoes):
+        if shoe_index > 0:
+            shoe.reset()
+
+        # Cards are stored in dealing order with the cut already applied, the cut card is kept for reference
+        card_codes, stop_card = shoe.snapshot()
+
+        records.append(SHOE_BANK_RECORD.pack(shoe.cut_card, stop_card))
+        records.append(card_codes.tobytes())
+
+    return b''.join(records)
+
+
+def write_shoe_bank(path, num_decks, shoes, seed=0, workers=1, chunk_shoes=SHOE_BANK_CHUNK_SHOES):
+    if num_decks <= 0:
+        raise ValueError('Shoe must contain one or more decks')
+
+    sizes = shard_sizes(shoes, chunk_shoes)
+    count = len(sizes)
+    args = ([num_decks] * count, sizes, [seed] * count, range(count))
+
+    # The bank is written beside its final path and swapped in, so readers never map a partial file
+    directory = os.path.dirname(os.path.abspath(path))
+    file_descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix='.shoebank-')
+
+    try:
+        with os.fdopen(file_descriptor, 'wb') as file:
+            file.write(SHOE_BANK_HEADER.pack(SHOE_BANK_MAGIC, SHOE_BANK_VERSION, num_decks,
+                                             CARDS_PER_DECK * num_decks, shoes))
+
+            if workers > 1:
+                from concurrent.futures import ProcessPoolExecutor
+
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    for chunk in executor.map(shoe_bank_chunk, *args):
+                        file.write(chunk)
+            else:
+                for chunk in map(shoe_bank_chunk, *args):
+                    file.write(chunk)
+
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class ShoeBank:
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+
+        with open(self.path, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+
+            if size < SHOE_BANK_HEADER.size:
+                raise ValueError('Shoe bank is not valid')
+
+            # A read only shared mapping lets every process replaying the bank use the same page cache
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.data = memoryview(self.mmap)
+
+        magic, version, self.num_decks, self.shoe_size, self.num_shoes = SHOE_BANK_HEADER.unpack_from(self.data)
+
+        if magic != SHOE_BANK_MAGIC:
+            self.close()
+            raise ValueError('Shoe bank is not valid')
+
+        if version != SHOE_BANK_VERSION:
+            self.close()
+            raise ValueError('Shoe bank version is not supported')
+
+        self.record_size = SHOE_BANK_RECORD.size + self.shoe_size
+
+        if size != SHOE_BANK_HEADER.size + self.num_shoes * self.record_size:
+            self.close()
+            raise ValueError('Shoe bank is truncated')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getstate__(self):
+        return {'path': self.path}
+
+    def __len__(self):
+        return self.num_shoes
+
+    def __setstate__(self, state):
+        self.__init__(state['path'])
+
+    def close(self):
+        if self.data is not None:
+            self.data.release()
+            self.data = None
+
+        # Shoes still dealing from the bank keep the mapping alive until they let go of their cards
+        try:
+            self.mmap.close()
+        except BufferError:
+            pass
+
+    def shoe(self, index):
+        if not 0 <= index < self.num_shoes:
+            raise IndexError('Shoe bank contains no shoe {}'.format(index))
+
+        offset = SHOE_BANK_HEADER.size + index * self.record_size
+        cut_card, stop_card = SHOE_BANK_RECORD.unpack_from(self.data, offset)
+        start = offset + SHOE_BANK_RECORD.size
+
+        return cut_card, stop_card, self.data[start:start + self.shoe_size]
@@ -0,0 +1,144 @@
+import csv
+
+from array import array
+
+from blackjack.hand import HandResult
+
+SINK_CHUNK_SIZE = 65536
+SINK_COLUMNS = [
+    ('round', 'Q'),
+    ('seat', 'H'),
+    ('hand', 'H'),
+    ('bet', 'd'),
+    ('result', 'B'),
+    ('winnings', 'd'),
+    ('reshuffle', 'B'),
+]
+SINK_FORMATS = {
+    '.csv': 'csv',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+    '.parquet': 'parquet',
+}
+
+
+class ColumnarSink:
+    def __init__(self, path, file_format=None, chunk_size=SINK_CHUNK_SIZE):
+        if file_format is None:
+            file_format = next((value for key, value in SINK_FORMATS.items() if str(path).endswith(key)), None)
+
+        if file_format not in SINK_FORMATS.values():
+            raise ValueError('Sink format is not valid')
+
+        if chunk_size <= 0:
+            raise ValueError('Chunk size must be positive')
+
+        self.chunk_size = chunk_size
+        self.chunks_written = 0
+        self.columns = {name: array(type_code) for name, type_code in SINK_COLUMNS}
+        self.file = None
+        self.file_format = file_format
+        self.path = path
+        self.records_written = 0
+        self.schema = None
+        self.writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self.columns['round'])
+
+    def __open(self):
+        if self.file_format == 'csv':
+            self.file = open(self.path, 'w', newline='')
+            self.writer = csv.writer(self.file)
+            self.writer.writerow([name for name, _ in SINK_COLUMNS])
+            return
+
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError('pyarrow is required to write {} files'.format(self.file_format))
+
+        self.schema = pyarrow.schema([
+            ('round', pyarrow.uint64()),
+            ('seat', pyarrow.uint16()),
+            ('hand', pyarrow.uint16()),
+            ('bet', pyarrow.float64()),
+            ('result', pyarrow.uint8()),
+            ('winnings', pyarrow.float64()),
+            ('reshuffle', pyarrow.bool_()),
+        ])
+
+        if self.file_format == 'parquet':
+            import pyarrow.parquet
+
+            self.writer = pyarrow.parquet.ParquetWriter(self.path, self.schema)
+        else:
+            import pyarrow.ipc
+
+            self.writer = pyarrow.ipc.new_file(self.path, self.schema)
+
+    def __write_chunk(self):
+        if self.file_format == 'csv':
+            columns = [self.columns[name] for name, _ in SINK_COLUMNS]
+            results = {result.value: result.name for result in HandResult}
+
+            for row in zip(*columns):
+                self.writer.writerow(row[:4] + (results[row[4]],) + row[5:])
+        else:
+            import pyarrow
+
+            arrays = [pyarrow.array(self.columns[field.name]).cast(field.type) for field in self.schema]
+            self.writer.write_table(pyarrow.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        if self.writer is None and len(self) == 0:
+            return
+
+        self.flush()
+
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        else:
+            self.writer.close()
+
+        self.writer = None
+
+    def flush(self):
+        if self.writer is None:
+            self.__open()
+
+        if len(self) == 0:
+            return
+
+        self.__write_chunk()
+
+        self.chunks_written += 1
+        self.records_written += len(self)
+
+        for column in self.columns.values():
+            del column[:]
+
+    def write(self, record):
+        columns = self.columns
+
+        columns['round'].append(record.round)
+        columns['seat'].append(record.seat)
+        columns['hand'].append(record.hand)
+        columns['bet'].append(record.bet)
+        columns['result'].append(record.result.value)
+        columns['winnings'].append(record.winnings)
+        columns['reshuffle'].append(record.reshuffle)
+
+        if len(columns['round']) >= self.chunk_size:
+            self.flush()
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
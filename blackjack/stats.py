@@ -0,0 +1,360 @@
+import math
+
+from blackjack.hand import HandResult
+
+HISTOGRAM_BINS = 100
+QUANTILE_BUFFER_FACTOR = 5
+QUANTILE_COMPRESSION = 200
+SKETCH_QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+
+class PlayerStats:
+    def __init__(self):
+        self.hands = 0
+        self.wins = 0
+        self.pushes = 0
+        self.losses = 0
+        self.net = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.resolved_variance = 0.0
+
+    def __eq__(self, other):
+        return isinstance(other, PlayerStats) and self.summary() == other.summary()
+
+    @property
+    def standard_error(self):
+        return math.sqrt(self.variance / self.hands) if self.hands > 1 else math.inf
+
+    @property
+    def variance(self):
+        return self.m2 / (self.hands - 1) if self.hands > 1 else 0.0
+
+    def add(self, hand):
+        if hand.result == HandResult.WIN:
+            self.wins += 1
+            net = hand.winnings
+        elif hand.result == HandResult.PUSH:
+            self.pushes += 1
+            net = 0
+        else:
+            self.losses += 1
+            net = -hand.bet
+
+        # Hands settled against the dealer distribution carry their expected result and its variance
+        if hand.expected_value is not None:
+            net = hand.expected_value
+            self.resolved_variance += hand.variance
+
+        self.hands += 1
+        self.net += net
+
+        delta = net - self.mean
+        self.mean += delta / self.hands
+        self.m2 += delta * (net - self.mean)
+
+    def half_width(self, z):
+        return z * self.standard_error
+
+    def merge(self, other):
+        hands = self.hands + other.hands
+
+        if hands > 0:
+            delta = other.mean - self.mean
+
+            self.mean += delta * other.hands / hands
+            self.m2 += other.m2 + delta * delta * self.hands * other.hands / hands
+
+        self.hands = hands
+        self.wins += other.wins
+        self.pushes += other.pushes
+        self.losses += other.losses
+        self.net += other.net
+        self.resolved_variance += other.resolved_variance
+
+        return self
+
+    def summary(self):
+        return {
+            'hands': self.hands,
+            'wins': self.wins,
+            'pushes': self.pushes,
+            'losses': self.losses,
+            'net': self.net,
+            'mean': self.mean,
+            'variance': self.variance,
+            'standard_error': self.standard_error,
+            'resolved_variance': self.resolved_variance,
+        }
+
+
+class BankrollTracker:
+    __slots__ = ('bankroll', 'hands', 'max_drawdown', 'peak', 'ruin_hands', 'start_bankroll')
+
+    def __init__(self, bankroll):
+        self.bankroll = bankroll
+        self.hands = 0
+        self.max_drawdown = 0
+        self.peak = bankroll
+        self.ruin_hands = None
+        self.start_bankroll = bankroll
+
+    def update(self, bankroll, hands, min_bet):
+        self.bankroll = bankroll
+        self.hands += hands
+
+        if bankroll > self.peak:
+            self.peak = bankroll
+        elif self.peak - bankroll > self.max_drawdown:
+            self.max_drawdown = self.peak - bankroll
+
+        if self.ruin_hands is None and bankroll < min_bet:
+            self.ruin_hands = self.hands
+
+
+class Extremes:
+    def __init__(self):
+        self.count = 0
+        self.maximum = -math.inf
+        self.minimum = math.inf
+
+    def add(self, value):
+        self.count += 1
+
+        if value > self.maximum:
+            self.maximum = value
+
+        if value < self.minimum:
+            self.minimum = value
+
+    def merge(self, other):
+        self.count += other.count
+        self.maximum = max(self.maximum, other.maximum)
+        self.minimum = min(self.minimum, other.minimum)
+
+        return self
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'minimum': self.minimum if self.count else None,
+            'maximum': self.maximum if self.count else None,
+        }
+
+
+class Histogram:
+    def __init__(self, low, high, bins=HISTOGRAM_BINS):
+        if high <= low or bins <= 0:
+            raise ValueError('Histogram bounds are not valid')
+
+        self.bins = bins
+        self.counts = [0] * bins
+        self.high = high
+        self.low = low
+        self.overflow = 0
+        self.underflow = 0
+
+    @property
+    def count(self):
+        return self.underflow + sum(self.counts) + self.overflow
+
+    def add(self, value, weight=1):
+        if value < self.low:
+            self.underflow += weight
+        elif value >= self.high:
+            self.overflow += weight
+        else:
+            self.counts[int((value - self.low) * self.bins / (self.high - self.low))] += weight
+
+    def merge(self, other):
+        if (self.low, self.high, self.bins) != (other.low, other.high, other.bins):
+            raise ValueError('Histograms with different bins can not be merged')
+
+        self.counts = [count + other_count for count, other_count in zip(self.counts, other.counts)]
+        self.overflow += other.overflow
+        self.underflow += other.underflow
+
+        return self
+
+    def quantile(self, q):
+        count = self.count
+
+        if count == 0:
+            return math.nan
+
+        target = q * count
+        cumulative = self.underflow
+
+        if target <= cumulative:
+            return self.low
+
+        width = (self.high - self.low) / self.bins
+
+        for index, bin_count in enumerate(self.counts):
+            if bin_count and cumulative + bin_count >= target:
+                return self.low + width * (index + (target - cumulative) / bin_count)
+
+            cumulative += bin_count
+
+        return self.high
+
+    def summary(self):
+        return {
+            'low': self.low,
+            'high': self.high,
+            'counts': list(self.counts),
+            'underflow': self.underflow,
+            'overflow': self.overflow,
+        }
+
+
+class QuantileSketch:
+    def __init__(self, compression=QUANTILE_COMPRESSION):
+        if compression <= 0:
+            raise ValueError('Compression must be positive')
+
+        self.buffer = []
+        self.centroids = []
+        self.compression = compression
+        self.count = 0
+        self.maximum = -math.inf
+        self.minimum = math.inf
+
+    # Adjacent centroids merge while they span at most one unit of the t-digest arcsine scale, which keeps the
+    # tails fine grained and bounds the number of centroids by the compression
+    def __compress(self):
+        if not self.buffer:
+            return
+
+        points = sorted(self.centroids + self.buffer)
+        centroids = []
+        cumulative = 0.0
+        mean, weight = points[0]
+        scale = self.compression / (2 * math.pi)
+        k_lower = scale * math.asin(-1)
+
+        for point_mean, point_weight in points[1:]:
+            q = min((cumulative + weight + point_weight) / self.count, 1.0)
+
+            if scale * math.asin(2 * q - 1) - k_lower <= 1:
+                weight += point_weight
+                mean += (point_mean - mean) * point_weight / weight
+            else:
+                centroids.append((mean, weight))
+                cumulative += weight
+                k_lower = scale * math.asin(2 * cumulative / self.count - 1)
+                mean, weight = point_mean, point_weight
+
+        centroids.append((mean, weight))
+
+        self.buffer = []
+        self.centroids = centroids
+
+    def add(self, value, weight=1):
+        self.buffer.append((value, weight))
+        self.count += weight
+
+        if value > self.maximum:
+            self.maximum = value
+
+        if value < self.minimum:
+            self.minimum = value
+
+        if len(self.buffer) >= self.compression * QUANTILE_BUFFER_FACTOR:
+            self.__compress()
+
+    def merge(self, other):
+        other.__compress()
+
+        self.buffer.extend(other.centroids)
+        self.count += other.count
+        self.maximum = max(self.maximum, other.maximum)
+        self.minimum = min(self.minimum, other.minimum)
+
+        self.__compress()
+
+        return self
+
+    def quantile(self, q):
+        self.__compress()
+
+        if self.count == 0:
+            return math.nan
+
+        if q <= 0:
+            return self.minimum
+
+        if q >= 1:
+            return self.maximum
+
+        target = q * self.count
+        previous_mean, previous_center = self.minimum, 0.0
+        cumulative = 0.0
+
+        # Values are interpolated between centroid centers, with the extremes anchoring both ends
+        for mean, weight in self.centroids:
+            center = cumulative + weight / 2
+
+            if center >= target:
+                fraction = (target - previous_center) / (center - previous_center)
+
+                return previous_mean + (mean - previous_mean) * fraction
+
+            previous_mean, previous_center = mean, center
+            cumulative += weight
+
+        return previous_mean + (self.maximum - previous_mean) * (target - previous_center) / \
+            (self.count - previous_center)
+
+    def summary(self, quantiles=SKETCH_QUANTILES):
+        return {str(q): self.quantile(q) for q in quantiles}
+
+
+class SessionSketches:
+    def __init__(self, compression=QUANTILE_COMPRESSION, histogram=None):
+        self.bankroll = QuantileSketch(compression)
+        self.bankroll_extremes = Extremes()
+        self.bankroll_histogram = histogram
+        self.max_drawdown = QuantileSketch(compression)
+        self.ruined = 0
+        self.sessions = 0
+        self.time_to_ruin = QuantileSketch(compression)
+
+    def add(self, tracker):
+        self.sessions += 1
+
+        self.bankroll.add(tracker.bankroll)
+        self.bankroll_extremes.add(tracker.bankroll)
+        self.max_drawdown.add(tracker.max_drawdown)
+
+        if self.bankroll_histogram is not None:
+            self.bankroll_histogram.add(tracker.bankroll)
+
+        if tracker.ruin_hands is not None:
+            self.ruined += 1
+            self.time_to_ruin.add(tracker.ruin_hands)
+
+    def merge(self, other):
+        self.bankroll.merge(other.bankroll)
+        self.bankroll_extremes.merge(other.bankroll_extremes)
+        self.max_drawdown.merge(other.max_drawdown)
+        self.ruined += other.ruined
+        self.sessions += other.sessions
+        self.time_to_ruin.merge(other.time_to_ruin)
+
+        if self.bankroll_histogram is not None and other.bankroll_histogram is not None:
+            self.bankroll_histogram.merge(other.bankroll_histogram)
+
+        return self
+
+    def summary(self, quantiles=SKETCH_QUANTILES):
+        return {
+            'sessions': self.sessions,
+            'ruined': self.ruined,
+            'ruin_probability': self.ruined / self.sessions if self.sessions else 0.0,
+            'bankroll': self.bankroll.summary(quantiles),
+            'bankroll_extremes': self.bankroll_extremes.summary(),
+            'bankroll_histogram': self.bankroll_histogram.summary() if self.bankroll_histogram else None,
+            'max_drawdown': self.max_drawdown.summary(quantiles),
+            'time_to_ruin': self.time_to_ruin.summary(quantiles),
+        }
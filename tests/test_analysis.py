@@ -0,0 +1,133 @@
+import pickle
+
+from unittest import TestCase
+
+from blackjack.analysis import DEALER_BUST
+from blackjack.analysis import EVCalculator
+from blackjack.analysis import EVStrategy
+from blackjack.analysis import dealer_distribution
+from blackjack.analysis import fresh_shoe_dealer_distribution
+from blackjack.analysis import shoe_composition
+from blackjack.cards import Card
+from blackjack.game import Game
+from blackjack.game import GameSettings
+from blackjack.player import PlayerAction
+from blackjack.rng import default_rng
+from tests.utils import build_hand
+
+
+class TestEVCalculator(TestCase):
+    def test_dealer_distribution(self):
+        calculator = EVCalculator()
+
+        for upcard_value in range(2, 12):
+            distribution = calculator.dealer_distribution(upcard_value, shoe_composition(8))
+
+            self.assertAlmostEqual(1, sum(distribution))
+
+        bust_six = calculator.dealer_distribution(6, shoe_composition(8))[DEALER_BUST]
+        bust_ten = calculator.dealer_distribution(10, shoe_composition(8))[DEALER_BUST]
+
+        self.assertGreater(bust_six, bust_ten)
+
+    def test_dealer_distribution_stand_soft_17(self):
+        hit = EVCalculator().dealer_distribution(11, shoe_composition(1))
+        stand = EVCalculator(GameSettings(dealer_hit_soft_17=False)).dealer_distribution(11, shoe_composition(1))
+
+        self.assertGreater(stand[0], hit[0])
+
+    def test_fresh_shoe_dealer_distribution(self):
+        composition = shoe_composition(6)
+        composition[10 - 2] -= 1
+
+        self.assertEqual(dealer_distribution(10, composition, False), fresh_shoe_dealer_distribution(10, 6, False))
+        self.assertIs(fresh_shoe_dealer_distribution(10, 6, False), fresh_shoe_dealer_distribution(10, 6, False))
+
+    def test_dealer_distribution_cache(self):
+        calculator = EVCalculator()
+        distribution = calculator.dealer_distribution(2, shoe_composition(1))
+
+        # Drawing the same cards in another order reaches a state already worked out
+        self.assertLess(0, calculator.cache_hits)
+
+        hits = calculator.cache_hits
+        misses = calculator.cache_misses
+
+        self.assertEqual(distribution, calculator.dealer_distribution(2, shoe_composition(1)))
+        self.assertEqual(hits + 1, calculator.cache_hits)
+        self.assertEqual(misses, calculator.cache_misses)
+
+        small = EVCalculator(cache_size=2)
+
+        for a, b in zip(distribution, small.dealer_distribution(2, shoe_composition(1))):
+            self.assertAlmostEqual(a, b)
+
+        self.assertEqual(2, len(small.cache))
+
+        with self.assertRaises(ValueError):
+            EVCalculator(cache_size=0)
+
+    def test_pickle(self):
+        calculator = EVCalculator(cache_size=100)
+        distribution = calculator.dealer_distribution(2, shoe_composition(1))
+
+        restored = pickle.loads(pickle.dumps(calculator))
+
+        self.assertEqual(({}, 0, 0), (restored.cache, restored.cache_hits, restored.cache_misses))
+        self.assertEqual(100, restored.cache_size)
+        self.assertEqual(distribution, restored.dealer_distribution(2, shoe_composition(1)))
+        self.assertLess(0, len(restored.cache))
+
+    def test_action_evs(self):
+        calculator = EVCalculator()
+        dealer_card = Card('6', 6, 'clubs')
+
+        evs = calculator.action_evs(build_hand('blackjack'), dealer_card)
+        self.assertEqual(PlayerAction.STAND, max(evs, key=evs.get))
+        self.assertNotIn(PlayerAction.SPLIT, evs)
+
+        evs = calculator.action_evs(build_hand('double_down'), dealer_card)
+        self.assertEqual(PlayerAction.DOUBLE_DOWN, max(evs, key=evs.get))
+
+        evs = calculator.action_evs(build_hand('soft_pair'), dealer_card)
+        self.assertEqual(PlayerAction.SPLIT, max(evs, key=evs.get))
+
+        evs = calculator.action_evs(build_hand('three_card_11'), dealer_card)
+        self.assertEqual({PlayerAction.HIT, PlayerAction.STAND}, set(evs))
+
+    def test_action_evs_composition(self):
+        calculator = EVCalculator()
+        hand = build_hand('hard')
+        dealer_card = Card('10', 10, 'clubs')
+
+        # With only fours left a hit always makes 21 and the dealer always stands on 18
+        evs = calculator.action_evs(hand, dealer_card, [0, 0, 10, 0, 0, 0, 0, 0, 0, 0])
+
+        self.assertEqual(PlayerAction.DOUBLE_DOWN, max(evs, key=evs.get))
+        self.assertAlmostEqual(1, evs[PlayerAction.HIT])
+        self.assertAlmostEqual(-1, evs[PlayerAction.STAND])
+
+
+class TestEVStrategy(TestCase):
+    def test_action_low_bankroll(self):
+        strategy = EVStrategy()
+
+        hand = build_hand('double_down')
+        dealer_card = Card('6', 6, 'clubs')
+
+        self.assertEqual(PlayerAction.DOUBLE_DOWN, strategy.action(hand, dealer_card, 100))
+        self.assertEqual(PlayerAction.HIT, strategy.action(hand, dealer_card, 0))
+
+    def test_play_round(self):
+        settings = GameSettings(num_decks=2)
+        game = Game(settings, rng=default_rng(1))
+
+        game.add_player({'player_strategy': EVStrategy(settings)})
+
+        for _ in range(5):
+            game.play_round()
+
+        calculator = game.players[0].action_strategy.calculator
+
+        self.assertEqual(5, game.round_count)
+        self.assertLess(0.2, calculator.cache_hits / (calculator.cache_hits + calculator.cache_misses))
@@ -0,0 +1,132 @@
+import random
+
+from unittest import TestCase
+
+import numpy as np
+
+from blackjack.batch import RANK_INDEX
+from blackjack.batch import BatchGame
+from blackjack.batch import BatchShoe
+from blackjack.cards import CARDS_PER_DECK
+from blackjack.cards import Deck
+from blackjack.game import Game
+from blackjack.game import GameSettings
+from blackjack.player import BetStrategyType
+from blackjack.player import CHART_MODIFIED_STRATEGY
+
+
+class TestBatchShoe(TestCase):
+    def test___init__(self):
+        with self.assertRaises(ValueError):
+            BatchShoe(num_tables=1, num_decks=0, rng=np.random.default_rng(0))
+
+    def test_draw(self):
+        shoe = BatchShoe(num_tables=4, num_decks=1, rng=np.random.default_rng(0))
+        shoe.reset()
+
+        tables = np.array([0, 2])
+        top_cards = shoe.cards[tables, 0]
+
+        self.assertTrue(np.array_equal(top_cards, shoe.draw(tables)))
+        self.assertEqual([CARDS_PER_DECK - 1, CARDS_PER_DECK, CARDS_PER_DECK - 1, CARDS_PER_DECK],
+                         shoe.num_cards.tolist())
+
+        shoe.stop_card[:] = shoe.num_cards
+        shoe.draw(tables)
+
+        self.assertEqual([True, False, True, False], shoe.last_round.tolist())
+
+        shoe.position[:] = shoe.size
+        with self.assertRaises(IndexError):
+            shoe.draw(tables)
+
+    def test_reset(self):
+        shoe = BatchShoe(num_tables=3, num_decks=2, rng=np.random.default_rng(0))
+        shoe.reset()
+
+        for cards in shoe.cards:
+            self.assertEqual([8] * 13, np.bincount(cards, minlength=13).tolist())
+
+        self.assertTrue((shoe.stop_card > 0).all())
+        self.assertFalse(shoe.last_round.any())
+
+
+class TestBatchGame(TestCase):
+    def __play_both(self, settings, players, num_tables, rounds, seed):
+        games = []
+        shoes = []
+        rng = random.Random(seed)
+
+        for _ in range(num_tables):
+            game = Game(settings)
+
+            for player_settings in players:
+                game.add_player(dict(player_settings))
+
+            cards = Deck().cards * settings.num_decks
+            rng.shuffle(cards)
+
+            game.shoe.cards = cards[:]
+            game.shoe.stop_card = None
+
+            games.append(game)
+            shoes.append([RANK_INDEX[card.rank] for card in reversed(cards)])
+
+        batch = BatchGame(settings, num_tables=num_tables, rng=np.random.default_rng(seed))
+
+        for player_settings in players:
+            batch.add_player(dict(player_settings))
+
+        batch.shoe.cards[:] = shoes
+
+        for _ in range(rounds):
+            batch.play_round()
+
+            for game in games:
+                game.play_round()
+
+        return games, batch
+
+    def test_play_round_matches_game(self):
+        settings = GameSettings(num_decks=8)
+        players = [{'bankroll': 1000}, {'bankroll': 30},
+                   {'bankroll': 200, 'player_strategy': CHART_MODIFIED_STRATEGY}]
+
+        games, batch = self.__play_both(settings, players, num_tables=40, rounds=12, seed=7)
+
+        for table, game in enumerate(games):
+            self.assertEqual([player.bankroll for player in game.players[:-1]], batch.bankroll[table].tolist())
+            self.assertEqual(game.shoe.num_cards, batch.shoe.num_cards[table])
+
+    def test_play_round_matches_game_with_limits(self):
+        settings = GameSettings(blackjack_payout=1.2, min_bet=25, max_bet=40, num_decks=6,
+                                dealer_hit_soft_17=False)
+        players = [{'bankroll': 60}, {'bankroll': 500, 'bet_limit': 30}]
+
+        games, batch = self.__play_both(settings, players, num_tables=40, rounds=10, seed=11)
+
+        for table, game in enumerate(games):
+            self.assertEqual([player.bankroll for player in game.players[:-1]], batch.bankroll[table].tolist())
+
+    def test___init___analytic_dealer(self):
+        with self.assertRaises(ValueError):
+            BatchGame(GameSettings(analytic_dealer=True), num_tables=1)
+
+    def test_add_player_unsupported_strategy(self):
+        batch = BatchGame(num_tables=1)
+
+        with self.assertRaises(ValueError):
+            batch.add_player({'bet_strategy_type': BetStrategyType.MARTINGALE})
+
+    def test_start(self):
+        batch = BatchGame(GameSettings(num_decks=1), num_tables=50, rng=np.random.default_rng(3))
+        batch.add_player({'bankroll': 10000})
+        batch.add_player({'bankroll': 10000})
+
+        num_rounds = 40
+        batch.start(rounds=num_rounds)
+
+        self.assertEqual(num_rounds, batch.round_count)
+        self.assertTrue((batch.hands >= num_rounds).all())
+        self.assertTrue(np.array_equal(batch.hands, batch.wins + batch.pushes + batch.losses))
+        self.assertTrue(np.allclose(batch.bankroll - 10000, batch.net))
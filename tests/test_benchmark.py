@@ -0,0 +1,69 @@
+import json
+import os
+import tempfile
+
+from unittest import TestCase
+
+from blackjack.benchmark import benchmark_play_round
+from blackjack.benchmark import compare
+from blackjack.benchmark import main
+from blackjack.benchmark import run_benchmarks
+from blackjack.player import BetStrategyType
+
+
+def build_results(ops_per_sec):
+    return {'results': {name: {'ops_per_sec': ops} for name, ops in ops_per_sec.items()}}
+
+
+class TestBenchmark(TestCase):
+    def test_compare(self):
+        baseline = build_results({'a': 100, 'b': 100, 'c': 100, 'd': 0})
+        current = build_results({'a': 95, 'b': 80, 'c': 150, 'd': 10, 'e': 10})
+
+        regressions = compare(baseline, current, threshold=0.1)
+
+        self.assertEqual(['b'], [name for name, _, _, _ in regressions])
+        self.assertAlmostEqual(-0.2, regressions[0][3])
+
+    def test_compare_overhead(self):
+        baseline = build_results({'a': 100, 'b': 100})
+        current = build_results({'a': 100, 'b': 100})
+        current['results']['a']['overhead'] = 0.1
+        current['results']['b']['overhead'] = 0.5
+
+        self.assertEqual(['b'], [name for name, _, _, _ in compare(baseline, current)])
+
+    def test_run_benchmarks(self):
+        results = run_benchmarks(rounds=20, repeat=1, decks=[1], players=[2],
+                                 bet_strategy_types=[BetStrategyType.STATIC, BetStrategyType.SERIES])
+
+        self.assertIn('game.start/decks=1/players=2/bet=series', results['results'])
+        self.assertIn('shoe.shuffle/decks=1', results['results'])
+        self.assertIn('shoe.shuffle/decks=1/rng=numpy', results['results'])
+        self.assertLess(0, results['results']['hand_log/players=2']['bytes_per_round'])
+
+        for result in results['results'].values():
+            self.assertLess(0, result['ops_per_sec'])
+
+        game_result = results['results']['game.start/decks=1/players=2/bet=static']
+        self.assertLessEqual(40, game_result['hands'])
+
+    def test_benchmark_play_round(self):
+        result = benchmark_play_round(1, 2, rounds=50, repeat=3, seed=1)
+
+        self.assertEqual(50, result['operations'])
+        self.assertLess(0, result['ops_per_sec'])
+
+    def test_main_compare(self):
+        with tempfile.TemporaryDirectory() as directory:
+            baseline_path = os.path.join(directory, 'baseline.json')
+            current_path = os.path.join(directory, 'current.json')
+
+            with open(baseline_path, 'w') as file:
+                json.dump(build_results({'a': 100}), file)
+
+            with open(current_path, 'w') as file:
+                json.dump(build_results({'a': 50}), file)
+
+            self.assertEqual(1, main(['compare', baseline_path, current_path]))
+            self.assertEqual(0, main(['compare', current_path, baseline_path]))
@@ -1,6 +1,12 @@
 from unittest import TestCase
 
+from blackjack.cards import CARD_CODE_RANKS
+from blackjack.cards import CARD_CODE_VALUES
+from blackjack.cards import CARD_CODES
+from blackjack.cards import CARD_RANKS
+from blackjack.cards import CARDS
 from blackjack.cards import CARDS_PER_DECK
+from blackjack.cards import COUNT_SYSTEMS
 from blackjack.cards import Card
 from blackjack.cards import Deck
 from blackjack.cards import Shoe
@@ -16,6 +22,27 @@ class TestCard(TestCase):
         self.assertEqual(str(card), '{} - {}'.format(TestCard.test_card_rank, TestCard.test_card_suit.title()))
 
 
+class TestCardCodes(TestCase):
+    def test_lookup_tables(self):
+        self.assertEqual(CARDS_PER_DECK, len(CARDS))
+
+        for code, card in enumerate(CARDS):
+            self.assertEqual(code, CARD_CODES[card])
+            self.assertEqual(card.rank, CARD_RANKS[CARD_CODE_RANKS[code]][0])
+            self.assertEqual(card.value, CARD_CODE_VALUES[code])
+
+
+class TestCountSystem(TestCase):
+    def test_card_code_tags(self):
+        self.assertEqual(0, sum(COUNT_SYSTEMS['hi-lo'].card_code_tags))
+        self.assertEqual(4, sum(COUNT_SYSTEMS['ko'].card_code_tags))
+        self.assertEqual(0, sum(COUNT_SYSTEMS['omega-ii'].card_code_tags))
+
+    def test_initial_count(self):
+        self.assertEqual(0, COUNT_SYSTEMS['hi-lo'].initial_count(6))
+        self.assertEqual(-20, COUNT_SYSTEMS['ko'].initial_count(6))
+
+
 class TestDeck(TestCase):
     def test___init__(self):
         deck = Deck()
@@ -31,6 +58,51 @@ class TestShoe(TestCase):
         with self.assertRaises(ValueError):
             Shoe(num_decks=0)
 
+        with self.assertRaises(ValueError):
+            Shoe(num_decks=1, count_system='unknown')
+
+    def test_running_count(self):
+        for count_system in COUNT_SYSTEMS:
+            shoe = Shoe(num_decks=2, count_system=count_system)
+            tags = COUNT_SYSTEMS[count_system].tags
+            initial_count = shoe.running_count
+
+            cards = [shoe.draw() for _ in range(10)] + shoe.draw_many(15)
+
+            self.assertEqual(initial_count + sum(tags[card.value - 2] for card in cards), shoe.running_count)
+
+            shoe.draw_many(shoe.num_cards)
+            self.assertEqual(4 if count_system == 'ko' else 0, shoe.running_count)
+
+            shoe.reset()
+            self.assertEqual(initial_count, shoe.running_count)
+
+    def test_true_count(self):
+        shoe = Shoe(num_decks=2)
+        shoe.cards = Deck().cards * 2
+
+        # Cards are dealt from the end of a new deck, so the aces, tens, nines and half the eights come first
+        for _ in range(CARDS_PER_DECK // 2):
+            shoe.draw()
+
+        self.assertEqual(-20, shoe.running_count)
+        self.assertAlmostEqual(-20 / 1.5, shoe.true_count)
+
+    def test_composition(self):
+        shoe = Shoe(num_decks=2)
+
+        self.assertEqual([8] * 8 + [32, 8], shoe.composition())
+
+        for _ in range(40):
+            shoe.draw()
+
+        composition = [0] * 10
+
+        for card in shoe.cards:
+            composition[card.value - 2] += 1
+
+        self.assertEqual(composition, shoe.composition())
+
     def test_draw(self):
         shoe = Shoe(num_decks=1)
 
@@ -50,6 +122,63 @@ class TestShoe(TestCase):
         with self.assertRaises(IndexError):
             shoe.draw()
 
+    def test_draw_code(self):
+        shoe = Shoe(num_decks=1)
+
+        last_code = CARD_CODES[shoe.cards[-1]]
+
+        self.assertEqual(last_code, shoe.draw_code())
+        self.assertEqual(CARDS_PER_DECK - 1, shoe.num_cards)
+
+    def test_cards(self):
+        shoe = Shoe(num_decks=8)
+
+        self.assertEqual(CARDS_PER_DECK * 8, len(shoe.card_codes) * shoe.card_codes.itemsize)
+
+        cards = shoe.cards[:10]
+        shoe.cards = cards
+
+        self.assertEqual(cards, shoe.cards)
+        self.assertEqual(cards[-1], shoe.draw())
+
+    def test_burn(self):
+        shoe = Shoe(num_decks=1)
+        running_count = shoe.running_count
+        cards = shoe.cards
+
+        shoe.stop_card = CARDS_PER_DECK - 10
+        shoe.burn(5)
+
+        self.assertEqual(cards[:-5], shoe.cards)
+        self.assertEqual(running_count, shoe.running_count)
+        self.assertFalse(shoe.last_round)
+
+        shoe.burn(6)
+        self.assertTrue(shoe.last_round)
+
+        with self.assertRaises(IndexError):
+            shoe.burn(shoe.num_cards + 1)
+
+    def test_draw_many(self):
+        shoe = Shoe(num_decks=1)
+
+        cards = shoe.cards
+        drawn_cards = shoe.draw_many(5)
+
+        self.assertEqual(cards[:-6:-1], drawn_cards)
+        self.assertEqual(cards[:-5], shoe.cards)
+        self.assertEqual([], shoe.draw_many(0))
+
+        shoe.stop_card = shoe.num_cards - 2
+        shoe.draw_many(2)
+        self.assertFalse(shoe.last_round)
+
+        shoe.draw_many(1)
+        self.assertTrue(shoe.last_round)
+
+        with self.assertRaises(IndexError):
+            shoe.draw_many(shoe.num_cards + 1)
+
     def test_reset(self):
         for num_decks in TestShoe.test_shoe_sizes:
             shoe = Shoe(num_decks=num_decks)
@@ -59,6 +188,45 @@ class TestShoe(TestCase):
             self.assertEqual(CARDS_PER_DECK * num_decks, shoe.num_cards)
             self.assertEqual(False, shoe.last_round)
 
+    def test_reset_keeps_buffer(self):
+        shoe = Shoe(num_decks=2)
+        card_codes = shoe.card_codes
+
+        for _ in range(30):
+            shoe.draw()
+
+        shoe.reset()
+
+        self.assertIs(card_codes, shoe.card_codes)
+        self.assertEqual(sorted(Deck().cards * 2), sorted(shoe.cards))
+
+    def test_snapshot_load(self):
+        shoe = Shoe(num_decks=1)
+
+        for _ in range(10):
+            shoe.draw()
+
+        card_codes, stop_card = shoe.snapshot()
+        cards = shoe.cards
+
+        other = Shoe(num_decks=1)
+        other.load(card_codes, stop_card)
+
+        self.assertEqual(cards, other.cards)
+        self.assertEqual(stop_card, other.stop_card)
+        self.assertEqual([shoe.draw() for _ in range(5)], [other.draw() for _ in range(5)])
+
+    def test_shuffle_partial(self):
+        shoe = Shoe(num_decks=1)
+
+        for _ in range(20):
+            shoe.draw()
+
+        cards = shoe.cards
+        shoe.shuffle()
+
+        self.assertEqual(sorted(cards), sorted(shoe.cards))
+
     def test_shuffle(self):
         for num_decks in TestShoe.test_shoe_sizes:
             shoe = Shoe(num_decks=num_decks)
@@ -0,0 +1,58 @@
+from unittest import TestCase
+
+from blackjack.compare import ComparisonReport
+from blackjack.compare import compare_strategies
+from blackjack.compare import play_comparison_shard
+from blackjack.game import GameSettings
+from blackjack.optimizer import replace_cell
+from blackjack.player import CHART_BASIC_STRATEGY
+from blackjack.player import PlayerAction
+
+
+class TestCompare(TestCase):
+    test_basic = {'bankroll': 10 ** 9}
+    test_stand_16 = {'bankroll': 10 ** 9,
+                     'player_strategy': replace_cell(CHART_BASIC_STRATEGY, ('hard', 16, 10), PlayerAction.STAND)}
+
+    def test_comparison_report(self):
+        report = ComparisonReport([(10, 10, 5, 10), (-10, 10, -15, 10), (0, 20, -10, 20)])
+
+        difference, standard_error = report.difference()
+
+        self.assertAlmostEqual(0.5, difference)
+        self.assertGreater(report.independent_standard_error(), standard_error)
+        self.assertEqual([40, 40], report.summary()['rounds'])
+
+    def test_compare_identical(self):
+        report = compare_strategies(GameSettings(), TestCompare.test_basic, TestCompare.test_basic, shoes=20,
+                                    seed=1)
+
+        self.assertEqual((0.0, 0.0), report.difference())
+        self.assertGreater(report.independent_standard_error(), 0)
+
+    def test_compare_strategies(self):
+        report = compare_strategies(GameSettings(), TestCompare.test_basic, TestCompare.test_stand_16, shoes=150,
+                                    seed=2)
+        summary = report.summary()
+
+        self.assertEqual(150, summary['shoes'])
+        self.assertEqual(summary['rounds'][0], summary['rounds'][1])
+        self.assertGreater(summary['variance_ratio'], 10)
+
+    def test_play_comparison_shard_reverse_pass(self):
+        variants = [TestCompare.test_basic, TestCompare.test_stand_16]
+
+        reverse_pass = play_comparison_shard(GameSettings(num_decks=2), variants, shoes=5, seed=3, index=0)
+        single = play_comparison_shard(GameSettings(num_decks=2), variants, shoes=5, seed=3, index=0,
+                                       reverse_pass=False)
+
+        self.assertEqual(5, len(reverse_pass.shoes))
+        self.assertTrue(all(a[1] > s[1] for a, s in zip(reverse_pass.shoes, single.shoes)))
+
+    def test_compare_strategies_workers(self):
+        single = compare_strategies(None, TestCompare.test_basic, TestCompare.test_stand_16, shoes=30, seed=4,
+                                    shard_shoes=10)
+        parallel = compare_strategies(None, TestCompare.test_basic, TestCompare.test_stand_16, shoes=30, seed=4,
+                                      shard_shoes=10, workers=2)
+
+        self.assertEqual(single.shoes, parallel.shoes)
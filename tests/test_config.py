@@ -0,0 +1,127 @@
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from unittest import TestCase
+
+from blackjack.__main__ import main
+from blackjack.config import load_config
+from blackjack.config import simulation_config
+from blackjack.hand import HandResult
+from blackjack.player import BetStrategyType
+from blackjack.player import CHART_MODIFIED_STRATEGY
+from blackjack.runner import run_simulation
+
+TEST_CONFIG = '''
+rounds = 150
+seeds = [1, 2]
+shard_rounds = 100
+
+[table]
+num_decks = 2
+
+[[seats]]
+bankroll = 10000
+count = 2
+
+[[seats]]
+bankroll = 10000
+bet_strategy = "count"
+bet_strategy_settings = { count_ramp = { "1" = 2, "2.5" = 4 } }
+player_strategy = "modified"
+'''
+
+
+class TestConfig(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'simulation.toml')
+
+        with open(self.path, 'w') as file:
+            file.write(TEST_CONFIG)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_simulation_config(self):
+        config = simulation_config(load_config(self.path))
+
+        self.assertEqual(2, config['settings'].num_decks)
+        self.assertEqual([1, 2], config['seeds'])
+        self.assertEqual(3, len(config['players']))
+        self.assertIsNot(config['players'][0], config['players'][1])
+        self.assertEqual(BetStrategyType.COUNT, config['players'][2]['bet_strategy_type'])
+        self.assertEqual({1: 2, 2.5: 4}, config['players'][2]['bet_strategy_settings']['count_ramp'])
+        self.assertIs(CHART_MODIFIED_STRATEGY, config['players'][2]['player_strategy'])
+
+        series = simulation_config({'seats': [{'bet_strategy': 'series', 'bet_strategy_settings': {
+            'series': [1, 2], 'series_reset_result': 'push'}}]})
+
+        self.assertEqual(HandResult.PUSH, series['players'][0]['bet_strategy_settings']['series_reset_result'])
+
+    def test_simulation_config_invalid(self):
+        series = {'bet_strategy': 'series'}
+
+        for config in ({'table': {'decks': 2}}, {'round': 5}, {'seats': []}, {'seats': [{'bankrol': 5}]},
+                       {'seats': [{'bet_strategy': 'double'}]}, {'seats': [{'bet_strategy': 3}]},
+                       {'seats': [{'player_strategy': 'perfect'}]}, {'seats': [{'player_strategy': ['basic']}]},
+                       {'seats': [dict(series, bet_strategy_settings={'series_reset_result': 'tie'})]},
+                       {'seats': [dict(series, bet_strategy_settings={'series_reset_result': 1})]}):
+            with self.assertRaises(ValueError):
+                simulation_config(config)
+
+    def test_main(self):
+        output_path = os.path.join(self.directory.name, 'summary.json')
+        json_path = os.path.join(self.directory.name, 'simulation.json')
+
+        with open(json_path, 'w') as file:
+            json.dump(load_config(self.path), file)
+
+        self.assertEqual(0, main(['simulate', json_path, '--seed', '3', '--output', output_path]))
+
+        with open(output_path) as file:
+            runs = json.load(file)['runs']
+
+        config = simulation_config(load_config(self.path))
+        report = run_simulation(config['settings'], config['players'], 150, seed=3, shard_rounds=100)
+
+        self.assertEqual([3], [run['seed'] for run in runs])
+        self.assertEqual(json.loads(json.dumps(report.summary())), {key: runs[0][key] for key in report.summary()})
+
+    def test_main_error(self):
+        stderr = io.StringIO()
+
+        with contextlib.redirect_stderr(stderr):
+            self.assertEqual(2, main(['simulate', os.path.join(self.directory.name, 'missing.json')]))
+
+        self.assertIn('error', stderr.getvalue())
+
+    def test_main_invalid_config(self):
+        json_path = os.path.join(self.directory.name, 'simulation.json')
+
+        for seat in ({'bet_strategy': 7}, {'bet_strategy': 'series', 'bet_strategy_settings': {
+                'series_reset_result': 'tie'}}):
+            with open(json_path, 'w') as file:
+                json.dump({'seats': [seat]}, file)
+
+            stderr = io.StringIO()
+
+            with contextlib.redirect_stderr(stderr):
+                self.assertEqual(2, main(['simulate', json_path]))
+
+            self.assertIn('is not valid', stderr.getvalue())
+
+    def test_lazy_imports(self):
+        code = ('import sys; from blackjack.__main__ import main; '
+                'main(["simulate", sys.argv[1], "--rounds", "10", "-o", "-"]); '
+                'print(sorted(name for name in ("numpy", "concurrent.futures.process", "pickle") '
+                'if name in sys.modules))')
+
+        output = subprocess.run([sys.executable, '-c', code, self.path], capture_output=True, text=True,
+                                check=True)
+
+        self.assertEqual('[]', output.stdout.strip().splitlines()[-1])
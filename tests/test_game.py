@@ -1,4 +1,9 @@
+import os
+import random
+import tempfile
+
 from unittest import TestCase
+from unittest import mock
 
 from blackjack.game import Game
 from blackjack.game import GameSettings
@@ -116,6 +121,32 @@ class TestGame(TestCase):
         for player in game.players[:-1]:
             self.assertNotEqual(None, player.hands[0].result)
 
+    def test_play_round_analytic_dealer(self):
+        game = Game(GameSettings(analytic_dealer=True))
+
+        game.add_player()
+        game.play_round()
+
+        self.assertEqual(1, len(game.players[-1].hands[0].cards))
+        self.assertIs(game.players[-1].hands[0].cards[0], game.dealer_card)
+
+        for hand in game.players[0].hands:
+            self.assertIsNotNone(hand.expected_value)
+            self.assertLessEqual(0, hand.variance)
+
+    def test_records(self):
+        game = Game(GameSettings(num_decks=1))
+
+        game.add_player()
+        game.add_player()
+
+        records = list(game.records(rounds=10))
+
+        self.assertEqual(10, game.round_count)
+        self.assertEqual(list(range(1, 11)), sorted(set(record.round for record in records)))
+        self.assertEqual({1, 2}, set(record.seat for record in records))
+        self.assertTrue(any(record.reshuffle for record in records))
+
     def test_start(self):
         game = Game(GameSettings(num_decks=1))
 
@@ -125,3 +156,117 @@ class TestGame(TestCase):
         game.start(rounds=num_rounds)
 
         self.assertEqual(num_rounds, game.round_count)
+
+    def test_converge(self):
+        game = Game(rng=random.Random(2))
+        game.add_player({'bankroll': 10 ** 9})
+        game.add_player({'bankroll': 10 ** 9})
+
+        results = game.converge(half_width=2.0)
+
+        self.assertEqual('converged', results['reason'])
+        self.assertEqual({1, 2}, set(results['players']))
+        self.assertTrue(all(player['half_width'] <= 2.0 for player in results['players'].values()))
+        self.assertEqual(game.round_count, results['rounds'])
+
+        hands = game.stats[1].hands
+        results = game.converge(half_width=0.001, max_rounds=50)
+
+        self.assertEqual('max_rounds', results['reason'])
+        self.assertGreater(game.stats[1].hands, hands)
+
+    def test_converge_broke_player(self):
+        for seed in (2, 4):
+            game = Game(rng=random.Random(seed))
+            game.add_player({'bankroll': 10 ** 9})
+            game.add_player({'bankroll': 30})
+
+            results = game.converge(half_width=2.0, max_rounds=100000)
+
+            self.assertEqual('converged', results['reason'])
+            self.assertLess(game.players[1].bankroll, game.settings.min_bet)
+            self.assertLessEqual(results['players'][1]['half_width'], 2.0)
+
+        game = Game(rng=random.Random(1))
+        game.add_player({'bankroll': 10})
+
+        self.assertEqual('broke', game.converge(half_width=0.001)['reason'])
+
+    def test_converge_min_hands(self):
+        game = Game(rng=random.Random(6))
+        game.add_player({'bankroll': 10 ** 9})
+
+        results = game.converge(half_width=1000.0, min_rounds=1, min_hands=40)
+
+        self.assertEqual('converged', results['reason'])
+        self.assertGreaterEqual(results['players'][1]['hands'], 40)
+
+    def test_converge_time_budget(self):
+        game = Game(rng=random.Random(3))
+        game.add_player({'bankroll': 10 ** 9})
+
+        ticks = iter(range(1000))
+        results = game.converge(half_width=0.001, time_budget=20, clock=lambda: next(ticks))
+
+        self.assertEqual('time_budget', results['reason'])
+        self.assertEqual(20, results['rounds'])
+
+        with self.assertRaises(ValueError):
+            game.converge(half_width=0)
+
+    def test_resume(self):
+        players = [
+            {'bankroll': 10000, 'bet_strategy_type': BetStrategyType.SERIES,
+             'bet_strategy_settings': {'series': [1, 3, 2]}},
+            {'bankroll': 10000, 'bet_strategy_type': BetStrategyType.COUNT,
+             'bet_strategy_settings': {'count_ramp': {1: 2, 2: 4}}},
+        ]
+
+        def build_game():
+            game = Game(GameSettings(num_decks=2), rng=random.Random(5))
+
+            for player_settings in players:
+                game.add_player(dict(player_settings))
+
+            return game
+
+        expected = build_game()
+        expected.start(rounds=300)
+
+        play_round = Game.play_round
+
+        def interrupt(game):
+            if game.round_count == 250:
+                raise KeyboardInterrupt
+
+            play_round(game)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'game.checkpoint')
+
+            with mock.patch.object(Game, 'play_round', autospec=True, side_effect=interrupt):
+                with self.assertRaises(KeyboardInterrupt):
+                    build_game().start(rounds=300, checkpoint_path=path, checkpoint_interval=100)
+
+            game = Game.resume(path)
+
+            self.assertEqual(['game.checkpoint'], os.listdir(directory))
+
+        self.assertEqual(300, game.round_count)
+        self.assertEqual([player.bankroll for player in expected.players],
+                         [player.bankroll for player in game.players])
+        self.assertEqual(expected.shoe.cards, game.shoe.cards)
+        self.assertIs(game.shoe, game.players[1].bet_strategy.shoe)
+
+    def test_unseen_composition(self):
+        game = Game(GameSettings(num_decks=1))
+
+        game.add_player()
+        game.play_round()
+
+        composition = [0] * 10
+
+        for card in game.shoe.cards + [game.players[-1].hands[0].cards[0]]:
+            composition[card.value - 2] += 1
+
+        self.assertEqual(composition, game.unseen_composition())
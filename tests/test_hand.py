@@ -1,5 +1,7 @@
 from unittest import TestCase
 
+from blackjack.cards import Card
+from blackjack.hand import Hand
 from blackjack.hand import HandResult
 from tests.data import HANDS
 from tests.utils import build_hand
@@ -47,6 +49,23 @@ class TestHand(TestCase):
 
         self.assertEqual(HandResult.WIN, hand.calculate_result(dealer_hand))
 
+    def test_calculate_expected_result(self):
+        distribution = (0.1, 0.2, 0.2, 0.2, 0.1, 0.2)
+
+        hand = build_hand('hard')
+        self.assertEqual(HandResult.LOSE, hand.calculate_expected_result(distribution, 1.5))
+        self.assertAlmostEqual(0.2 * 10 - 0.7 * 10, hand.expected_value)
+        self.assertAlmostEqual(0.9 * 100 - (0.2 * 10 - 0.7 * 10) ** 2, hand.variance)
+
+        hand = build_hand('blackjack')
+        self.assertEqual(HandResult.WIN, hand.calculate_expected_result(distribution, 1.5))
+        self.assertAlmostEqual(0.9 * 15, hand.expected_value)
+
+        hand = build_hand('bust')
+        self.assertEqual(HandResult.LOSE, hand.calculate_expected_result(distribution, 1.5))
+        self.assertEqual(-10, hand.expected_value)
+        self.assertEqual(0, hand.variance)
+
     def test_deal_blackjack(self):
         self.__validate_hand('blackjack')
 
@@ -59,6 +78,36 @@ class TestHand(TestCase):
     def test_deal_soft(self):
         self.__validate_hand('soft')
 
+    def test_deal_soft_to_hard(self):
+        hand = build_hand('soft')
+        hand.deal(Card('K', 10, 'hearts'))
+        hand.deal(Card('A', 11, 'diamonds'))
+
+        self.assertEqual(14, hand.score)
+        self.assertEqual(False, hand.soft)
+        self.assertEqual(False, hand.bust)
+
+    def test_slots(self):
+        hand = Hand()
+
+        with self.assertRaises(AttributeError):
+            hand.unknown = True
+
+    def test_split(self):
+        hand = build_hand('soft_pair')
+
+        card = hand.split()
+
+        self.assertEqual('A', card.rank)
+        self.assertEqual(1, len(hand.cards))
+        self.assertEqual(11, hand.score)
+        self.assertEqual(True, hand.soft)
+
+        hand.deal(Card('K', 10, 'hearts'))
+
+        self.assertEqual(21, hand.score)
+        self.assertEqual(True, hand.blackjack)
+
 
 class TestHandResult(TestCase):
     def test___str__(self):
@@ -0,0 +1,180 @@
+import os
+import pickle
+import tempfile
+
+from unittest import TestCase
+
+from blackjack.game import Game
+from blackjack.hand import HandResult
+from blackjack.handlog import HANDLOG_MAGIC
+from blackjack.handlog import HandLog
+from blackjack.handlog import read_hand_log
+from blackjack.player import PlayerAction
+from blackjack.rng import default_rng
+
+
+class TestHandLog(TestCase):
+    test_bankroll = 10000
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'hands.log')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def play(self, hand_log, rounds=200, seed=1):
+        game = Game(rng=default_rng(seed), hand_log=hand_log)
+
+        for _ in range(2):
+            game.add_player({'bankroll': TestHandLog.test_bankroll})
+
+        game.start(rounds=rounds)
+        hand_log.close()
+
+        return game
+
+    def test_round_trip(self):
+        game = self.play(HandLog(self.path))
+        rounds = list(read_hand_log(self.path))
+
+        self.assertEqual(list(range(1, 201)), [logged_round.round for logged_round in rounds])
+
+        for player in game.players[:-1]:
+            net = 0
+
+            for logged_round in rounds:
+                for hand in logged_round.hands:
+                    if hand.seat == player.number:
+                        net += hand.winnings if hand.result != HandResult.LOSE else -hand.bet
+
+            self.assertEqual(player.bankroll - TestHandLog.test_bankroll, net)
+
+        last_round = rounds[-1]
+        last_hands = [hand for player in game.players[:-1] for hand in player.hands]
+
+        self.assertEqual(game.dealer_card, last_round.upcard)
+        self.assertEqual(game.players[-1].hands[0].score, last_round.dealer_score)
+        self.assertEqual([tuple(hand.cards[:2]) for hand in last_hands],
+                         [hand.first_cards for hand in last_round.hands])
+
+    def test_decisions(self):
+        self.play(HandLog(self.path), rounds=500)
+
+        actions = [decision.action for logged_round in read_hand_log(self.path)
+                   for decision in logged_round.decisions]
+
+        self.assertEqual(set(PlayerAction), set(actions))
+
+        for logged_round in read_hand_log(self.path):
+            for decision in logged_round.decisions:
+                no_card = decision.action in (PlayerAction.STAND, PlayerAction.SPLIT)
+                self.assertEqual(no_card, decision.card is None)
+
+    def test_hand_cards(self):
+        hand_log = HandLog(self.path)
+        game = Game(rng=default_rng(3), hand_log=hand_log)
+        game.add_player({'bankroll': TestHandLog.test_bankroll})
+        game.shoe.reset()
+        played = []
+
+        for _ in range(500):
+            game.play_round()
+            played.append({hand.number: list(hand.cards) for hand in game.players[0].hands})
+
+            if game.shoe.last_round:
+                game.shoe.reset()
+
+        hand_log.close()
+        split_hands = 0
+
+        # Every hand, split ones included, is its first cards followed by the cards its decisions drew
+        for round_index, logged_round in enumerate(read_hand_log(self.path)):
+            for hand in logged_round.hands:
+                draws = [decision.card for decision in logged_round.decisions
+                         if decision.hand == hand.hand and decision.card is not None]
+
+                self.assertEqual(played[round_index][hand.hand], list(hand.first_cards) + draws)
+                split_hands += hand.hand > 1
+
+        self.assertLess(0, split_hands)
+
+    def test_compression(self):
+        plain = self.play(HandLog(self.path))
+
+        for compression in ('bz2', 'gzip', 'lzma'):
+            path = os.path.join(self.directory.name, compression)
+            game = self.play(HandLog(path, compression=compression))
+
+            with open(path, 'rb') as file:
+                self.assertNotEqual(HANDLOG_MAGIC, file.read(len(HANDLOG_MAGIC)))
+
+            self.assertLess(os.path.getsize(path), os.path.getsize(self.path))
+            self.assertEqual(list(read_hand_log(self.path)), list(read_hand_log(path)))
+            self.assertEqual(plain.players[0].bankroll, game.players[0].bankroll)
+
+    def test_rotation(self):
+        hand_log = HandLog(self.path, buffer_size=256, rotate_bytes=1024)
+        self.play(hand_log)
+
+        self.assertGreater(len(hand_log.paths), 2)
+
+        rounds = [logged_round.round for path in hand_log.paths for logged_round in read_hand_log(path)]
+
+        self.assertEqual(list(range(1, 201)), rounds)
+
+    def test_flush_interval(self):
+        now = [0.0]
+        hand_log = HandLog(self.path, flush_interval=5, clock=lambda: now[0])
+        game = Game(rng=default_rng(2), hand_log=hand_log)
+        game.add_player({'bankroll': TestHandLog.test_bankroll})
+        game.shoe.reset()
+
+        game.play_round()
+        self.assertEqual(0, hand_log.bytes_written)
+
+        now[0] = 5.0
+        game.play_round()
+        game.play_round()
+        self.assertEqual(2, len(list(read_hand_log(self.path))))
+
+        hand_log.close()
+        self.assertEqual(3, len(list(read_hand_log(self.path))))
+
+    def test_flush_round_in_progress(self):
+        hand_log = HandLog(self.path)
+        game = Game(rng=default_rng(2), hand_log=hand_log)
+        game.add_player({'bankroll': TestHandLog.test_bankroll})
+        game.shoe.reset()
+
+        game.play_round()
+        hand_log.decision(1, game.players[0].hands[0], PlayerAction.STAND)
+        hand_log.flush()
+        self.assertEqual(1, len(list(read_hand_log(self.path))))
+
+        game.play_round()
+        hand_log.close()
+
+        rounds = list(read_hand_log(self.path))
+
+        self.assertEqual(2, len(rounds))
+        self.assertEqual(PlayerAction.STAND, rounds[1].decisions[0].action)
+        self.assertIsNone(rounds[1].decisions[0].card)
+
+    def test_checkpoint(self):
+        game = self.play(HandLog(self.path), rounds=5)
+
+        self.assertIsNone(pickle.loads(pickle.dumps(game)).hand_log)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            HandLog(self.path, compression='zip')
+
+        with self.assertRaises(ValueError):
+            HandLog(self.path, buffer_size=0)
+
+        with open(self.path, 'wb') as file:
+            file.write(b'not a hand log')
+
+        with self.assertRaises(ValueError):
+            list(read_hand_log(self.path))
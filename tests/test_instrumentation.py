@@ -0,0 +1,72 @@
+import json
+import os
+import tempfile
+
+from unittest import TestCase
+
+from blackjack.game import Game
+from blackjack.game import GameSettings
+from blackjack.instrumentation import INSTRUMENTATION_PHASES
+from blackjack.instrumentation import Instrumentation
+
+
+class TestInstrumentation(TestCase):
+    def test___init__(self):
+        with self.assertRaises(ValueError):
+            Instrumentation(snapshot_interval=0)
+
+    def test_count(self):
+        instrumentation = Instrumentation()
+
+        instrumentation.count('splits')
+        instrumentation.count('splits', 2)
+
+        self.assertEqual({'splits': 3}, instrumentation.counters)
+
+    def test_lap(self):
+        ticks = iter(range(100))
+        instrumentation = Instrumentation(clock=lambda: next(ticks))
+
+        instrumentation.start_round(0)
+        instrumentation.lap('deal')
+        instrumentation.lap('player')
+        instrumentation.lap('player')
+
+        self.assertEqual(1, instrumentation.timers['deal'])
+        self.assertEqual(2, instrumentation.timers['player'])
+
+    def test_game(self):
+        instrumentation = Instrumentation(snapshot_interval=5)
+        game = Game(GameSettings(num_decks=1), instrumentation=instrumentation)
+
+        game.add_player({'bankroll': 10000})
+        game.add_player({'bankroll': 0})
+        game.start(rounds=20)
+
+        summary = instrumentation.summary()
+
+        self.assertEqual(20, summary['rounds'])
+        self.assertEqual(20, summary['counters']['broke_players'])
+        self.assertLessEqual(20, summary['counters']['hands'])
+        self.assertLessEqual(20 * 4, summary['counters']['draws'])
+        self.assertLessEqual(2, summary['counters']['reshuffles'])
+        self.assertEqual(set(INSTRUMENTATION_PHASES), set(summary['timers']))
+        self.assertEqual([5, 10, 15, 20], [snapshot['rounds'] for snapshot in instrumentation.snapshots])
+
+    def test_finish(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'summary.json')
+            snapshots = []
+
+            instrumentation = Instrumentation(snapshot_interval=2, snapshot_callback=snapshots.append,
+                                              output_path=path)
+            game = Game(instrumentation=instrumentation)
+
+            game.add_player()
+            game.start(rounds=4)
+
+            with open(path) as file:
+                self.assertEqual(4, json.load(file)['rounds'])
+
+            self.assertEqual(2, len(snapshots))
+            self.assertEqual([], instrumentation.snapshots)
@@ -0,0 +1,82 @@
+from unittest import TestCase
+
+from blackjack.optimizer import Candidate
+from blackjack.optimizer import candidate_actions
+from blackjack.optimizer import optimize_chart
+from blackjack.optimizer import play_batch
+from blackjack.optimizer import replace_cell
+from blackjack.player import CHART_BASIC_STRATEGY
+from blackjack.player import PlayerAction
+
+
+class TestOptimizer(TestCase):
+    test_cell = ('hard', 20, 6)
+
+    def test_candidate_update(self):
+        candidate = Candidate(TestOptimizer.test_cell, PlayerAction.HIT, CHART_BASIC_STRATEGY)
+
+        for difference in [-1.0, -1.1, -0.9, -1.0]:
+            candidate.update(difference, min_batches=5)
+
+        self.assertIsNone(candidate.status)
+
+        candidate.update(-1.0, min_batches=5)
+        self.assertEqual('worse', candidate.status)
+
+    def test_candidate_actions(self):
+        self.assertNotIn(PlayerAction.SPLIT, candidate_actions(TestOptimizer.test_cell))
+        self.assertIn(PlayerAction.SPLIT, candidate_actions(('pair', '8', 10)))
+
+    def test_replace_cell(self):
+        chart = replace_cell(CHART_BASIC_STRATEGY, TestOptimizer.test_cell, PlayerAction.HIT)
+
+        self.assertEqual(PlayerAction.HIT, chart['hard'][20][4])
+        self.assertEqual(PlayerAction.STAND, CHART_BASIC_STRATEGY['hard'][20][4])
+
+    def test_play_batch(self):
+        stand_16 = replace_cell(CHART_BASIC_STRATEGY, ('hard', 16, 10), PlayerAction.STAND)
+
+        round_count, means = play_batch(None, [CHART_BASIC_STRATEGY, CHART_BASIC_STRATEGY], 300, seed=1, index=0)
+
+        self.assertLessEqual(300, round_count)
+        self.assertEqual(means[0], means[1])
+
+        # Standing takes no card where hitting takes one or more, yet the charts start every round on the same card
+        stand_count, stand_means = play_batch(None, [CHART_BASIC_STRATEGY, stand_16], 300, seed=1, index=0)
+
+        self.assertEqual(round_count, stand_count)
+        self.assertNotEqual(stand_means[0], stand_means[1])
+
+    def test_optimize_chart(self):
+        chart = replace_cell(CHART_BASIC_STRATEGY, TestOptimizer.test_cell, PlayerAction.HIT)
+
+        result = optimize_chart(chart=chart, cells=[TestOptimizer.test_cell], seed=1, max_batches=40)
+
+        self.assertEqual(CHART_BASIC_STRATEGY, result.chart)
+        self.assertEqual(1, len(result.changes))
+
+        change = result.changes[0]
+
+        self.assertEqual((PlayerAction.HIT, PlayerAction.STAND), (change.previous_action, change.action))
+        self.assertGreater(change.mean - change.half_width, 0)
+        self.assertLess(result.rounds, 40 * 3 * 500)
+
+    def test_optimize_chart_keeps_better_cell(self):
+        result = optimize_chart(cells=[TestOptimizer.test_cell], seed=2, max_batches=40)
+
+        self.assertEqual([], result.changes)
+        self.assertEqual(CHART_BASIC_STRATEGY, result.chart)
+
+    def test_optimize_chart_workers(self):
+        chart = replace_cell(CHART_BASIC_STRATEGY, TestOptimizer.test_cell, PlayerAction.HIT)
+
+        single = optimize_chart(chart=chart, cells=[TestOptimizer.test_cell], seed=3, batch_rounds=200,
+                                max_batches=20)
+        parallel = optimize_chart(chart=chart, cells=[TestOptimizer.test_cell], seed=3, batch_rounds=200,
+                                  max_batches=20, workers=2)
+
+        self.assertEqual(single, parallel)
+
+    def test_optimize_chart_invalid(self):
+        with self.assertRaises(ValueError):
+            optimize_chart(min_batches=1)
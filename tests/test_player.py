@@ -1,11 +1,20 @@
+import copy
+
+from itertools import product
 from unittest import TestCase
 
+from blackjack.cards import CARDS
 from blackjack.cards import Card
+from blackjack.cards import Shoe
 from blackjack.game import GameSettings
 from blackjack.hand import Hand
 from blackjack.hand import HandResult
+from blackjack.player import BET_STRATEGY_MAX_HAND_HISTORY
 from blackjack.player import BetStrategy
 from blackjack.player import BetStrategyType
+from blackjack.player import CHART_BASIC_STRATEGY
+from blackjack.player import CHART_MODIFIED_STRATEGY
+from blackjack.player import CompiledStrategy
 from blackjack.player import Player
 from blackjack.player import PlayerAction
 from tests.utils import build_hand
@@ -14,6 +23,14 @@ from tests.utils import build_hand
 class BetStrategyTest(TestCase):
     game_settings = GameSettings()
 
+    @staticmethod
+    def build_result_hand(result, winnings=0):
+        hand = Hand()
+        hand.result = result
+        hand.winnings = winnings
+
+        return hand
+
     def test_bet_limit_game(self):
         limit = 25
 
@@ -44,11 +61,10 @@ class BetStrategyTest(TestCase):
         strategy = BetStrategy(settings)
         self.assertEqual(BetStrategyTest.game_settings.min_bet, strategy.bet())
 
-        strategy.last_hand = Hand()
-        strategy.last_hand.result = HandResult.PUSH
+        strategy.last_hand = BetStrategyTest.build_result_hand(HandResult.PUSH)
         self.assertEqual(BetStrategyTest.game_settings.min_bet, strategy.bet())
 
-        strategy.last_hand.result = HandResult.LOSE
+        strategy.last_hand = BetStrategyTest.build_result_hand(HandResult.LOSE)
         self.assertEqual(BetStrategyTest.game_settings.min_bet * 2, strategy.bet())
 
     def test_bet_strategy_parlay(self):
@@ -60,9 +76,8 @@ class BetStrategyTest(TestCase):
         strategy = BetStrategy(settings)
         self.assertEqual(BetStrategyTest.game_settings.min_bet, strategy.bet())
 
-        strategy.last_hand = Hand()
-        strategy.last_hand.result = HandResult.WIN
-        strategy.last_hand.winnings = BetStrategyTest.game_settings.min_bet
+        strategy.last_hand = BetStrategyTest.build_result_hand(HandResult.WIN,
+                                                               BetStrategyTest.game_settings.min_bet)
         self.assertEqual(BetStrategyTest.game_settings.min_bet * 2, strategy.bet())
 
     def test_bet_strategy_series(self):
@@ -81,8 +96,7 @@ class BetStrategyTest(TestCase):
         for multiplier in settings['series']:
             self.assertEqual(BetStrategyTest.game_settings.min_bet * multiplier, strategy.bet())
 
-        strategy.last_hand = Hand()
-        strategy.last_hand.result = HandResult.WIN
+        strategy.last_hand = BetStrategyTest.build_result_hand(HandResult.WIN)
 
         self.assertEqual(BetStrategyTest.game_settings.min_bet, strategy.bet())
 
@@ -95,8 +109,7 @@ class BetStrategyTest(TestCase):
 
         strategy = BetStrategy(settings)
 
-        strategy.last_hand = Hand()
-        strategy.last_hand.result = HandResult.LOSE
+        strategy.last_hand = BetStrategyTest.build_result_hand(HandResult.LOSE)
 
         self.assertEqual(BetStrategyTest.game_settings.min_bet, strategy.bet())
 
@@ -125,8 +138,7 @@ class BetStrategyTest(TestCase):
         streak_count = 2
 
         for _ in range(streak_count):
-            strategy.last_hand = Hand()
-            strategy.last_hand.result = HandResult.LOSE
+            strategy.last_hand = BetStrategyTest.build_result_hand(HandResult.LOSE)
 
         self.assertEqual(BetStrategyTest.game_settings.min_bet * streak_rates[streak_count * -1], strategy.bet())
 
@@ -141,14 +153,12 @@ class BetStrategyTest(TestCase):
 
         strategy = BetStrategy(settings)
 
-        strategy.last_hand = Hand()
-        strategy.last_hand.result = HandResult.LOSE
+        strategy.last_hand = BetStrategyTest.build_result_hand(HandResult.LOSE)
 
         streak_count = 2
 
         for _ in range(streak_count):
-            strategy.last_hand = Hand()
-            strategy.last_hand.result = HandResult.WIN
+            strategy.last_hand = BetStrategyTest.build_result_hand(HandResult.WIN)
 
         self.assertEqual(BetStrategyTest.game_settings.min_bet * streak_rates[streak_count], strategy.bet())
 
@@ -178,11 +188,71 @@ class BetStrategyTest(TestCase):
         streak_count = 2
 
         for _ in range(streak_count):
-            strategy.last_hand = Hand()
-            strategy.last_hand.result = HandResult.WIN
+            strategy.last_hand = BetStrategyTest.build_result_hand(HandResult.WIN)
 
         self.assertEqual(BetStrategyTest.game_settings.min_bet * streak_rates[streak_count], strategy.bet())
 
+    def test_bet_strategy_count(self):
+        shoe = Shoe(num_decks=1)
+
+        settings = {
+            'game_settings': BetStrategyTest.game_settings,
+            'strategy_type': BetStrategyType.COUNT,
+            'count_ramp': {1: 2, 3: 4},
+            'shoe': shoe
+        }
+
+        strategy = BetStrategy(settings)
+
+        for running_count, units in [(-5, 1), (0, 1), (2, 2), (3, 4), (10, 4)]:
+            shoe.running_count = running_count
+            self.assertEqual(BetStrategyTest.game_settings.min_bet * units, strategy.bet())
+
+    def test_bet_strategy_count_no_count_ramp(self):
+        settings = {
+            'game_settings': BetStrategyTest.game_settings,
+            'strategy_type': BetStrategyType.COUNT,
+            'shoe': Shoe(num_decks=1)
+        }
+
+        strategy = BetStrategy(settings)
+
+        with self.assertRaises(ValueError):
+            strategy.bet()
+
+    def test_bet_strategy_count_no_shoe(self):
+        settings = {
+            'game_settings': BetStrategyTest.game_settings,
+            'strategy_type': BetStrategyType.COUNT,
+            'count_ramp': {1: 2}
+        }
+
+        strategy = BetStrategy(settings)
+
+        with self.assertRaises(ValueError):
+            strategy.bet()
+
+    def test_hand_history(self):
+        strategy = BetStrategy({'game_settings': BetStrategyTest.game_settings})
+        results = [HandResult.WIN, HandResult.LOSE, HandResult.PUSH] * 10
+
+        for result in results:
+            strategy.last_hand = BetStrategyTest.build_result_hand(result)
+
+        self.assertEqual(len(results), strategy.hand_count)
+        self.assertEqual(results[-BET_STRATEGY_MAX_HAND_HISTORY:],
+                         [record.result for record in strategy.hand_history])
+        self.assertEqual(HandResult.PUSH, strategy.last_hand.result)
+
+    def test_streak(self):
+        strategy = BetStrategy({'game_settings': BetStrategyTest.game_settings})
+        self.assertEqual(0, strategy.streak)
+
+        for result, streak in [(HandResult.LOSE, -1), (HandResult.LOSE, -2), (HandResult.WIN, 1),
+                               (HandResult.WIN, 2), (HandResult.PUSH, 0), (HandResult.LOSE, -1)]:
+            strategy.last_hand = BetStrategyTest.build_result_hand(result)
+            self.assertEqual(streak, strategy.streak)
+
     def test_bet_strategy_static(self):
         settings = {
             'game_settings': BetStrategyTest.game_settings,
@@ -198,6 +268,99 @@ class BetStrategyTypeTest(TestCase):
         self.assertEqual('Series', str(BetStrategyType.SERIES))
 
 
+class CompiledStrategyTest(TestCase):
+    @staticmethod
+    def __chart_action(chart, hand, dealer_card, bankroll):
+        chart_value = hand.score
+
+        if len(hand.cards) == 2 and hand.cards[0].rank == hand.cards[1].rank:
+            chart_key = 'pair'
+            chart_value = hand.cards[0].rank
+        elif hand.soft:
+            chart_key = 'soft'
+        else:
+            chart_key = 'hard'
+
+        chart_index = dealer_card.value - 2
+        action = chart[chart_key][chart_value][chart_index]
+
+        if action == PlayerAction.DOUBLE_DOWN and len(hand.cards) > 2:
+            action = PlayerAction.HIT
+
+        if hand.bet > bankroll and action != PlayerAction.HIT and action != PlayerAction.STAND:
+            if action == PlayerAction.DOUBLE_DOWN:
+                action = PlayerAction.HIT
+            elif action == PlayerAction.SPLIT:
+                action = CHART_BASIC_STRATEGY['soft' if hand.soft else 'hard'][hand.score][chart_index]
+
+        return action
+
+    def test_action_matches_chart(self):
+        cards = [card for card in CARDS if card.suit == 'clubs']
+        dealer_cards = [card for card in cards if card.rank not in ('J', 'Q', 'K')]
+
+        for chart in (CHART_BASIC_STRATEGY, CHART_MODIFIED_STRATEGY):
+            strategy = CompiledStrategy(chart)
+
+            for hand_cards in list(product(cards, repeat=2)) + list(product(cards, repeat=3)):
+                hand = Hand()
+
+                for card in hand_cards:
+                    hand.deal(card)
+
+                if hand.score > 21:
+                    continue
+
+                for dealer_card, bankroll in product(dealer_cards, (0, 100)):
+                    self.assertEqual(self.__chart_action(chart, hand, dealer_card, bankroll),
+                                     strategy.action(hand, dealer_card, bankroll))
+
+    def test_validate_missing_row(self):
+        chart = copy.deepcopy(CHART_BASIC_STRATEGY)
+        del chart['hard'][4]
+
+        with self.assertRaises(ValueError):
+            CompiledStrategy(chart)
+
+    def test_validate_short_row(self):
+        chart = copy.deepcopy(CHART_BASIC_STRATEGY)
+        chart['pair']['8'] = [PlayerAction.SPLIT] * 9
+
+        with self.assertRaises(ValueError):
+            CompiledStrategy(chart)
+
+    def test_validate_split_without_pair(self):
+        chart = copy.deepcopy(CHART_BASIC_STRATEGY)
+        chart['soft'][13][0] = PlayerAction.SPLIT
+
+        with self.assertRaises(ValueError):
+            CompiledStrategy(chart)
+
+    def test_compile(self):
+        strategy = CompiledStrategy.compile(CHART_MODIFIED_STRATEGY)
+
+        self.assertIs(strategy, CompiledStrategy.compile(copy.deepcopy(CHART_MODIFIED_STRATEGY)))
+        self.assertIsNot(strategy, CompiledStrategy.compile(CHART_BASIC_STRATEGY))
+
+        chart = copy.deepcopy(CHART_MODIFIED_STRATEGY)
+        chart['hard'][12][0] = [PlayerAction.HIT]
+
+        with self.assertRaises(ValueError):
+            CompiledStrategy.compile(chart)
+
+        del chart['hard'][12]
+
+        with self.assertRaises(ValueError):
+            CompiledStrategy.compile(chart)
+
+    def test_validate_unknown_action(self):
+        chart = copy.deepcopy(CHART_BASIC_STRATEGY)
+        chart['hard'][12][0] = 'hit'
+
+        with self.assertRaises(ValueError):
+            CompiledStrategy(chart)
+
+
 class PlayerTest(TestCase):
     game_settings = GameSettings(min_bet=10, max_bet=100)
 
@@ -300,6 +463,24 @@ class PlayerTest(TestCase):
 
         self.assertEqual(PlayerAction.HIT, dealer.action(hand, None))
 
+    def test_action_dealer_stand_soft_17(self):
+        dealer = Player.dealer(GameSettings(dealer_hit_soft_17=False))
+        hand = build_hand('soft')
+        hand.deal(Card('4', 4, 'clubs'))
+
+        self.assertEqual(PlayerAction.STAND, dealer.action(hand, None))
+
+    def test_calculate_expected_results(self):
+        player = Player({'game_settings': PlayerTest.game_settings})
+        player.hands = [build_hand('hard'), build_hand('bust')]
+
+        bankroll_start = player.bankroll
+
+        player.calculate_expected_results((0.0, 0.0, 0.0, 0.0, 0.0, 1.0))
+
+        self.assertEqual(player.hands[0].bet, player.hands[0].winnings)
+        self.assertEqual(bankroll_start + player.hands[0].bet * 2, player.bankroll)
+
     def test_action_dealer_stand(self):
         dealer = Player.dealer(PlayerTest.game_settings)
         hand = build_hand('hard')
@@ -331,6 +512,7 @@ class PlayerTest(TestCase):
                          player.hands[1].bet +
                          player.hands[1].bet * PlayerTest.game_settings.blackjack_payout,
                          player.bankroll)
+        self.assertEqual(HandResult.LOSE, player.bet_strategy.last_hand.result)
 
     def test_dealer(self):
         dealer = Player.dealer(PlayerTest.game_settings)
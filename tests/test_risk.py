@@ -0,0 +1,83 @@
+import numpy as np
+
+from unittest import TestCase
+
+from blackjack.game import GameSettings
+from blackjack.hand import HandResult
+from blackjack.player import BetStrategyType
+from blackjack.risk import Outcome
+from blackjack.risk import RiskModel
+from blackjack.risk import bicgstab
+from blackjack.risk import outcome_distribution
+from blackjack.risk import simulate_ruin
+
+
+class TestRisk(TestCase):
+    test_settings = GameSettings(min_bet=10)
+    test_outcomes = {Outcome(1, HandResult.WIN, 1, 1): 0.5, Outcome(-1, HandResult.LOSE, 1, 0): 0.5}
+
+    def test_outcome_distribution(self):
+        outcomes = outcome_distribution(TestRisk.test_settings, rounds=2000, seed=1)
+
+        self.assertAlmostEqual(1.0, sum(outcomes.values()))
+        self.assertIn(Outcome(1.5, HandResult.WIN, 1, 1.5), outcomes)
+        self.assertLess(min(outcome.net for outcome in outcomes), -1)
+
+    def test_solve_gamblers_ruin(self):
+        model = RiskModel(TestRisk.test_settings, outcomes=TestRisk.test_outcomes)
+
+        result = model.solve(20, 40)
+
+        self.assertAlmostEqual(0.5, result.ruin_probability)
+        self.assertAlmostEqual(4.0, result.expected_rounds)
+        self.assertEqual(3, result.states)
+
+    def test_solve_martingale(self):
+        model = RiskModel(TestRisk.test_settings, BetStrategyType.MARTINGALE, outcomes=TestRisk.test_outcomes)
+
+        result = model.solve(70, 80)
+
+        # Bets of 10, 20 and 40 lose the whole bankroll, any win before that reaches the target
+        self.assertAlmostEqual(0.125, result.ruin_probability, places=2)
+        self.assertEqual(model.solve(70, 80), result)
+
+    def test_solve_parlay(self):
+        model = RiskModel(TestRisk.test_settings, BetStrategyType.PARLAY, outcomes=TestRisk.test_outcomes)
+
+        result = model.solve(20, 40)
+
+        # Winning at 30 with a bet of 20 passes the target, losing any bet of 20 or more is ruin
+        self.assertAlmostEqual(0.5625, result.ruin_probability)
+        self.assertAlmostEqual(2.625, result.expected_rounds)
+        self.assertEqual(4, result.states)
+
+    def test_solve_ruined(self):
+        model = RiskModel(TestRisk.test_settings, outcomes=TestRisk.test_outcomes)
+
+        self.assertEqual(1.0, model.solve(5, 40).ruin_probability)
+
+    def test_solve_matches_simulation(self):
+        outcomes = outcome_distribution(TestRisk.test_settings, rounds=20000, seed=2)
+        result = RiskModel(TestRisk.test_settings, outcomes=outcomes).solve(50, 100)
+        simulated = simulate_ruin(TestRisk.test_settings, {'bankroll': 50}, 100, sessions=300, seed=3)
+
+        self.assertLess(abs(result.ruin_probability - simulated.ruin_probability), 4 * simulated.standard_error)
+
+    def test_bicgstab(self):
+        matrix = np.array([[1.0, -0.5, 0.0], [-0.25, 1.0, -0.25], [0.0, -0.5, 1.0]])
+        vector = np.array([0.5, 0.0, 0.0])
+
+        solution, iterations = bicgstab(lambda x: matrix @ x, vector)
+
+        self.assertTrue(np.allclose(np.linalg.solve(matrix, vector), solution))
+        self.assertGreater(iterations, 0)
+
+    def test___init__(self):
+        with self.assertRaises(ValueError):
+            RiskModel(bet_strategy_type=BetStrategyType.COUNT, outcomes=TestRisk.test_outcomes)
+
+        with self.assertRaises(ValueError):
+            RiskModel(bet_strategy_type=BetStrategyType.SERIES, outcomes=TestRisk.test_outcomes)
+
+        with self.assertRaises(ValueError):
+            RiskModel(outcomes=TestRisk.test_outcomes).solve(100, 100)
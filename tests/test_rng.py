@@ -0,0 +1,84 @@
+import random
+
+from array import array
+from unittest import TestCase
+
+import numpy as np
+
+from blackjack.cards import Shoe
+from blackjack.game import Game
+from blackjack.rng import child_rng
+from blackjack.rng import randint
+from blackjack.rng import shuffle
+from blackjack.rng import spawn
+
+
+class TestRng(TestCase):
+    def test_child_rng(self):
+        self.assertEqual(child_rng(1, 2).random(), child_rng(1, 2).random())
+        self.assertNotEqual(child_rng(1, 2).random(), child_rng(1, 3).random())
+
+    def test_randint(self):
+        for rng in [random.Random(0), np.random.default_rng(0)]:
+            values = {randint(rng, 3, 5) for _ in range(200)}
+
+            self.assertEqual({3, 4, 5}, values)
+            self.assertTrue(all(isinstance(value, int) for value in values))
+
+    def test_shuffle(self):
+        for rng in [random.Random(0), np.random.default_rng(0)]:
+            buffer = array('B', range(100))
+
+            shuffle(rng, memoryview(buffer)[:50])
+
+            self.assertEqual(list(range(50)), sorted(buffer[:50]))
+            self.assertNotEqual(list(range(50)), list(buffer[:50]))
+            self.assertEqual(list(range(50, 100)), list(buffer[50:]))
+
+    def test_spawn(self):
+        for build_rng in [random.Random, np.random.default_rng]:
+            children = spawn(build_rng(7), 3)
+            values = [child.random() for child in children]
+
+            self.assertEqual(3, len(children))
+            self.assertEqual(3, len(set(values)))
+            self.assertEqual(values, [child.random() for child in spawn(build_rng(7), 3)])
+
+        with self.assertRaises(ValueError):
+            spawn(random.Random(0), -1)
+
+    def test_shoe_rng(self):
+        for build_rng in [random.Random, np.random.default_rng]:
+            shoe = Shoe(num_decks=2, rng=build_rng(4))
+            other = Shoe(num_decks=2, rng=build_rng(4))
+
+            random.seed(0)
+            shoe.reset()
+            random.seed(1)
+            other.reset()
+
+            self.assertEqual(shoe.cards, other.cards)
+            self.assertEqual(shoe.stop_card, other.stop_card)
+
+    def test_game_rng_independent(self):
+        game = Game(rng=random.Random(9))
+        game.add_player()
+        game.start(rounds=50)
+
+        other = Game(rng=random.Random(9))
+        other.add_player()
+        disturbing = Game(rng=random.Random(10))
+        disturbing.add_player()
+
+        other.shoe.reset()
+        disturbing.shoe.reset()
+
+        for _ in range(50):
+            for interleaved in [other, disturbing]:
+                interleaved.play_round()
+
+                if interleaved.shoe.last_round:
+                    interleaved.shoe.reset()
+
+        self.assertEqual(game.players[0].bankroll, other.players[0].bankroll)
+        self.assertEqual(game.shoe.cards, other.shoe.cards)
@@ -0,0 +1,55 @@
+from unittest import TestCase
+
+from blackjack.game import GameSettings
+from blackjack.player import BetStrategyType
+from blackjack.runner import run_sessions
+from blackjack.runner import run_simulation
+from blackjack.runner import shard_sizes
+
+
+class TestRunner(TestCase):
+    test_players = [
+        {'bankroll': 10000},
+        {'bankroll': 10000, 'bet_strategy_type': BetStrategyType.MARTINGALE},
+    ]
+
+    def test_shard_sizes(self):
+        self.assertEqual([4, 4, 2], shard_sizes(10, 4))
+        self.assertEqual([], shard_sizes(0, 4))
+
+        with self.assertRaises(ValueError):
+            shard_sizes(10, 0)
+
+    def test_run_simulation(self):
+        report = run_simulation(GameSettings(), TestRunner.test_players, rounds=250, seed=3, shard_rounds=100)
+
+        self.assertEqual(250, report.rounds)
+        self.assertEqual([1, 2], sorted(report.players))
+
+        for stats in report.players.values():
+            self.assertLessEqual(250, stats.hands)
+            self.assertEqual(stats.hands, stats.wins + stats.pushes + stats.losses)
+
+    def test_run_simulation_reproducible(self):
+        settings = GameSettings(num_decks=2)
+
+        single = run_simulation(settings, TestRunner.test_players, rounds=300, seed=5, shard_rounds=50)
+        parallel = run_simulation(settings, TestRunner.test_players, rounds=300, seed=5, workers=3,
+                                  shard_rounds=50)
+        other = run_simulation(settings, TestRunner.test_players, rounds=300, seed=6, shard_rounds=50)
+
+        self.assertEqual(single.summary(), parallel.summary())
+        self.assertNotEqual(single.summary(), other.summary())
+
+    def test_run_sessions(self):
+        player_settings = {'bankroll': 100}
+
+        sketches = run_sessions(GameSettings(), player_settings, sessions=60, rounds=200, seed=1,
+                                shard_sessions=25)
+        parallel = run_sessions(GameSettings(), player_settings, sessions=60, rounds=200, seed=1,
+                                shard_sessions=25, workers=2)
+
+        self.assertEqual(60, sketches.sessions)
+        self.assertGreater(sketches.ruined, 0)
+        self.assertLess(sketches.bankroll_extremes.minimum, GameSettings().min_bet)
+        self.assertEqual(sketches.summary(), parallel.summary())
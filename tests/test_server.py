@@ -0,0 +1,178 @@
+import asyncio
+import json
+import os
+import random
+import tempfile
+
+from unittest import IsolatedAsyncioTestCase
+
+from blackjack.game import Game
+from blackjack.rng import spawn
+from blackjack.server import TableServer
+from blackjack.server import encode_message
+from blackjack.server import run_bot
+
+
+class TestTableServer(IsolatedAsyncioTestCase):
+    test_player_settings = {'bankroll': 1000}
+
+    @staticmethod
+    def build_local_games(num_tables, seats, rounds, seed):
+        games = []
+
+        for table_rng in spawn(random.Random(seed), num_tables):
+            game = Game(rng=table_rng)
+
+            for _ in range(seats):
+                game.add_player(dict(TestTableServer.test_player_settings))
+
+            game.start(rounds=rounds)
+            games.append(game)
+
+        return games
+
+    async def test_run_matches_game(self):
+        server = TableServer(num_tables=20, seats=2, rounds=15,
+                             player_settings=TestTableServer.test_player_settings, rng=random.Random(3))
+        host, port = await server.start()
+
+        bots = asyncio.gather(run_bot(host, port, seats=25), run_bot(host, port, seats=15))
+
+        games = await server.run()
+        await server.close()
+
+        stats = await bots
+
+        self.assertEqual(40, sum(len(bot['seats']) for bot in stats))
+        self.assertEqual(20 * 2 * 15, sum(bot['results'] for bot in stats))
+        self.assertEqual(0, server.timeouts)
+        self.assertEqual(0, server.errors)
+
+        for game, local_game in zip(games, TestTableServer.build_local_games(20, 2, 15, 3)):
+            self.assertEqual([player.bankroll for player in local_game.players],
+                             [player.bankroll for player in game.players])
+
+    async def test_run_unix_socket(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'tables.sock')
+
+            server = TableServer(num_tables=3, rounds=5, rng=random.Random(1))
+            await server.start(path=path)
+
+            bot = asyncio.ensure_future(run_bot(path=path, seats=3))
+
+            await server.run()
+            await server.close()
+
+            self.assertEqual(3, len((await bot)['seats']))
+
+    async def test_decision_timeout(self):
+        server = TableServer(num_tables=2, rounds=5, player_settings=TestTableServer.test_player_settings,
+                             decision_timeout=0.01, rng=random.Random(4))
+        host, port = await server.start()
+
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(encode_message({'type': 'join', 'seats': 2}))
+        await writer.drain()
+
+        seated = json.loads(await reader.readline())
+
+        # The silent client never answers, so every decision falls back to the seat's own strategy
+        games = await server.run()
+        await server.close()
+        writer.close()
+
+        self.assertEqual([[0, 1], [1, 1]], seated['seats'])
+        self.assertGreater(server.timeouts, 0)
+
+        for game, local_game in zip(games, TestTableServer.build_local_games(2, 1, 5, 4)):
+            self.assertEqual([player.bankroll for player in local_game.players],
+                             [player.bankroll for player in game.players])
+
+    async def test_invalid_action(self):
+        server = TableServer(num_tables=2, rounds=5, player_settings=TestTableServer.test_player_settings,
+                             rng=random.Random(4))
+        host, port = await server.start()
+
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(encode_message({'type': 'join', 'seats': 2}))
+        await writer.drain()
+
+        async def answer():
+            payloads = [['HIT'], 3, {'action': 'HIT'}, None, 'FOLD']
+
+            while True:
+                message = json.loads(await reader.readline())
+
+                if message['type'] == 'done':
+                    break
+
+                if message['type'] == 'decide':
+                    writer.write(encode_message({'type': 'action', 'id': message['id'],
+                                                 'action': payloads[message['id'] % len(payloads)]}))
+                    await writer.drain()
+
+        client = asyncio.ensure_future(answer())
+
+        # Every bad answer falls back to the seat's own strategy instead of stopping the tables
+        games = await server.run()
+        await server.close()
+        await client
+        writer.close()
+
+        self.assertGreater(server.errors, 0)
+
+        for game, local_game in zip(games, TestTableServer.build_local_games(2, 1, 5, 4)):
+            self.assertEqual([player.bankroll for player in local_game.players],
+                             [player.bankroll for player in game.players])
+
+    async def test_seating_timeout(self):
+        server = TableServer(num_tables=2, seats=2, rounds=5, player_settings=TestTableServer.test_player_settings,
+                             seating_timeout=0.05, rng=random.Random(3))
+        host, port = await server.start()
+
+        bot = asyncio.ensure_future(run_bot(host, port, seats=3))
+
+        games = await asyncio.wait_for(server.run(), 5)
+        await server.close()
+
+        self.assertEqual(3, len((await bot)['seats']))
+        self.assertEqual(1, server.unclaimed_seats)
+        self.assertEqual(0, len(server.free_seats))
+
+        for game, local_game in zip(games, TestTableServer.build_local_games(2, 2, 5, 3)):
+            self.assertEqual([player.bankroll for player in local_game.players],
+                             [player.bankroll for player in game.players])
+
+    async def test_invalid_message(self):
+        server = TableServer(rng=random.Random(0))
+        host, port = await server.start()
+
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(b'not json\n' + encode_message({'type': 'unknown'}))
+        await writer.drain()
+
+        self.assertEqual('error', json.loads(await reader.readline())['type'])
+        self.assertEqual('error', json.loads(await reader.readline())['type'])
+
+        # Bad seat counts are refused without dropping the connection
+        for seats in ('x', None, 0):
+            writer.write(encode_message({'type': 'join', 'seats': seats}))
+            await writer.drain()
+
+            self.assertEqual('error', json.loads(await reader.readline())['type'])
+
+        writer.write(encode_message({'type': 'join', 'seats': 1}))
+        await writer.drain()
+
+        self.assertEqual('seated', json.loads(await reader.readline())['type'])
+
+        writer.close()
+        await server.close()
+
+    def test___init__(self):
+        with self.assertRaises(ValueError):
+            TableServer(num_tables=0)
+
+        with self.assertRaises(ValueError):
+            TableServer(seats=0)
@@ -0,0 +1,64 @@
+import numpy as np
+
+from multiprocessing import shared_memory
+from unittest import TestCase
+
+from blackjack.game import GameSettings
+from blackjack.player import BetStrategyType
+from blackjack.runner import run_simulation
+from blackjack.shared import SharedResults
+from blackjack.shared import play_shared_shard
+from blackjack.shared import run_shared_simulation
+
+
+class TestShared(TestCase):
+    test_players = [
+        {'bankroll': 10000},
+        {'bankroll': 10000, 'bet_strategy_type': BetStrategyType.MARTINGALE},
+    ]
+
+    def test_create_attach(self):
+        with SharedResults.create(shards=2, seats=3, checkpoints=4) as results:
+            self.assertEqual((2, 4, 3), results.bankrolls.shape)
+            self.assertTrue(np.isnan(results.bankrolls).all())
+
+            worker = SharedResults.attach(results.layout)
+            worker.rounds[1] = 7
+            worker.close()
+
+            self.assertEqual([0, 7], results.rounds.tolist())
+            self.assertFalse(results.closed)
+
+        self.assertTrue(results.closed)
+
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=results.layout.name)
+
+    def test_run_shared_simulation(self):
+        settings = GameSettings(num_decks=2)
+        report = run_simulation(settings, TestShared.test_players, rounds=300, seed=5, shard_rounds=100)
+
+        for workers in (1, 2):
+            with run_shared_simulation(settings, TestShared.test_players, rounds=300, seed=5, workers=workers,
+                                       shard_rounds=100, checkpoint_rounds=25) as results:
+                self.assertEqual(report.summary(), results.report().summary())
+                self.assertEqual((3, 4, 2), results.bankrolls.shape)
+                self.assertFalse(np.isnan(results.bankrolls).any())
+                self.assertTrue(results.completed.all())
+
+    def test_incomplete_shard(self):
+        with SharedResults.create(shards=2, seats=1, checkpoints=0) as results:
+            play_shared_shard(results.layout, None, [{'bankroll': 1000}], 10, 0, 0, 1)
+
+            self.assertEqual([False, True], results.completed.tolist())
+
+            with self.assertRaises(ValueError):
+                results.report()
+
+    def test_worker_error(self):
+        with self.assertRaises(ValueError):
+            run_shared_simulation(None, [{'bankroll': 1000, 'bet_strategy_type': BetStrategyType.SERIES}],
+                                  rounds=10)
+
+        with self.assertRaises(ValueError):
+            SharedResults.create(shards=1, seats=0)
@@ -0,0 +1,118 @@
+import os
+import pickle
+import tempfile
+
+from unittest import TestCase
+
+from blackjack.cards import CARDS
+from blackjack.cards import CARDS_PER_DECK
+from blackjack.cards import Shoe
+from blackjack.game import Game
+from blackjack.game import GameSettings
+from blackjack.rng import child_rng
+from blackjack.shoebank import ShoeBank
+from blackjack.shoebank import write_shoe_bank
+
+
+class TestShoeBank(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'shoes.bank')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_write_read(self):
+        write_shoe_bank(self.path, 2, shoes=5, seed=3, chunk_shoes=2)
+
+        shoe = Shoe(2, rng=child_rng(3, 1))
+        card_codes, stop_card = shoe.snapshot()
+
+        with ShoeBank(self.path) as bank:
+            self.assertEqual(5, len(bank))
+            self.assertEqual(2 * CARDS_PER_DECK, bank.shoe_size)
+
+            cut_card, bank_stop_card, bank_card_codes = bank.shoe(2)
+
+            self.assertEqual((shoe.cut_card, stop_card), (cut_card, bank_stop_card))
+            self.assertEqual(card_codes.tobytes(), bank_card_codes.tobytes())
+
+            with self.assertRaises(IndexError):
+                bank.shoe(5)
+
+    def test_write_workers(self):
+        other_path = os.path.join(self.directory.name, 'other.bank')
+
+        write_shoe_bank(self.path, 1, shoes=7, seed=1, chunk_shoes=3)
+        write_shoe_bank(other_path, 1, shoes=7, seed=1, workers=2, chunk_shoes=3)
+
+        with open(self.path, 'rb') as file, open(other_path, 'rb') as other_file:
+            self.assertEqual(file.read(), other_file.read())
+
+    def test_invalid(self):
+        write_shoe_bank(self.path, 1, shoes=2)
+
+        with open(self.path, 'r+b') as file:
+            file.truncate(os.path.getsize(self.path) - 1)
+
+        with self.assertRaises(ValueError):
+            ShoeBank(self.path)
+
+        with open(self.path, 'wb') as file:
+            file.write(b'not a shoe bank at all')
+
+        with self.assertRaises(ValueError):
+            ShoeBank(self.path)
+
+    def test_replay(self):
+        write_shoe_bank(self.path, 2, shoes=4, seed=2)
+
+        with ShoeBank(self.path) as bank:
+            shoe = Shoe(2)
+            shoe.replay(bank, start=1, step=2)
+            shoe.reset()
+
+            self.assertEqual(bank.shoe(1)[2].tobytes(), shoe.snapshot()[0].tobytes())
+            self.assertEqual(bank.shoe(1)[1], shoe.stop_card)
+
+            shoe.draw_many(10)
+            shoe.reset()
+
+            self.assertEqual(bank.shoe(3)[2].tobytes(), shoe.snapshot()[0].tobytes())
+            self.assertEqual(2 * CARDS_PER_DECK, sum(shoe.composition()))
+
+            with self.assertRaises(IndexError):
+                shoe.reset()
+
+            with self.assertRaises(ValueError):
+                Shoe(1).replay(bank)
+
+    def test_replay_game(self):
+        write_shoe_bank(self.path, 2, shoes=20, seed=4)
+        games = []
+
+        with ShoeBank(self.path) as bank:
+            for _ in range(2):
+                game = Game(GameSettings(num_decks=2))
+                game.add_player({'bankroll': 10000})
+                game.shoe.replay(bank)
+                game.start(rounds=50)
+                games.append(game)
+
+            restored = pickle.loads(pickle.dumps(games[0]))
+
+            game = Game(GameSettings(num_decks=2))
+            game.add_player({'bankroll': 10000})
+            game.shoe.replay(bank, start=3)
+            game.start(rounds=1)
+
+            # The first round is dealt from the start of the replay, no shoe is skipped
+            card_codes = bank.shoe(3)[2]
+            self.assertEqual(4, game.shoe.bank_index)
+            self.assertEqual(card_codes[:game.shoe.num_cards].tobytes(), game.shoe.snapshot()[0].tobytes())
+            self.assertEqual(CARDS[card_codes[-1]], game.players[0].hands[0].cards[0])
+
+        self.assertEqual(games[0].players[0].bankroll, games[1].players[0].bankroll)
+        self.assertEqual(games[0].shoe.cards, restored.shoe.cards)
+
+        restored.shoe.bank.close()
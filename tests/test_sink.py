@@ -0,0 +1,115 @@
+import csv
+import os
+import tempfile
+
+from unittest import TestCase
+from unittest import skipUnless
+
+from blackjack.game import Game
+from blackjack.game import RoundRecord
+from blackjack.hand import HandResult
+from blackjack.sink import ColumnarSink
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+def build_records(count):
+    return [RoundRecord(index + 1, 1, 1, 10, HandResult.WIN if index % 2 else HandResult.LOSE,
+                        10 if index % 2 else 0, index % 5 == 4) for index in range(count)]
+
+
+class TestColumnarSink(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test___init__(self):
+        with self.assertRaises(ValueError):
+            ColumnarSink(os.path.join(self.directory.name, 'records.txt'))
+
+        with self.assertRaises(ValueError):
+            ColumnarSink(os.path.join(self.directory.name, 'records.csv'), chunk_size=0)
+
+    def test_close_before_write(self):
+        path = os.path.join(self.directory.name, 'records.csv')
+        sink = ColumnarSink(path)
+
+        self.assertIsNone(sink.file)
+
+        sink.close()
+        self.assertFalse(os.path.exists(path))
+
+        sink.flush()
+        sink.close()
+        sink.close()
+
+        with open(path) as file:
+            self.assertEqual(1, len(file.readlines()))
+
+    def test_write_csv(self):
+        path = os.path.join(self.directory.name, 'records.csv')
+        records = build_records(25)
+
+        with ColumnarSink(path, chunk_size=10) as sink:
+            sink.write_many(records)
+
+            self.assertEqual(2, sink.chunks_written)
+            self.assertEqual(5, len(sink))
+
+        self.assertEqual(3, sink.chunks_written)
+        self.assertEqual(25, sink.records_written)
+
+        with open(path, newline='') as file:
+            rows = list(csv.DictReader(file))
+
+        self.assertEqual(25, len(rows))
+        self.assertEqual('2', rows[1]['round'])
+        self.assertEqual('WIN', rows[1]['result'])
+        self.assertEqual('1', rows[4]['reshuffle'])
+
+    def test_write_game_records(self):
+        path = os.path.join(self.directory.name, 'records.csv')
+
+        game = Game()
+        game.add_player({'bankroll': 10000})
+        game.add_player({'bankroll': 10000})
+
+        with ColumnarSink(path, chunk_size=16) as sink:
+            sink.write_many(game.records(rounds=20))
+
+        self.assertEqual(20, game.round_count)
+        self.assertLessEqual(40, sink.records_written)
+
+    @skipUnless(pyarrow, 'pyarrow is not installed')
+    def test_write_parquet(self):
+        import pyarrow.parquet
+
+        path = os.path.join(self.directory.name, 'records.parquet')
+
+        with ColumnarSink(path, chunk_size=10) as sink:
+            sink.write_many(build_records(25))
+
+        table = pyarrow.parquet.read_table(path)
+
+        self.assertEqual(25, table.num_rows)
+        self.assertEqual(list(range(1, 26)), table.column('round').to_pylist())
+
+    @skipUnless(pyarrow, 'pyarrow is not installed')
+    def test_write_arrow(self):
+        import pyarrow.ipc
+
+        path = os.path.join(self.directory.name, 'records.arrow')
+
+        with ColumnarSink(path, chunk_size=10) as sink:
+            sink.write_many(build_records(25))
+
+        with pyarrow.ipc.open_file(path) as reader:
+            table = reader.read_all()
+
+        self.assertEqual(25, table.num_rows)
+        self.assertEqual(True, table.column('reshuffle')[4].as_py())
@@ -0,0 +1,202 @@
+import math
+import random
+
+from unittest import TestCase
+
+from blackjack.hand import Hand
+from blackjack.hand import HandResult
+from blackjack.stats import BankrollTracker
+from blackjack.stats import Extremes
+from blackjack.stats import Histogram
+from blackjack.stats import PlayerStats
+from blackjack.stats import QuantileSketch
+from blackjack.stats import SessionSketches
+
+
+def build_result(result, bet=10, winnings=0):
+    hand = Hand(bet=bet)
+    hand.result = result
+    hand.winnings = winnings
+
+    return hand
+
+
+class TestPlayerStats(TestCase):
+    test_hands = [
+        build_result(HandResult.WIN, winnings=10),
+        build_result(HandResult.WIN, winnings=15),
+        build_result(HandResult.PUSH),
+        build_result(HandResult.LOSE),
+        build_result(HandResult.LOSE, bet=20),
+    ]
+
+    def test_add(self):
+        stats = PlayerStats()
+
+        for hand in TestPlayerStats.test_hands:
+            stats.add(hand)
+
+        self.assertEqual(5, stats.hands)
+        self.assertEqual(2, stats.wins)
+        self.assertEqual(1, stats.pushes)
+        self.assertEqual(2, stats.losses)
+        self.assertEqual(-5, stats.net)
+        self.assertAlmostEqual(-1, stats.mean)
+        self.assertAlmostEqual(205, stats.variance)
+
+    def test_merge(self):
+        stats = PlayerStats()
+        first = PlayerStats()
+        second = PlayerStats()
+
+        for index, hand in enumerate(TestPlayerStats.test_hands):
+            stats.add(hand)
+            (first if index < 2 else second).add(hand)
+
+        first.merge(second)
+
+        self.assertEqual(stats.hands, first.hands)
+        self.assertEqual(stats.net, first.net)
+        self.assertAlmostEqual(stats.mean, first.mean)
+        self.assertAlmostEqual(stats.variance, first.variance)
+
+    def test_half_width(self):
+        stats = PlayerStats()
+        stats.add(TestPlayerStats.test_hands[0])
+
+        self.assertEqual(math.inf, stats.half_width(1.96))
+
+        for hand in TestPlayerStats.test_hands[1:]:
+            stats.add(hand)
+
+        self.assertAlmostEqual(math.sqrt(stats.variance / 5), stats.standard_error)
+        self.assertAlmostEqual(2 * stats.standard_error, stats.half_width(2))
+
+    def test_merge_empty(self):
+        stats = PlayerStats()
+        stats.add(TestPlayerStats.test_hands[0])
+
+        stats.merge(PlayerStats())
+
+        self.assertEqual(1, stats.hands)
+        self.assertEqual(10, stats.mean)
+
+
+class TestBankrollTracker(TestCase):
+    def test_update(self):
+        tracker = BankrollTracker(100)
+
+        for bankroll in [120, 90, 110, 60, 130, 5]:
+            tracker.update(bankroll, 1, min_bet=10)
+
+        self.assertEqual(130, tracker.peak)
+        self.assertEqual(125, tracker.max_drawdown)
+        self.assertEqual(6, tracker.ruin_hands)
+        self.assertEqual(5, tracker.bankroll)
+
+
+class TestExtremes(TestCase):
+    def test_merge(self):
+        first = Extremes()
+        second = Extremes()
+
+        for value in [3, -1, 7]:
+            first.add(value)
+
+        second.add(10)
+        first.merge(second).merge(Extremes())
+
+        self.assertEqual({'count': 4, 'minimum': -1, 'maximum': 10}, first.summary())
+
+
+class TestHistogram(TestCase):
+    def test_add(self):
+        histogram = Histogram(0, 10, bins=5)
+
+        for value in [-1, 0, 1.9, 2, 9.99, 10, 15]:
+            histogram.add(value)
+
+        self.assertEqual([2, 1, 0, 0, 1], histogram.counts)
+        self.assertEqual((1, 2), (histogram.underflow, histogram.overflow))
+        self.assertEqual(7, histogram.count)
+
+    def test_merge(self):
+        histogram = Histogram(0, 10, bins=5)
+        histogram.add(1)
+        histogram.merge(Histogram(0, 10, bins=5))
+
+        self.assertEqual(1, histogram.count)
+
+        with self.assertRaises(ValueError):
+            histogram.merge(Histogram(0, 10, bins=4))
+
+        with self.assertRaises(ValueError):
+            Histogram(1, 1)
+
+    def test_quantile(self):
+        histogram = Histogram(0, 100, bins=100)
+
+        for value in range(100):
+            histogram.add(value + 0.5)
+
+        self.assertAlmostEqual(50, histogram.quantile(0.5))
+        self.assertAlmostEqual(99, histogram.quantile(0.99))
+
+
+class TestQuantileSketch(TestCase):
+    def test_quantile(self):
+        rng = random.Random(0)
+        values = [rng.gauss(0, 1) for _ in range(50000)]
+        sketches = [QuantileSketch() for _ in range(4)]
+
+        for index, value in enumerate(values):
+            sketches[index % len(sketches)].add(value)
+
+        sketch = sketches[0]
+
+        for other in sketches[1:]:
+            sketch.merge(other)
+
+        values.sort()
+
+        self.assertEqual(len(values), sketch.count)
+        self.assertEqual((values[0], values[-1]), (sketch.quantile(0), sketch.quantile(1)))
+        self.assertLessEqual(len(sketch.centroids), sketch.compression)
+
+        for q in [0.001, 0.01, 0.25, 0.5, 0.75, 0.99, 0.999]:
+            estimate = sketch.quantile(q)
+            rank = sum(1 for value in values if value <= estimate) / len(values)
+
+            self.assertAlmostEqual(q, rank, delta=0.002)
+
+    def test_quantile_empty(self):
+        self.assertTrue(math.isnan(QuantileSketch().quantile(0.5)))
+
+        sketch = QuantileSketch()
+        sketch.add(4)
+
+        self.assertEqual(4, sketch.quantile(0.5))
+
+
+class TestSessionSketches(TestCase):
+    def test_add(self):
+        sketches = SessionSketches(histogram=Histogram(0, 200, bins=4))
+        other = SessionSketches(histogram=Histogram(0, 200, bins=4))
+
+        ruined = BankrollTracker(100)
+        ruined.update(5, 3, min_bet=10)
+
+        winner = BankrollTracker(100)
+        winner.update(150, 2, min_bet=10)
+
+        sketches.add(ruined)
+        other.add(winner)
+        sketches.merge(other)
+
+        summary = sketches.summary(quantiles=(0.5,))
+
+        self.assertEqual(2, summary['sessions'])
+        self.assertEqual(0.5, summary['ruin_probability'])
+        self.assertEqual(3, summary['time_to_ruin']['0.5'])
+        self.assertEqual([1, 0, 0, 1], summary['bankroll_histogram']['counts'])
+        self.assertEqual(150, summary['bankroll_extremes']['maximum'])